@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+
+"""
+Micro-benchmarks for the tokenizing / scoring / rendering hot paths.
+
+Each case runs on seeded synthetic inputs (benchmarks/synth.py) at 1x
+(about one resume + one posting), 10x and 100x. Timings are best-of-N
+per call (timeit autorange per repeat), written as JSON so two commits
+can be compared with benchmarks/compare.py.
+
+how to run from command line
+
+python3 benchmarks/bench_hotpaths.py --out bench.json
+python3 benchmarks/bench_hotpaths.py --scales 1 10 --only tokens_simple tailor
+python3 benchmarks/compare.py base.json bench.json
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import synth  # noqa: E402
+from tailor_resume.pipeline import load_run_config  # noqa: E402
+from tailor_resume.tailor_config import TailorConfig  # noqa: E402
+from tailor_resume.tailor_engine import missing_keywords, tailor  # noqa: E402
+from tailor_resume.job_profile import build_job_profile  # noqa: E402
+from tailor_resume.job_terms import top_terms_from_job_simple, top_terms_from_job_nltk  # noqa: E402
+from tailor_resume.markdown_rules import normalize_markdown_spacing  # noqa: E402
+from tailor_resume.markdown_postprocess import postprocess_markdown  # noqa: E402
+from tailor_resume.resume_parse import parse_professional_experience  # noqa: E402
+from tailor_resume.clipboard_capture import ClipboardWatcher, FakeClipboard  # noqa: E402
+from tailor_resume.jobpost import minhash  # noqa: E402
+from tailor_resume.jobpost.store import CorpusIDF, JobStore  # noqa: E402
+from tailor_resume.jobpost.types import JobPost  # noqa: E402
+from tailor_resume.scoring import score_bullet, extract_core_competencies  # noqa: E402
+from tailor_resume.score_matrix import NUMPY_AVAILABLE  # noqa: E402
+from tailor_resume.text_utils import (  # noqa: E402
+  nltk_available,
+  normalize_text,
+  phrase_hits,
+  tokens_simple,
+  tokens_nltk,
+)
+
+DEFAULT_SCALES = (1, 10, 100)
+DEFAULT_SEED = 1234
+
+
+# ----------------------------
+# Inputs
+# ----------------------------
+
+@dataclass
+class Inputs:
+  """Synthetic inputs for one scale. 1x ~ a 4-role resume and a 400-word posting."""
+  scale: int
+  cfg: TailorConfig
+  job_text: str
+  bullets: list[str]
+  bullets_norm: list[str]
+  resume_md: str
+  competencies: list[str]
+  terms: list[str]
+
+  def size(self) -> dict:
+    return {
+      "job_words": len(self.job_text.split()),
+      "bullets": len(self.bullets),
+      "terms": len(self.terms),
+      "resume_lines": self.resume_md.count("\n") + 1,
+    }
+
+
+def build_inputs(cfg: TailorConfig, scale: int, seed: int) -> Inputs:
+  rng = random.Random(f"{seed}:{scale}")
+  roles = 4 * scale
+  bullets_per_role = 10
+
+  # config term lists grow with the scale too (matcher size matters as much as text size)
+  cfg = copy.copy(cfg)
+  cfg.required_terms = synth.phrases(rng, 10 * scale)
+  cfg.nice_to_have_terms = synth.phrases(rng, 10 * scale)
+  cfg.domain_terms = synth.phrases(rng, 20 * scale)
+
+  resume_md = synth.resume_markdown(rng, roles=roles, bullets_per_role=bullets_per_role, competencies=12 * scale)
+  bullets = synth.bullets(rng, roles * bullets_per_role)
+  return Inputs(
+    scale=scale,
+    cfg=cfg,
+    job_text=synth.job_text(rng, 400 * scale),
+    bullets=bullets,
+    bullets_norm=[normalize_text(b) for b in bullets],
+    resume_md=resume_md,
+    competencies=extract_core_competencies(resume_md.splitlines())[2],
+    terms=cfg.required_terms + cfg.nice_to_have_terms + cfg.domain_terms,
+  )
+
+
+# ----------------------------
+# Cases
+# ----------------------------
+
+def _nltk_cfg(cfg: TailorConfig) -> TailorConfig:
+  cfg = copy.copy(cfg)
+  cfg.use_nltk = True
+  return cfg
+
+
+def case_tokens_simple(inp: Inputs) -> Callable[[], object]:
+  return lambda: tokens_simple(inp.job_text, inp.cfg.stopwords)
+
+
+def case_tokens_nltk(inp: Inputs) -> Callable[[], object]:
+  return lambda: tokens_nltk(inp.job_text, inp.cfg.stopwords)
+
+
+def case_phrase_hits(inp: Inputs) -> Callable[[], object]:
+  def run():
+    for b in inp.bullets_norm:
+      phrase_hits(b, inp.terms)
+  return run
+
+
+def case_score_bullet(inp: Inputs) -> Callable[[], object]:
+  job = build_job_profile(inp.job_text, inp.cfg)
+
+  def run():
+    for b in inp.bullets:
+      score_bullet(b, job, inp.cfg)
+  return run
+
+
+def case_top_terms_simple(inp: Inputs) -> Callable[[], object]:
+  return lambda: top_terms_from_job_simple(inp.job_text, inp.cfg.stopwords, inp.cfg.max_auto_terms)
+
+
+def case_top_terms_tfidf(inp: Inputs) -> Callable[[], object]:
+  # ranking by count x IDF over the job store (one df lookup per call)
+  tmp = tempfile.TemporaryDirectory(prefix="bench_idf_")
+  path = Path(tmp.name) / "jobs.sqlite3"
+  _job_store(inp, path).close()
+  idf = CorpusIDF(path)
+
+  # run holds tmp, so the store is removed once the case is timed and dropped
+  def run(_tmp=tmp):
+    return top_terms_from_job_simple(inp.job_text, inp.cfg.stopwords, inp.cfg.max_auto_terms, idf=idf)
+  return run
+
+
+def case_top_terms_nltk(inp: Inputs) -> Callable[[], object]:
+  return lambda: top_terms_from_job_nltk(inp.job_text, inp.cfg.stopwords, inp.cfg.max_auto_terms)
+
+
+def case_missing_keywords(inp: Inputs) -> Callable[[], object]:
+  job_terms_auto = top_terms_from_job_simple(inp.job_text, inp.cfg.stopwords, inp.cfg.max_auto_terms)
+  return lambda: missing_keywords(inp.resume_md, inp.job_text, inp.cfg, job_terms_auto)
+
+
+def case_tailor(inp: Inputs) -> Callable[[], object]:
+  doc = parse_professional_experience(inp.resume_md)
+  return lambda: tailor(doc, inp.job_text, inp.cfg)
+
+
+def case_tailor_nltk(inp: Inputs) -> Callable[[], object]:
+  doc = parse_professional_experience(inp.resume_md)
+  cfg = _nltk_cfg(inp.cfg)
+  return lambda: tailor(doc, inp.job_text, cfg)
+
+
+def case_normalize_markdown_spacing(inp: Inputs) -> Callable[[], object]:
+  return lambda: normalize_markdown_spacing(inp.resume_md)
+
+
+def case_postprocess_markdown(inp: Inputs) -> Callable[[], object]:
+  return lambda: postprocess_markdown(inp.resume_md, inp.competencies[::-1])
+
+
+def case_parse_professional_experience(inp: Inputs) -> Callable[[], object]:
+  return lambda: parse_professional_experience(inp.resume_md)
+
+
+def case_clipboard_capture(inp: Inputs) -> Callable[[], object]:
+  # engine overhead per capture (read + digest before and after one change), no subprocesses
+  clip = FakeClipboard(inp.job_text)
+  watcher = ClipboardWatcher(clip)
+  texts = [inp.job_text + " ", inp.job_text]
+
+  def run():
+    clip.queue(*texts)
+    watcher.wait_for_change()
+    watcher.wait_for_change()
+  return run
+
+
+def _job_store(inp: Inputs, path: Path = Path(":memory:")) -> JobStore:
+  # 300 stored posts per 1x (30k at 100x)
+  rng = random.Random(f"jobs:{inp.scale}")
+  store = JobStore(path)
+  store.upsert_many([
+    (
+      JobPost(
+        url=f"https://www.linkedin.com/jobs/view/{i}",
+        source="linkedin",
+        date_pulled=date(2025, 1, 1),
+        title=synth.phrases(rng, 1)[0],
+        company=f"company{i % 500}",
+        description=synth.job_text(rng, 300),
+      ),
+      None,
+    )
+    for i in range(300 * inp.scale)
+  ])
+  return store
+
+
+def case_jobs_search(inp: Inputs) -> Callable[[], object]:
+  # one two-word query
+  store = _job_store(inp)
+  q = " ".join(inp.terms[0].split()[:2])
+  return lambda: store.search(q, limit=20)
+
+
+def case_minhash_signature(inp: Inputs) -> Callable[[], object]:
+  return lambda: minhash.signature(inp.job_text)
+
+
+def case_jobs_dedupe(inp: Inputs) -> Callable[[], object]:
+  # LSH lookup of a precomputed signature; the store holds one repost of the job
+  store = _job_store(inp)
+  store.upsert(JobPost(
+    url="https://example.com/repost", source="other", date_pulled=date(2025, 1, 1),
+    title="repost", company="repost", description=inp.job_text.replace(" and ", " & "),
+  ))
+  sig = minhash.signature(inp.job_text)
+  return lambda: store.near_duplicates(sig)
+
+
+# name -> (factory, needs_nltk)
+CASES: dict[str, tuple[Callable[[Inputs], Callable[[], object]], bool]] = {
+  "tokens_simple": (case_tokens_simple, False),
+  "tokens_nltk": (case_tokens_nltk, True),
+  "phrase_hits": (case_phrase_hits, False),
+  "score_bullet": (case_score_bullet, False),
+  "top_terms_from_job_simple": (case_top_terms_simple, False),
+  "top_terms_from_job_nltk": (case_top_terms_nltk, True),
+  "top_terms_from_job_tfidf": (case_top_terms_tfidf, False),
+  "missing_keywords": (case_missing_keywords, False),
+  "tailor": (case_tailor, False),
+  "tailor_nltk": (case_tailor_nltk, True),
+  "normalize_markdown_spacing": (case_normalize_markdown_spacing, False),
+  "postprocess_markdown": (case_postprocess_markdown, False),
+  "parse_professional_experience": (case_parse_professional_experience, False),
+  "clipboard_capture": (case_clipboard_capture, False),
+  "jobs_search": (case_jobs_search, False),
+  "minhash_signature": (case_minhash_signature, False),
+  "jobs_dedupe": (case_jobs_dedupe, False),
+}
+
+
+# ----------------------------
+# Runner
+# ----------------------------
+
+def time_case(fn: Callable[[], object], repeat: int) -> dict:
+  timer = timeit.Timer(fn)
+  loops, _ = timer.autorange()  # also serves as warm-up (lazy imports, matcher compile)
+  per_call = [t / loops for t in timer.repeat(repeat=repeat, number=loops)]
+  return {
+    "loops": loops,
+    "repeat": repeat,
+    "min_s": min(per_call),
+    "median_s": statistics.median(per_call),
+  }
+
+
+def git_commit() -> str:
+  try:
+    out = subprocess.run(
+      ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    return out.stdout.strip()
+  except Exception:
+    return ""
+
+
+def nltk_usable() -> bool:
+  """NLTK installed *and* its tokenizer/tagger data present."""
+  if not nltk_available():
+    return False
+  try:
+    tokens_nltk("Managed vendor programs.", set())
+    return True
+  except LookupError:
+    return False
+
+
+def main() -> int:
+  ap = argparse.ArgumentParser()
+  ap.add_argument("--out", default=None, help="Write results JSON here (default: print only)")
+  ap.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES))
+  ap.add_argument("--only", nargs="+", default=None, choices=sorted(CASES), help="Run only these cases")
+  ap.add_argument("--repeat", type=int, default=5)
+  ap.add_argument("--seed", type=int, default=DEFAULT_SEED)
+  ap.add_argument("--config", default=None, help="TOML config (default: packaged tailor_resume.toml)")
+  args = ap.parse_args()
+
+  cfg = load_run_config(args.config)
+  have_nltk = nltk_usable()
+
+  results: list[dict] = []
+  for scale in args.scales:
+    inp = build_inputs(cfg, scale, args.seed)
+    for name, (factory, needs_nltk) in CASES.items():
+      if args.only and name not in args.only:
+        continue
+      if needs_nltk and not have_nltk:
+        print(f"skip  {name:<32} x{scale:<4} (nltk data not available)")
+        continue
+      r = {"name": name, "scale": scale, "size": inp.size(), **time_case(factory(inp), args.repeat)}
+      results.append(r)
+      print(f"{r['min_s'] * 1000:10.3f} ms  {name:<32} x{scale}")
+
+  payload = {
+    "meta": {
+      "commit": git_commit(),
+      "timestamp": datetime.now().isoformat(timespec="seconds"),
+      "python": platform.python_version(),
+      "platform": platform.platform(),
+      "seed": args.seed,
+      "nltk": have_nltk,
+      "numpy": NUMPY_AVAILABLE,
+    },
+    "results": results,
+  }
+  if args.out:
+    Path(args.out).write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    print(f"wrote {args.out}")
+  return 0
+
+
+if __name__ == "__main__":
+  raise SystemExit(main())
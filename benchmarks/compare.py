@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+"""
+Compare two bench_hotpaths.py result files.
+
+Cases are matched on (name, scale) and compared on min_s (the least noisy
+number). Exits 1 if any case got slower than --threshold, so it can gate
+a deploy.
+
+how to run from command line
+
+python3 benchmarks/compare.py base.json new.json
+python3 benchmarks/compare.py base.json new.json --threshold 0.25
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+
+def load_results(path: Path) -> tuple[dict, dict[tuple[str, int], dict]]:
+  data = json.loads(path.read_text(encoding="utf-8"))
+  return data.get("meta", {}), {(r["name"], int(r["scale"])): r for r in data.get("results", [])}
+
+
+def main() -> int:
+  ap = argparse.ArgumentParser()
+  ap.add_argument("base")
+  ap.add_argument("new")
+  ap.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown as a fraction (0.10 = +10%%)")
+  args = ap.parse_args()
+
+  base_meta, base = load_results(Path(args.base))
+  new_meta, new = load_results(Path(args.new))
+  print(f"base {base_meta.get('commit', '?')}  vs  new {new_meta.get('commit', '?')}")
+  print(f"{'case':<32} {'scale':>5} {'base ms':>10} {'new ms':>10} {'ratio':>7}")
+
+  regressions = 0
+  for key in sorted(set(base) | set(new)):
+    name, scale = key
+    b, n = base.get(key), new.get(key)
+    if b is None or n is None:
+      b_ms = "-" if b is None else f"{b['min_s'] * 1000:.3f}"
+      n_ms = "-" if n is None else f"{n['min_s'] * 1000:.3f}"
+      print(f"{name:<32} {scale:>5} {b_ms:>10} {n_ms:>10} {'n/a':>7}")
+      continue
+    ratio = n["min_s"] / b["min_s"] if b["min_s"] > 0 else float("inf")
+    flag = ""
+    if ratio > 1.0 + args.threshold:
+      flag = "  REGRESSION"
+      regressions += 1
+    print(f"{name:<32} {scale:>5} {b['min_s'] * 1000:>10.3f} {n['min_s'] * 1000:>10.3f} {ratio:>6.2f}x{flag}")
+
+  if regressions:
+    print(f"FAIL: {regressions} case(s) slower than +{args.threshold:.0%}")
+    return 1
+  print("OK")
+  return 0
+
+
+if __name__ == "__main__":
+  raise SystemExit(main())
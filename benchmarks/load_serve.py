@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+
+"""
+Load test for `tailor_resume serve`: N concurrent keep-alive clients POST
+saved job posts to /tailor and the run reports throughput, client-side
+latency percentiles, 503 (backpressure) count, and the server's own
+/health and /metrics/latency afterwards. Stdlib only.
+
+how to run from command line
+
+python -m tailor_resume serve --resume resume_base.md --workers 4 &
+python3 benchmarks/load_serve.py --jobs jobs/ --concurrency 1 --requests 40
+python3 benchmarks/load_serve.py --jobs jobs/ --concurrency 8 --requests 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from collections import Counter
+from itertools import cycle
+from pathlib import Path
+from urllib.parse import urlsplit
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from tailor_resume.batch import iter_job_inputs  # noqa: E402
+
+
+async def request(
+  reader: asyncio.StreamReader,
+  writer: asyncio.StreamWriter,
+  method: str,
+  path: str,
+  host: str,
+  payload: dict | None = None,
+) -> tuple[int, bytes]:
+  body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+  head = (
+    f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+    f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+  )
+  writer.write(head.encode("latin-1") + body)
+  await writer.drain()
+
+  status = int((await reader.readline()).split()[1])
+  length = 0
+  while True:
+    line = await reader.readline()
+    if line in (b"\r\n", b""):
+      break
+    name, _, value = line.decode("latin-1").partition(":")
+    if name.strip().lower() == "content-length":
+      length = int(value)
+  return status, await reader.readexactly(length) if length else b""
+
+
+async def get_json(host: str, port: int, path: str) -> dict:
+  reader, writer = await asyncio.open_connection(host, port)
+  try:
+    _, body = await request(reader, writer, "GET", path, host)
+    return json.loads(body)
+  finally:
+    writer.close()
+
+
+async def client(host: str, port: int, jobs, n_left: list[int], latencies: list[float], statuses: Counter) -> None:
+  reader, writer = await asyncio.open_connection(host, port)
+  try:
+    while n_left[0] > 0:
+      n_left[0] -= 1
+      job = next(jobs)
+      t0 = time.perf_counter()
+      status, _ = await request(
+        reader, writer, "POST", "/tailor", host, {"job_text": job.text, "url": job.url, "profile": "load"}
+      )
+      statuses[status] += 1
+      if status == 200:
+        latencies.append((time.perf_counter() - t0) * 1000)
+      elif status == 503:
+        await asyncio.sleep(0.05)  # honour backpressure instead of spinning
+  finally:
+    writer.close()
+
+
+def pct(xs: list[float], q: float) -> float:
+  if not xs:
+    return float("nan")
+  xs = sorted(xs)
+  return xs[min(len(xs) - 1, int(q * len(xs)))]
+
+
+async def run(args) -> int:
+  u = urlsplit(args.url)
+  host, port = u.hostname or "127.0.0.1", u.port or 8765
+
+  jobs = list(iter_job_inputs(Path(args.jobs)))
+  if not jobs:
+    print(f"no job posts in {args.jobs}")
+    return 1
+
+  latencies: list[float] = []
+  statuses: Counter = Counter()
+  n_left = [args.requests]
+  t0 = time.perf_counter()
+  await asyncio.gather(*(client(host, port, cycle(jobs), n_left, latencies, statuses) for _ in range(args.concurrency)))
+  elapsed = time.perf_counter() - t0
+
+  ok = statuses.get(200, 0)
+  print(f"concurrency {args.concurrency}: {sum(statuses.values())} requests in {elapsed:.2f}s")
+  print(f"  ok {ok}  503 {statuses.get(503, 0)}  other {sum(statuses.values()) - ok - statuses.get(503, 0)}")
+  print(f"  throughput {ok / elapsed:.2f} ok req/s")
+  if latencies:
+    print(
+      f"  latency ms: p50 {pct(latencies, 0.50):.1f}  p90 {pct(latencies, 0.90):.1f}  "
+      f"p99 {pct(latencies, 0.99):.1f}  mean {statistics.fmean(latencies):.1f}"
+    )
+
+  health = await get_json(host, port, "/health")
+  hist = await get_json(host, port, "/metrics/latency")
+  print(f"  server: workers {health['workers']}  ok {health['ok']}  failed {health['failed']}  rejected {health['rejected']}")
+  print(f"  server latency: p50<={hist['p50_ms_le']}  p90<={hist['p90_ms_le']}  p99<={hist['p99_ms_le']} ms")
+  return 0 if statuses.get(200, 0) else 1
+
+
+def main() -> int:
+  ap = argparse.ArgumentParser()
+  ap.add_argument("--jobs", required=True, help="Directory of job text files or a .jsonl file (as for `batch`)")
+  ap.add_argument("--url", default="http://127.0.0.1:8765", help="Server base URL")
+  ap.add_argument("--concurrency", type=int, default=8, help="Concurrent keep-alive clients")
+  ap.add_argument("--requests", type=int, default=100, help="Total POST /tailor requests")
+  return asyncio.run(run(ap.parse_args()))
+
+
+if __name__ == "__main__":
+  raise SystemExit(main())
@@ -0,0 +1,106 @@
+"""
+Seeded synthetic inputs for the benchmarks.
+
+Everything is derived from one random.Random(seed), so the same seed and
+scale always produce the same resume, job post and term lists.
+"""
+from __future__ import annotations
+
+import random
+
+VOCAB = """
+platform migration kubernetes cloud infrastructure revenue operations forecasting pipeline
+salesforce hubspot looker tableau dashboard kpi okr arr mrr churn retention onboarding
+stakeholder executive communication roadmap program project portfolio governance risk
+compliance audit vendor procurement contract budget finance headcount hiring coaching
+agile scrum kanban sprint backlog release delivery deployment automation integration api
+data warehouse analytics sql python modeling reporting metrics sla incident escalation
+customer support success enablement training documentation process improvement lean
+six sigma change management cross functional alignment strategy planning quarterly
+annual review launch go-to-market pricing packaging partner channel enterprise mid-market
+security privacy identity access networking observability monitoring reliability
+latency throughput capacity cost optimization savings efficiency productivity quality
+testing validation cutover legacy modernization architecture design review prioritization
+""".split()
+
+ACTION_VERBS = [
+  "Led", "Built", "Drove", "Delivered", "Managed", "Launched", "Designed", "Reduced",
+  "Increased", "Standardized", "Automated", "Partnered", "Facilitated", "Owned",
+]
+
+FILLER = [
+  "Responsible for", "Helped with", "Worked on", "Assisted with", "Supported",
+]
+
+
+def words(rng: random.Random, n: int) -> list[str]:
+  return [rng.choice(VOCAB) for _ in range(n)]
+
+
+def phrases(rng: random.Random, n: int, *, min_words: int = 1, max_words: int = 3) -> list[str]:
+  """n distinct phrases of min_words..max_words words."""
+  out: list[str] = []
+  seen: set[str] = set()
+  while len(out) < n:
+    p = " ".join(words(rng, rng.randint(min_words, max_words)))
+    if p in seen:
+      continue
+    seen.add(p)
+    out.append(p)
+  return out
+
+
+def bullet(rng: random.Random) -> str:
+  head = rng.choice(ACTION_VERBS) if rng.random() < 0.75 else rng.choice(FILLER)
+  body = " ".join(words(rng, rng.randint(8, 28)))
+  metric = ""
+  r = rng.random()
+  if r < 0.3:
+    metric = f", cutting cost by {rng.randint(5, 60)}%"
+  elif r < 0.45:
+    metric = f" saving ${rng.randint(1, 9)}.{rng.randint(0, 9)}M annually"
+  elif r < 0.6:
+    metric = f" across {rng.randint(2, 40)} teams"
+  return f"{head} {body}{metric}"
+
+
+def bullets(rng: random.Random, n: int) -> list[str]:
+  return [bullet(rng) for _ in range(n)]
+
+
+def job_text(rng: random.Random, n_words: int) -> str:
+  """Paragraphs of ~60 words separated by blank lines, like a pasted posting."""
+  paras: list[str] = []
+  left = n_words
+  while left > 0:
+    k = min(left, 60)
+    sent = words(rng, k)
+    sent[0] = sent[0].capitalize()
+    paras.append(" ".join(sent) + ".")
+    left -= k
+  return "\n\n".join(paras) + "\n"
+
+
+def resume_markdown(rng: random.Random, *, roles: int, bullets_per_role: int, competencies: int) -> str:
+  lines: list[str] = [
+    "# JANE DOE",
+    "| jane@example.com | Boston, MA | 555-0100 |",
+    "",
+    "## SUMMARY",
+    " ".join(words(rng, 30)).capitalize() + ".",
+    "",
+    "## CORE_COMPETENCIES",
+  ]
+  for p in phrases(rng, competencies, min_words=2, max_words=4):
+    lines.append(f"- {p.title()}")
+  lines += ["", "## PROFESSIONAL_EXPERIENCE", ""]
+  for i in range(roles):
+    lines.append(f"### {' '.join(words(rng, 2)).upper()} MANAGER")
+    lines.append(f"#### COMPANY {i} | REMOTE | {2024 - 2 * i - 2} – {2024 - 2 * i}")
+    lines.append("")
+    for b in bullets(rng, bullets_per_role):
+      lines.append(f"- {b}")
+      if rng.random() < 0.1:
+        lines.append("  > Interview: lead with this one.")
+    lines.append("")
+  return "\n".join(lines)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+"""
+Import-time budget check for the CLI.
+
+Runs `python -X importtime -m tailor_resume --help` and fails if
+- importing tailor_resume.cli takes longer than the budget, or
+- nltk gets imported at all (it must stay lazy for non-NLTK runs).
+
+how to run from command line
+
+python3 scripts/check_import_time.py
+python3 scripts/check_import_time.py --budget-ms 150
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BUDGET_MS = 250.0
+
+
+def measure_imports() -> dict[str, int]:
+  """module -> cumulative import time (us) for one `--help` run."""
+  env = dict(os.environ)
+  env["PYTHONPATH"] = os.pathsep.join(p for p in [str(REPO_ROOT / "src"), env.get("PYTHONPATH", "")] if p)
+  proc = subprocess.run(
+    [sys.executable, "-X", "importtime", "-m", "tailor_resume", "--help"],
+    capture_output=True,
+    text=True,
+    env=env,
+  )
+  if proc.returncode != 0:
+    raise RuntimeError(f"`tailor_resume --help` failed:\n{proc.stderr}")
+
+  out: dict[str, int] = {}
+  for line in proc.stderr.splitlines():
+    if not line.startswith("import time:") or "|" not in line:
+      continue
+    _self, cumulative, name = line[len("import time:"):].split("|", 2)
+    if not cumulative.strip().isdigit():
+      continue  # header line
+    out[name.strip()] = int(cumulative)
+  return out
+
+
+def main() -> int:
+  ap = argparse.ArgumentParser()
+  ap.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+  ap.add_argument("--runs", type=int, default=3, help="Best-of-N runs (smooths out a cold disk cache)")
+  args = ap.parse_args()
+
+  best_ms = None
+  for _ in range(args.runs):
+    imports = measure_imports()
+
+    heavy = sorted(m for m in imports if m == "nltk" or m.startswith("nltk."))
+    if heavy:
+      print(f"FAIL: nltk imported by `--help` ({len(heavy)} nltk modules)")
+      return 1
+
+    ms = imports.get("tailor_resume.cli", 0) / 1000.0
+    best_ms = ms if best_ms is None else min(best_ms, ms)
+
+  ok = best_ms is not None and best_ms <= args.budget_ms
+  print(f"{'OK' if ok else 'FAIL'}: tailor_resume.cli import {best_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+  return 0 if ok else 1
+
+
+if __name__ == "__main__":
+  raise SystemExit(main())
@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .resume_cache import PreparedResume
+from .jobpost.types import JobPost
+from .jobpost.flow import build_job_post, finalize_job_post, MissingRequiredFieldsError
+from .run_log import record_run
+from .session import TailorSession
+from .tailor_config import TailorConfig
+from .pipeline import (
+  TailoredResume,
+  load_run_config,
+  load_base_resume,
+  resume_output_paths,
+  write_tailored_resume,
+  resolve_cache_dir,
+  resolve_csv_log_path,
+  build_log_row,
+)
+
+
+JOB_TEXT_SUFFIXES = {".txt", ".md"}
+
+
+@dataclass(frozen=True)
+class JobInput:
+  source: str  # file path or "file.jsonl:LINE", for error messages
+  url: str
+  text: str
+  capture_method: str = "batch"
+  error: str = ""  # set when the input itself could not be read (bad JSONL line)
+
+
+@dataclass
+class JobOutcome:
+  """Result of the CPU-bound part of a job (no filesystem side effects)."""
+  source: str
+  post: JobPost | None = None
+  markdown: str = ""
+  report: dict | None = None
+  error: str = ""
+
+
+@dataclass
+class BatchResult:
+  source: str
+  ok: bool
+  jobpost_path: Path | None = None
+  resume_out: Path | None = None
+  report_out: Path | None = None
+  log_row: dict | None = None
+  error: str = ""
+
+
+def build_argparser() -> argparse.ArgumentParser:
+  ap = argparse.ArgumentParser(
+    prog="tailor_resume batch",
+    description="Tailor one base resume against many saved job posts in one process.",
+  )
+  ap.add_argument("--resume", required=True, help="Path to resume_base.md")
+  ap.add_argument(
+    "--jobs",
+    required=True,
+    help="Directory of job text files (*.txt, *.md; optional URL on the first line) "
+    "or a .jsonl file with one {\"url\": ..., \"text\": ...} object per line",
+  )
+  ap.add_argument("--out-dir", default=None, help="Directory for outputs (jobpost + tailored resume + report)")
+  ap.add_argument("--config", default=None, help="Optional TOML config")
+  ap.add_argument("--use-nltk", action="store_true", help="Enable NLTK if installed")
+  ap.add_argument("--dry-run", action="store_true")
+  ap.add_argument("--no-cache", action="store_true", help="Re-parse and re-featurize the base resume (skip the on-disk cache)")
+  ap.add_argument("--fail-fast", action="store_true", help="Stop at the first job that fails")
+
+  ap.add_argument("--workers", type=int, default=1, help="Worker processes for tailoring (default: 1 = in-process)")
+  ap.add_argument(
+    "--max-jobs-per-worker",
+    type=int,
+    default=0,
+    help="Recycle a worker process after this many jobs to bound NLTK memory growth (0 = never)",
+  )
+
+  ap.add_argument("--log-csv", default=None, help="Append a row to this CSV file per job")
+  ap.add_argument("--profile", default="base", help="Label for the resume/profile used (default: base)")
+  ap.add_argument("--status", default="", help="Optional submission status to log (drafted/submitted/interview/etc.)")
+  return ap
+
+
+def _split_url_line(text: str) -> tuple[str, str]:
+  """A job text file may start with its URL; split it off if so."""
+  first, sep, rest = text.lstrip().partition("\n")
+  if first.strip().lower().startswith(("http://", "https://")):
+    return first.strip(), rest
+  return "", text
+
+
+def read_job_file(p: Path) -> JobInput:
+  url, text = _split_url_line(p.read_text(encoding="utf-8"))
+  return JobInput(source=str(p), url=url, text=text)
+
+
+def iter_job_inputs(path: Path) -> Iterator[JobInput]:
+  if path.is_dir():
+    for p in sorted(path.iterdir()):
+      if p.is_file() and p.suffix.lower() in JOB_TEXT_SUFFIXES:
+        yield read_job_file(p)
+    return
+
+  if not path.exists():
+    raise FileNotFoundError(f"Jobs input not found: {path}")
+
+  if path.suffix.lower() != ".jsonl":
+    raise ValueError(f"Expected a directory or a .jsonl file, got: {path.name}")
+
+  with path.open(encoding="utf-8") as f:
+    for lineno, line in enumerate(f, start=1):
+      if not line.strip():
+        continue
+      try:
+        obj = json.loads(line)
+        if not isinstance(obj, dict):
+          raise ValueError(f"expected a JSON object, got {type(obj).__name__}")
+      except ValueError as e:
+        # one bad line fails its own job, not the whole batch
+        yield JobInput(source=f"{path}:{lineno}", url="", text="", error=f"invalid JSONL line: {e}")
+        continue
+      yield JobInput(
+        source=f"{path}:{lineno}",
+        url=str(obj.get("url") or "").strip(),
+        text=str(obj.get("text") or ""),
+      )
+
+
+# ----------------------------
+# Worker side (pure compute)
+# ----------------------------
+
+# Set once per worker process by init_worker, so config + parsed resume are
+# shipped to each worker once instead of being pickled with every task.
+_WORKER_STATE: TailorSession | None = None
+
+
+def init_worker(cfg: TailorConfig, resume: PreparedResume) -> None:
+  global _WORKER_STATE
+  _WORKER_STATE = TailorSession(cfg, resume)
+
+
+def tailor_job(job: JobInput) -> JobOutcome:
+  """parse -> tailor -> validate for one job, using the worker's shared state."""
+  session = _WORKER_STATE
+  if session is None:
+    raise RuntimeError("Batch worker not initialized (call init_worker first).")
+  if job.error:
+    return JobOutcome(source=job.source, error=job.error)
+
+  try:
+    post = build_job_post(url=job.url, job_text=job.text, capture_method=job.capture_method)
+  except MissingRequiredFieldsError as e:
+    return JobOutcome(
+      source=job.source,
+      error=f"missing required fields: {', '.join(e.missing)} (source={e.source})",
+    )
+
+  # per-job stopwords are layered on a view; the shared config stays untouched
+  try:
+    res = session.tailor_job(post)
+  except RuntimeError as e:
+    return JobOutcome(source=job.source, post=post, error=str(e))
+
+  return JobOutcome(source=job.source, post=post, markdown=res.markdown, report=res.report)
+
+
+def _collect(job: JobInput, fut) -> JobOutcome:
+  try:
+    return fut.result()
+  except Exception as e:  # e.g. BrokenProcessPool: a worker died (OOM-killed, crashed)
+    return JobOutcome(source=job.source, error=f"{type(e).__name__}: {e}")
+
+
+def iter_outcomes(
+  jobs: Iterable[JobInput],
+  cfg: TailorConfig,
+  resume: PreparedResume,
+  *,
+  workers: int,
+  max_jobs_per_worker: int,
+) -> Iterator[JobOutcome]:
+  """Yield outcomes in input order, whichever worker finishes first."""
+  if workers <= 1:
+    init_worker(cfg, resume)
+    for job in jobs:
+      try:
+        outcome = tailor_job(job)
+      except Exception as e:  # one bad job must not end the batch
+        outcome = JobOutcome(source=job.source, error=f"{type(e).__name__}: {e}")
+      yield outcome
+    return
+
+  pool_kwargs: dict = {}
+  if max_jobs_per_worker > 0:
+    pool_kwargs["max_tasks_per_child"] = max_jobs_per_worker  # py3.11+
+
+  # bounded window: keeps every worker busy without reading all jobs up front
+  window = workers * 4
+  with ProcessPoolExecutor(
+    max_workers=workers,
+    initializer=init_worker,
+    initargs=(cfg, resume),
+    **pool_kwargs,
+  ) as ex:
+    pending: deque = deque()  # (job, future)
+    try:
+      for job in jobs:
+        try:
+          fut = ex.submit(tailor_job, job)
+        except Exception as e:  # pool already broken: fail the rest in order
+          fut = Future()
+          fut.set_exception(e)
+        pending.append((job, fut))
+        if len(pending) >= window:
+          yield _collect(*pending.popleft())
+      while pending:
+        yield _collect(*pending.popleft())
+    finally:
+      # consumer stopped early (--fail-fast): don't start queued jobs
+      for _, fut in pending:
+        fut.cancel()
+
+
+# ----------------------------
+# Parent side (ordered IO)
+# ----------------------------
+
+def commit_outcome(
+  outcome: JobOutcome,
+  *,
+  args,
+  base_resume: Path,
+  base_out_root: Path,
+  cfg: TailorConfig,
+) -> BatchResult:
+  """Archive the job post and write outputs; always runs in the parent, in input order."""
+  if outcome.post is None:
+    return BatchResult(source=outcome.source, ok=False, error=outcome.error)
+
+  job_result = finalize_job_post(outcome.post, base_out_root=base_out_root, dry_run=args.dry_run)
+  if outcome.error:
+    return BatchResult(source=outcome.source, ok=False, jobpost_path=job_result.jobpost_path, error=outcome.error)
+
+  resume_out, report_out = resume_output_paths(outcome.post, job_result.out_dir)
+  result = TailoredResume(
+    markdown=outcome.markdown,
+    report=outcome.report or {},
+    resume_out=resume_out,
+    report_out=report_out,
+  )
+
+  if not args.dry_run:
+    write_tailored_resume(result, outcome.post, profile=args.profile, jobpost_path=job_result.jobpost_path)
+
+  row = build_log_row(
+    result=result,
+    jobpost_path=job_result.jobpost_path,
+    base_resume=base_resume,
+    cfg=cfg,
+    profile=args.profile,
+    status=args.status,
+  )
+  return BatchResult(
+    source=outcome.source,
+    ok=True,
+    jobpost_path=job_result.jobpost_path,
+    resume_out=resume_out,
+    report_out=report_out,
+    log_row=row,
+  )
+
+
+def report_result(res: BatchResult, csv_path: Path | None, *, dry_run: bool) -> None:
+  if res.ok:
+    if csv_path and not dry_run and res.log_row is not None:
+      record_run(csv_path, res.log_row)
+    print(f"ok     {res.source} -> {res.resume_out}")
+  else:
+    print(f"FAILED {res.source}: {res.error.splitlines()[0] if res.error else 'unknown error'}")
+
+
+def print_summary(n_ok: int, n_failed: int, elapsed: float) -> None:
+  total = n_ok + n_failed
+  rate = total / elapsed if elapsed > 0 else 0.0
+  print(f"Batch: {total} jobs ({n_ok} ok, {n_failed} failed) in {elapsed:.2f}s -> {rate:.2f} jobs/sec")
+
+
+def main(argv: list[str] | None = None) -> int:
+  args = build_argparser().parse_args(argv)
+
+  base_resume = Path(args.resume)
+  if not base_resume.exists():
+    raise FileNotFoundError(f"Resume not found: {base_resume}")
+
+  # ---- shared state, prepared once for the whole batch ----
+  cfg = load_run_config(args.config, use_nltk=args.use_nltk, out_dir=args.out_dir)
+  resume = load_base_resume(base_resume, cfg, cache_dir=resolve_cache_dir(args.no_cache, cfg))
+  base_out_root = Path(args.out_dir) if args.out_dir else Path(cfg.paths_out_root)
+  csv_path = resolve_csv_log_path(args.log_csv, cfg)
+
+  n_ok = 0
+  n_failed = 0
+  t0 = time.perf_counter()
+  outcomes = iter_outcomes(
+    iter_job_inputs(Path(args.jobs)),
+    cfg,
+    resume,
+    workers=args.workers,
+    max_jobs_per_worker=args.max_jobs_per_worker,
+  )
+  for outcome in outcomes:
+    try:
+      res = commit_outcome(outcome, args=args, base_resume=base_resume, base_out_root=base_out_root, cfg=cfg)
+    except Exception as e:  # e.g. OSError writing outputs; report it and keep going
+      res = BatchResult(source=outcome.source, ok=False, error=f"{type(e).__name__}: {e}")
+    report_result(res, csv_path, dry_run=args.dry_run)
+    if res.ok:
+      n_ok += 1
+    else:
+      n_failed += 1
+      if args.fail_fast:
+        break
+  elapsed = time.perf_counter() - t0
+
+  print_summary(n_ok, n_failed, elapsed)
+  return 0 if n_failed == 0 else 1
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import argparse
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from .clipboard_capture import ClipboardSource, detect_source
+from .clipboard_flow import capture_from_clipboard
+from .jobpost import minhash
+from .jobpost.flow import build_job_post, MissingRequiredFieldsError
+from .jobpost.store import DUPLICATE_THRESHOLD, find_near_duplicate, job_key
+from .jobpost.types import JobPost
+from .session import TailorSession
+from .batch import BatchResult, JobOutcome, commit_outcome, report_result
+from .pipeline import resolve_csv_log_path
+
+
+def build_argparser() -> argparse.ArgumentParser:
+  ap = argparse.ArgumentParser(
+    prog="tailor_resume capture",
+    description="Interactive capture loop: copy URL + description for one posting after another; "
+    "each is tailored and written in the background while you copy the next. Ctrl-C to stop.",
+  )
+  ap.add_argument("--resume", required=True, help="Path to resume_base.md")
+  ap.add_argument("--out-dir", default=None, help="Directory for outputs (jobpost + tailored resume + report)")
+  ap.add_argument("--config", default=None, help="Optional TOML config")
+  ap.add_argument("--use-nltk", action="store_true", help="Enable NLTK if installed")
+  ap.add_argument("--dry-run", action="store_true")
+  ap.add_argument("--no-cache", action="store_true", help="Re-parse and re-featurize the base resume (skip the on-disk cache)")
+  ap.add_argument("--max-jobs", type=int, default=0, help="Stop capturing after this many postings (0 = until Ctrl-C)")
+  ap.add_argument(
+    "--on-duplicate", choices=("warn", "skip", "ignore"), default="warn",
+    help="When a posting nearly matches an archived one: warn and tailor anyway (default), skip it, or don't check",
+  )
+  ap.add_argument("--duplicate-threshold", type=float, default=DUPLICATE_THRESHOLD)
+
+  ap.add_argument("--log-csv", default=None, help="Append a row to this CSV file per job")
+  ap.add_argument("--profile", default="base", help="Label for the resume/profile used (default: base)")
+  ap.add_argument("--status", default="", help="Optional submission status to log (drafted/submitted/interview/etc.)")
+  return ap
+
+
+def tailor_and_write(
+  n: int,
+  post: JobPost,
+  session: TailorSession,
+  args,
+  *,
+  base_resume: Path,
+  base_out_root: Path,
+  csv_path: Path | None,
+) -> BatchResult:
+  """Background half of one capture: tailor, write outputs, log, report."""
+  source = f"#{n} {post.company} / {post.title}"
+  try:
+    try:
+      res = session.tailor_job(post)
+      outcome = JobOutcome(source=source, post=post, markdown=res.markdown, report=res.report)
+    except RuntimeError as e:
+      outcome = JobOutcome(source=source, post=post, error=str(e))
+    result = commit_outcome(outcome, args=args, base_resume=base_resume, base_out_root=base_out_root, cfg=session.cfg)
+  except Exception as e:  # report it; the capture loop keeps going
+    result = BatchResult(source=source, ok=False, error=f"{type(e).__name__}: {e}")
+  report_result(result, csv_path, dry_run=args.dry_run)
+  return result
+
+
+def queued_duplicate(
+  sig: tuple[int, ...],
+  queued: list[tuple[int, JobPost, tuple[int, ...]]],
+  threshold: float,
+  *,
+  exclude_key: str | None = None,
+) -> tuple[float, int, JobPost] | None:
+  """Closest posting captured earlier this session (not in the job store until its job commits)."""
+  best = None
+  for n, post, other in queued:
+    if exclude_key is not None and job_key(post) == exclude_key:
+      continue
+    sim = minhash.similarity(sig, other)
+    if sim >= threshold and (best is None or sim > best[0]):
+      best = (sim, n, post)
+  return best
+
+
+def run_capture_loop(
+  source: ClipboardSource,
+  session: TailorSession,
+  args,
+  *,
+  base_resume: Path,
+  base_out_root: Path,
+  csv_path: Path | None,
+) -> list[BatchResult]:
+  """
+  Capture postings in the foreground, tailor them on one background thread
+  (FIFO, so CSV rows and output writes stay in capture order). Returns the
+  results once every captured job has finished.
+  """
+  futures: list[Future] = []
+  queued: list[tuple[int, JobPost, tuple[int, ...]]] = []  # (n, post, signature) of this session's captures
+  n = 0
+  with ThreadPoolExecutor(max_workers=1, thread_name_prefix="tailor") as ex:
+    try:
+      while not args.max_jobs or n < args.max_jobs:
+        cap = capture_from_clipboard(source)
+        try:
+          post = build_job_post(url=cap.url, job_text=cap.description, capture_method="clipboard")
+        except MissingRequiredFieldsError as e:
+          print(f"missing required fields: {', '.join(e.missing)} (source={e.source}); copy this posting again")
+          continue
+        sig = None
+        if args.on_duplicate != "ignore":
+          sig = minhash.signature(post.description)
+          key = job_key(post)  # a re-copied posting updates its own row: not a duplicate
+          dup = find_near_duplicate(
+            sig, base_out_root=base_out_root, threshold=args.duplicate_threshold, exclude_key=key
+          )
+          qdup = None if dup is not None else queued_duplicate(sig, queued, args.duplicate_threshold, exclude_key=key)
+          if dup is not None:
+            print(f"near-duplicate ({dup.similarity:.0%}) of {dup.hit.company} / {dup.hit.title}: {dup.hit.jobpost_path}")
+          elif qdup is not None:
+            print(f"near-duplicate ({qdup[0]:.0%}) of queued #{qdup[1]}: {qdup[2].company} / {qdup[2].title}")
+          if (dup is not None or qdup is not None) and args.on_duplicate == "skip":
+            continue
+        n += 1
+        if sig is not None:
+          queued.append((n, post, sig))
+        futures.append(ex.submit(
+          tailor_and_write, n, post, session, args,
+          base_resume=base_resume, base_out_root=base_out_root, csv_path=csv_path,
+        ))
+        busy = sum(not f.done() for f in futures)
+        print(f"queued #{n}: {post.company} / {post.title} ({busy} in progress)")
+    except KeyboardInterrupt:
+      busy = sum(not f.done() for f in futures)
+      print(f"\nstopped capturing; finishing {busy} queued job(s) ...")
+  return [f.result() for f in futures]
+
+
+def main(argv: list[str] | None = None) -> int:
+  args = build_argparser().parse_args(argv)
+
+  base_resume = Path(args.resume)
+  if not base_resume.exists():
+    raise FileNotFoundError(f"Resume not found: {base_resume}")
+
+  session = TailorSession.open(
+    base_resume, config_path=args.config, use_nltk=args.use_nltk, no_cache=args.no_cache, out_dir=args.out_dir
+  )
+  base_out_root = Path(args.out_dir) if args.out_dir else Path(session.cfg.paths_out_root)
+  csv_path = resolve_csv_log_path(args.log_csv, session.cfg)
+
+  source = detect_source()
+  print(f"Capturing from {source.name}; Ctrl-C when done.")
+  t0 = time.perf_counter()
+  try:
+    results = run_capture_loop(
+      source, session, args, base_resume=base_resume, base_out_root=base_out_root, csv_path=csv_path
+    )
+  finally:
+    source.close()
+
+  n_ok = sum(r.ok for r in results)
+  print(f"Capture: {len(results)} jobs ({n_ok} ok, {len(results) - n_ok} failed) in {time.perf_counter() - t0:.1f}s")
+  return 0 if n_ok == len(results) else 1
@@ -1,27 +1,44 @@
 from __future__ import annotations
 
 import argparse
-import json
+import importlib
+import sys
+from contextlib import nullcontext
 from pathlib import Path
-from datetime import date
 
 from .jobpost.flow import build_job_post_from_cli, MissingRequiredFieldsError
-from .resume_parse import parse_professional_experience, render_resume_with_new_roles
-from .tailor_engine import tailor
-from .markdown_rules import normalize_markdown_spacing, validate_markdown
-from .notes_rules import strip_notes_from_markdown, validate_notes_placement
-from .text_utils import make_contact_table, safe_slug
-from .scoring import apply_reordered_core_competencies
-from .run_log import append_csv_row
-from .text_utils import now_iso_local
-from .resume_frontmatter import render_resume_frontmatter
-from .config.stopwords import load_stopwords
-from .tailor_config import TailorConfig
-from .tailor_config import load_config
+from .jobpost.store import DUPLICATE_THRESHOLD
+from .run_log import record_run
+from .session import job_config
+from .timings import StageTimings, collect_timings, stage
+from .pipeline import (
+  load_run_config,
+  load_base_resume,
+  resume_output_paths,
+  tailor_job_post,
+  write_tailored_resume,
+  resolve_cache_dir,
+  resolve_csv_log_path,
+  build_log_row,
+)
+
+
+# subcommands live in their own modules and are imported on demand
+SUBCOMMANDS: dict[str, str] = {
+  "batch": ".batch",
+  "capture": ".capture",
+  "jobs": ".jobs",
+  "log": ".log",
+  "rescore": ".rescore",
+  "serve": ".serve",
+  "watch": ".watch",
+}
 
 
 def build_argparser() -> argparse.ArgumentParser:
-  ap = argparse.ArgumentParser()
+  ap = argparse.ArgumentParser(
+    epilog="subcommands: " + ", ".join(SUBCOMMANDS) + " (run `tailor_resume <subcommand> --help`)",
+  )
   ap.add_argument("--resume", required=True, help="Path to resume_base.md")
   ap.add_argument("--out-dir", default=None, help="Directory for outputs (jobpost + tailored resume + report)")
   ap.add_argument("--config", default=None, help="Optional TOML config")
@@ -31,6 +48,17 @@ def build_argparser() -> argparse.ArgumentParser:
 
   ap.add_argument("--use-nltk", action="store_true", help="Enable NLTK if installed")
   ap.add_argument("--dry-run", action="store_true")
+  ap.add_argument("--no-cache", action="store_true", help="Re-parse and re-featurize the base resume (skip the on-disk cache)")
+  ap.add_argument("--timings", action="store_true", help="Record wall/CPU time per stage in the report and CSV log")
+  ap.add_argument(
+    "--on-duplicate", choices=("warn", "skip", "ignore"), default="warn",
+    help="When the description nearly matches an archived post: warn and tailor anyway (default), "
+    "skip and point at the existing outputs, or don't check",
+  )
+  ap.add_argument(
+    "--duplicate-threshold", type=float, default=DUPLICATE_THRESHOLD,
+    help=f"Estimated description similarity (0-1) that counts as a duplicate (default: {DUPLICATE_THRESHOLD})",
+  )
 
   # mechanical move of your logging flags (not mandatory for the new flow, but kept)
   ap.add_argument("--log-csv", default=None, help="Append a row to this CSV file each run")
@@ -39,28 +67,26 @@ def build_argparser() -> argparse.ArgumentParser:
 
   return ap
 
-def main() -> int:
-  args = build_argparser().parse_args()
+def main(argv: list[str] | None = None) -> int:
+  argv = sys.argv[1:] if argv is None else argv
+  if argv and argv[0] in SUBCOMMANDS:
+    mod = importlib.import_module(SUBCOMMANDS[argv[0]], __package__)
+    return mod.main(argv[1:])
 
+  args = build_argparser().parse_args(argv)
+
+  with (collect_timings() if args.timings else nullcontext()) as timings:
+    return run(args, timings)
+
+
+def run(args: argparse.Namespace, timings: StageTimings | None) -> int:
   base_resume = Path(args.resume)
   if not base_resume.exists():
     raise FileNotFoundError(f"Resume not found: {base_resume}")
 
   # ---- load config FIRST ----
-  default_cfg = Path(__file__).resolve().parent / "config/tailor_resume.toml"
-  cfg_path = Path(args.config) if args.config else default_cfg
-  cfg = load_config(cfg_path if cfg_path.exists() else None)
-
-  # enforce mandatory contact info
-  if not (cfg.contact_email.strip() and cfg.contact_location.strip() and cfg.contact_phone.strip()):
-    raise RuntimeError("Contact info is mandatory in tailor_resume.toml")
-
-  # stopwords (global list)
-  STOPWORDS_PATH = Path(__file__).resolve().parent / "config" / "stopwords.yaml"
-  cfg.stopwords = load_stopwords(STOPWORDS_PATH)
-
-  if args.use_nltk:
-    cfg.use_nltk = True
+  with stage("config_load"):
+    cfg = load_run_config(args.config, use_nltk=args.use_nltk, out_dir=args.out_dir)
 
   # ---- build job post -----
 
@@ -76,110 +102,58 @@ def main() -> int:
   out_dir = job_result.out_dir
   jobpost_path = job_result.jobpost_path
 
-  # apply stopwords delta HERE in CLI
-  cfg.stopwords = set(cfg.stopwords) | job_result.stopwords_delta
-
-  # ---- tailor resume ----
-  intermediate_md_resume = base_resume.read_text(encoding="utf-8")
-
-  # mandatory contact line injection
-  contact_block = make_contact_table(cfg.contact_email, cfg.contact_location, cfg.contact_phone)
-  if not contact_block:
-    raise RuntimeError("Contact table rendered empty (contact info missing in config).")
-
-  if "{{CONTACT_LINE}}" in intermediate_md_resume:
-    intermediate_md_resume = intermediate_md_resume.replace("{{CONTACT_LINE}}", contact_block.rstrip() + "\n", 1)
-  else:
-    raise RuntimeError("Missing {{CONTACT_LINE}} placeholder in base resume.")
+  dup = job_result.duplicate_of
+  if dup is not None:
+    print(
+      f"Near-duplicate ({dup.similarity:.0%} similar) of {dup.hit.company} / {dup.hit.title} "
+      f"pulled {dup.hit.date_pulled}: {dup.hit.jobpost_path or dup.hit.url}",
+      file=sys.stderr,
+    )
+  if job_result.skipped:
+    resume_out, report_out = resume_output_paths(post, out_dir)
+    print(f"Job post: {jobpost_path} (existing; skipped)")
+    print(f"Resume out: {resume_out}")
+    print(f"Report out: {report_out}")
+    return 0
 
-  # doc is dataclass ResumeDoc
-  # ¿ why can't make "doc:ResumeDoc"
-  doc = parse_professional_experience(intermediate_md_resume)
+  # company stopwords layered on a per-job view (cfg itself is not mutated)
+  job_cfg = job_config(cfg, job_result.stopwords_delta)
 
+  # ---- tailor resume ----
+  # parsed ResumeDoc + static bullet features (cached by content hash)
+  with stage("resume_load"):
+    resume = load_base_resume(base_resume, cfg, cache_dir=resolve_cache_dir(args.no_cache, cfg))
 
-  # doc is dataclass ResumeDoc
   # post: JobPost
-  new_roles, report = tailor(doc, post.description, cfg)
-  out_md = render_resume_with_new_roles(doc, new_roles)
-
-  # Apply CORE_COMPETENCIES reorder
-  reordered_competencies = report.get("core_competencies_reordered") or []
-  if reordered_competencies:
-    out_lines = out_md.splitlines()
-    out_lines = apply_reordered_core_competencies(out_lines, reordered_competencies)
-    out_md = "\n".join(out_lines).rstrip() + "\n"
-
-  out_md = normalize_markdown_spacing(out_md)
-
-  md_errors = validate_markdown(out_md)
-  if md_errors:
-    raise RuntimeError("Markdown validation failed:\n" + "\n".join(f"- {e}" for e in md_errors[:25]))
-
-  out_md = strip_notes_from_markdown(out_md)
-
-  note_errors = validate_notes_placement(out_md)
-  if note_errors:
-    raise RuntimeError("Note validation failed:\n" + "\n".join(f"- {e}" for e in note_errors[:50]))
+  result = tailor_job_post(resume, post, out_dir, job_cfg)
 
-  # ---- output names ----
-  date_prefix = post.date_pulled.strftime("%Y-%m-%d")
-  name_slug = safe_slug(f"{post.company}_{post.title}")
-
-  resume_out = out_dir / f"{date_prefix}_resume_{name_slug}.md"
-  report_out = out_dir / f"{date_prefix}_report_{name_slug}.json"
+  if timings is not None:
+    # everything up to (not including) the output writes
+    result.report["timings"] = timings.as_report()
 
   if not args.dry_run:
-    frontmatter = render_resume_frontmatter(
-      job_title=post.title,           # (and inside render_resume_frontmatter you will rename key to job_title)
-      company=post.company,
-      date_pulled=post.date_pulled,
-      source=post.source,
-      url=post.url,
-      profile=args.profile,
-    )
-    out_md = frontmatter + out_md
-    resume_out.write_text(out_md, encoding="utf-8")
-    report_out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    with stage("write_outputs"):
+      write_tailored_resume(result, post, profile=args.profile, jobpost_path=jobpost_path)
 
   # ---- CSV log (default from config, override by CLI) ----
-  csv_path = None
-  if args.log_csv:
-    csv_path = Path(args.log_csv)
-  elif getattr(cfg, "paths_csv_log", ""):
-    csv_path = Path(cfg.paths_csv_log)
+  csv_path = resolve_csv_log_path(args.log_csv, cfg)
 
   if csv_path:
-    missing = report.get("missing_keywords", [])
-    missing_top = "; ".join([m.get("keyword", "") for m in missing[:10]]) if isinstance(missing, list) else ""
-
-    kept_count = 0
-    dropped_count = 0
-    for r in report.get("roles", []):
-      kept_count += len(r.get("kept", []))
-      dropped_count += len(r.get("dropped", []))
-
-    row = {
-      "timestamp": now_iso_local(),
-      "profile": args.profile,
-      "submission_status": args.status,
-      "job_file": str(jobpost_path),
-      "resume_in": str(base_resume),
-      "resume_out": str(resume_out),
-      "report_out": str(report_out),
-      "use_nltk": str(cfg.use_nltk),
-      "per_role_keep": str(cfg.per_role_keep),
-      "min_per_role_keep": str(cfg.min_per_role_keep),
-      "drop_below_score": str(cfg.drop_below_score),
-      "kept_bullets_total": str(kept_count),
-      "dropped_bullets_total": str(dropped_count),
-      "missing_keywords_top10": missing_top,
-    }
-    header = list(row.keys())
+    row = build_log_row(
+      result=result,
+      jobpost_path=jobpost_path,
+      base_resume=base_resume,
+      cfg=cfg,
+      profile=args.profile,
+      status=args.status,
+    )
+    if timings is not None:
+      row.update(timings.csv_columns())
 
     if not args.dry_run:
-      append_csv_row(csv_path, header, row)
+      record_run(csv_path, row)
 
   print(f"Job post: {jobpost_path}")
-  print(f"Resume out: {resume_out}")
-  print(f"Report out: {report_out}")
-  return 0
\ No newline at end of file
+  print(f"Resume out: {result.resume_out}")
+  print(f"Report out: {result.report_out}")
+  return 0
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from typing import Protocol
+
+from .clipboard_tools import ClipboardBackend, detect_backend, get_clipboard, copy_to_clipboard
+
+
+# ----------------------------
+# Sources (pluggable clipboard backends)
+# ----------------------------
+
+class ClipboardSource(Protocol):
+  name: str
+
+  @property
+  def notifies(self) -> bool:
+    """True while wait() is driven by real change notifications."""
+
+  def read(self) -> str: ...
+
+  def write(self, text: str) -> None: ...
+
+  def token(self) -> object | None:
+    """Cheap change counter (no content read), or None if the source has none."""
+
+  def wait(self, timeout: float | None) -> bool:
+    """Block until the clipboard may have changed; False on timeout."""
+
+  def close(self) -> None: ...
+
+
+class CommandSource:
+  """One paste/copy subprocess per read/write (pbpaste, xclip, xsel, wl-paste); no notifications."""
+  notifies = False
+
+  def __init__(self, backend: ClipboardBackend):
+    self.backend = backend
+    self.name = backend.name
+
+  def read(self) -> str:
+    return get_clipboard(backend=self.backend)
+
+  def write(self, text: str) -> None:
+    copy_to_clipboard(text, backend=self.backend)
+
+  def token(self) -> object | None:
+    return None
+
+  def wait(self, timeout: float | None) -> bool:
+    time.sleep(timeout or 0.0)
+    return True
+
+  def close(self) -> None:
+    pass
+
+
+class WatcherSource(CommandSource):
+  """
+  CommandSource plus one long-lived watcher process that reports changes:
+  either a line on stdout per change (`wl-paste --watch echo`), or, with
+  oneshot=True, a process that exits on the next change (`clipnotify`),
+  respawned after each one. If the watcher dies, notifies turns False and
+  the caller falls back to polling.
+  """
+
+  def __init__(self, backend: ClipboardBackend, watch_cmd: list[str], *, oneshot: bool = False):
+    super().__init__(backend)
+    self.name = f"{backend.name}+{watch_cmd[0]}"
+    self._watch_cmd = watch_cmd
+    self._oneshot = oneshot
+    self._event = threading.Event()
+    self._alive = True
+    self._closed = False
+    self._proc: subprocess.Popen | None = None
+    self._thread = threading.Thread(target=self._run, name="clipboard-watcher", daemon=True)
+    self._thread.start()
+
+  @property
+  def notifies(self) -> bool:
+    return self._alive
+
+  def _run(self) -> None:
+    try:
+      while not self._closed:
+        self._proc = subprocess.Popen(
+          self._watch_cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        )
+        if self._oneshot:
+          if self._proc.wait() != 0 or self._closed:
+            break
+          self._event.set()
+          continue
+        for _ in self._proc.stdout:
+          self._event.set()
+        break
+    except OSError:
+      pass
+    finally:
+      self._alive = False
+      self._event.set()  # wake a waiter so it notices and falls back to polling
+
+  def wait(self, timeout: float | None) -> bool:
+    fired = self._event.wait(timeout)
+    self._event.clear()
+    return fired
+
+  def close(self) -> None:
+    self._closed = True
+    p = self._proc
+    if p is not None and p.poll() is None:
+      p.terminate()
+
+
+class PasteboardSource:
+  """macOS NSPasteboard in-process (optional PyObjC): polls changeCount, no subprocesses."""
+  name = "macos-appkit"
+  notifies = False
+
+  def __init__(self):
+    from AppKit import NSPasteboard, NSPasteboardTypeString
+    self._pb = NSPasteboard.generalPasteboard()
+    self._type = NSPasteboardTypeString
+
+  def read(self) -> str:
+    return str(self._pb.stringForType_(self._type) or "")
+
+  def write(self, text: str) -> None:
+    self._pb.clearContents()
+    self._pb.setString_forType_(text, self._type)
+
+  def token(self) -> object | None:
+    return self._pb.changeCount()
+
+  def wait(self, timeout: float | None) -> bool:
+    time.sleep(timeout or 0.0)
+    return True
+
+  def close(self) -> None:
+    pass
+
+
+class FakeClipboard:
+  """
+  In-memory clipboard for headless tests and benchmarks. set() plays the
+  user copying something; set_later() does it from a timer thread, and
+  queue() deterministically, one text per wait(). With notifies=False it
+  behaves like a polled command backend (count the reads).
+  """
+  name = "fake"
+
+  def __init__(self, text: str = "", *, notifies: bool = True):
+    self.notifies = notifies
+    self.reads = 0
+    self.writes = 0
+    self._text = text
+    self._seq = 0
+    self._seen = 0
+    self._queued: deque[str] = deque()
+    self._cond = threading.Condition()
+
+  def read(self) -> str:
+    with self._cond:
+      self.reads += 1
+      return self._text
+
+  def write(self, text: str) -> None:
+    with self._cond:
+      self._text = text
+      self._seq += 1
+      self.writes += 1
+      self._cond.notify_all()
+
+  set = write
+
+  def set_later(self, delay: float, text: str) -> threading.Timer:
+    t = threading.Timer(delay, self.write, args=(text,))
+    t.daemon = True
+    t.start()
+    return t
+
+  def queue(self, *texts: str) -> None:
+    self._queued.extend(texts)
+
+  def token(self) -> object | None:
+    return None
+
+  def wait(self, timeout: float | None) -> bool:
+    if self._queued:
+      self.write(self._queued.popleft())
+    if not self.notifies:
+      time.sleep(timeout or 0.0)
+      return True
+    with self._cond:
+      fired = self._cond.wait_for(lambda: self._seq != self._seen, timeout)
+      self._seen = self._seq
+      return fired
+
+  def close(self) -> None:
+    pass
+
+
+def detect_source() -> ClipboardSource:
+  """
+  Best clipboard source on this machine:
+  Wayland wl-paste --watch > X11 clipnotify > macOS AppKit changeCount
+  > plain paste command (polled with backoff).
+  """
+  backend = detect_backend()
+
+  if backend.name == "linux-wl-clipboard":
+    return WatcherSource(backend, ["wl-paste", "--watch", "echo"])
+  if backend.name in ("linux-xclip", "linux-xsel") and shutil.which("clipnotify"):
+    return WatcherSource(backend, ["clipnotify"], oneshot=True)
+  if sys.platform == "darwin" and importlib.util.find_spec("AppKit") is not None:
+    try:
+      return PasteboardSource()
+    except Exception:
+      pass
+  return CommandSource(backend)
+
+
+# ----------------------------
+# Change detection
+# ----------------------------
+
+def _digest(text: str) -> bytes:
+  return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+# Poll interval bounds for sources without notifications: start fast right
+# after a prompt or a change, back off while the clipboard sits idle.
+MIN_POLL_SECONDS = 0.1
+MAX_POLL_SECONDS = 1.0
+POLL_BACKOFF = 1.5
+
+
+class ClipboardWatcher:
+  """
+  Waits for the clipboard to change, comparing content digests (not the
+  previous full text). Sources that notify are waited on; the rest are
+  polled, reading content only when their change token moved (if they have
+  one) and backing off from min_interval to max_interval while idle.
+  """
+
+  def __init__(
+    self,
+    source: ClipboardSource,
+    *,
+    min_interval: float = MIN_POLL_SECONDS,
+    max_interval: float = MAX_POLL_SECONDS,
+    backoff: float = POLL_BACKOFF,
+  ):
+    self.source = source
+    self.min_interval = min_interval
+    self.max_interval = max(min_interval, max_interval)
+    self.backoff = backoff
+
+  def wait_for_change(
+    self,
+    *,
+    prompt: str | None = None,
+    clear_first: bool = False,
+    timeout_seconds: float | None = None,
+    require_nonempty: bool = False,
+  ) -> str:
+    src = self.source
+    if clear_first:
+      src.write("")
+    if prompt:
+      print(prompt)
+
+    deadline = None if timeout_seconds is None else time.monotonic() + timeout_seconds
+    last_token = src.token()
+    last = _digest(src.read())
+    interval = self.min_interval
+
+    while True:
+      remaining = None if deadline is None else deadline - time.monotonic()
+      if remaining is not None and remaining <= 0:
+        raise TimeoutError("Timed out waiting for clipboard change.")
+
+      if src.notifies:
+        step = self.max_interval if remaining is None else min(self.max_interval, remaining)
+        if not src.wait(step):
+          continue
+      else:
+        time.sleep(interval if remaining is None else min(interval, remaining))
+        tok = src.token()
+        if tok is not None:
+          # in-process counter: cheap to check, so no backoff needed
+          if tok == last_token:
+            continue
+          last_token = tok
+        else:
+          interval = min(interval * self.backoff, self.max_interval)
+
+      text = src.read()
+      h = _digest(text)
+      if h == last:
+        continue
+      last = h
+      interval = self.min_interval
+      if require_nonempty and not text.strip():
+        continue
+      return text
+
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import date
-from .clipboard_tools import wait_for_clipboard_change
+from .clipboard_capture import ClipboardSource, ClipboardWatcher, detect_source
 
 
 @dataclass(frozen=True)
@@ -9,18 +9,25 @@ class ClipboardCapture:
   description: str
 
 
-def capture_from_clipboard() -> ClipboardCapture:
-  url = wait_for_clipboard_change(
-    prompt="1) Copy the job posting URL to your clipboard now.",
-    clear_first=True,
-    require_nonempty=True,
-  ).strip()
-
-  desc = wait_for_clipboard_change(
-    prompt="2) Copy the FULL job description text to your clipboard now.",
-    clear_first=True,
-    require_nonempty=True,
-  ).strip()
+def capture_from_clipboard(source: ClipboardSource | None = None) -> ClipboardCapture:
+  """Prompt for the URL, then the description; one clipboard source (and watcher) for both."""
+  src = source or detect_source()
+  watcher = ClipboardWatcher(src)
+  try:
+    url = watcher.wait_for_change(
+      prompt="1) Copy the job posting URL to your clipboard now.",
+      clear_first=True,
+      require_nonempty=True,
+    ).strip()
+
+    desc = watcher.wait_for_change(
+      prompt="2) Copy the FULL job description text to your clipboard now.",
+      clear_first=True,
+      require_nonempty=True,
+    ).strip()
+  finally:
+    if source is None:
+      src.close()
 
   return ClipboardCapture(url=url, description=desc)
 
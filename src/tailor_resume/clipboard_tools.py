@@ -1,10 +1,10 @@
 # clipboard_tools.py
 from __future__ import annotations
 
+import os
 import shutil
 import subprocess
 import sys
-import time
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Callable, Iterable
@@ -21,11 +21,11 @@ class ClipboardBackend:
   copy_cmd: list[str]
 
 
-def _detect_backend() -> ClipboardBackend:
+def detect_backend() -> ClipboardBackend:
   """
   Detect a working clipboard backend.
   macOS: pbpaste/pbcopy
-  Linux: xclip or xsel
+  Linux: wl-paste/wl-copy (Wayland session), xclip or xsel
   """
   if shutil.which("pbpaste") and shutil.which("pbcopy"):
     return ClipboardBackend(
@@ -34,6 +34,13 @@ def _detect_backend() -> ClipboardBackend:
       copy_cmd=["pbcopy"],
     )
 
+  if os.environ.get("WAYLAND_DISPLAY") and shutil.which("wl-paste") and shutil.which("wl-copy"):
+    return ClipboardBackend(
+      name="linux-wl-clipboard",
+      paste_cmd=["wl-paste", "--no-newline"],
+      copy_cmd=["wl-copy"],
+    )
+
   if shutil.which("xclip"):
     return ClipboardBackend(
       name="linux-xclip",
@@ -53,7 +60,7 @@ def _detect_backend() -> ClipboardBackend:
 
 def get_clipboard(*, backend: ClipboardBackend | None = None) -> str:
   """Return current clipboard contents as text (UTF-8)."""
-  b = backend or _detect_backend()
+  b = backend or detect_backend()
   result = subprocess.run(b.paste_cmd, capture_output=True, text=True)
   if result.returncode != 0:
     raise ClipboardError(
@@ -64,7 +71,7 @@ def get_clipboard(*, backend: ClipboardBackend | None = None) -> str:
 
 def copy_to_clipboard(text: str, *, backend: ClipboardBackend | None = None) -> None:
   """Copy text to system clipboard (UTF-8)."""
-  b = backend or _detect_backend()
+  b = backend or detect_backend()
   # Use text=True so we can pass a str directly (avoid manual encoding mistakes).
   result = subprocess.run(b.copy_cmd, input=text, text=True, capture_output=True)
   if result.returncode != 0:
@@ -93,32 +100,18 @@ def wait_for_clipboard_change(
   - clear_first=True implements your "capture next item to clipboard" behavior.
   - timeout_seconds prevents hanging forever (None = wait forever).
   - require_nonempty=True ignores changes that are empty/whitespace.
+  - poll_seconds is the fastest poll interval; it backs off while idle
+    (see clipboard_capture.ClipboardWatcher for event-driven sources).
   """
-  b = backend or _detect_backend()
-
-  if clear_first:
-    clear_clipboard(backend=b)
-
-  if prompt:
-    print(prompt)
-
-  start = time.monotonic()
-  last = get_clipboard(backend=b)
-
-  while True:
-    if timeout_seconds is not None:
-      elapsed = time.monotonic() - start
-      if elapsed >= timeout_seconds:
-        raise TimeoutError("Timed out waiting for clipboard change.")
-
-    current = get_clipboard(backend=b)
-    if current != last:
-      if require_nonempty and not current.strip():
-        last = current
-      else:
-        return current
-
-    time.sleep(poll_seconds)
+  from .clipboard_capture import ClipboardWatcher, CommandSource
+
+  watcher = ClipboardWatcher(CommandSource(backend or detect_backend()), min_interval=poll_seconds)
+  return watcher.wait_for_change(
+    prompt=prompt,
+    clear_first=clear_first,
+    timeout_seconds=timeout_seconds,
+    require_nonempty=require_nonempty,
+  )
 
 
 def log_transform(
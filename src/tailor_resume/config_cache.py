@@ -0,0 +1,190 @@
+# Compiled config: the TOML config + stopwords.yaml loaded, validated and
+# compiled (frozen stopwords, normalized term tuples, phrase matchers) once,
+# pickled next to the config and reused while none of its sources changed.
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import pickle
+from dataclasses import dataclass, fields
+from pathlib import Path
+
+from .tailor_config import TailorConfig, load_config
+
+
+# Bump whenever compile_config changes what it produces.
+CACHE_VERSION = 1
+
+_PKG = Path(__file__).resolve().parent
+
+# code whose edits change the compiled result: defaults, loaders, matcher
+# layout, the normalization baked into the term tuples, and the pickled
+# CorpusIDF class
+_CODE_SOURCES = (
+  _PKG / "config_cache.py",
+  _PKG / "tailor_config.py",
+  _PKG / "phrase_matcher.py",
+  _PKG / "text_utils.py",
+  _PKG / "config" / "stopwords.py",
+  _PKG / "jobpost" / "store.py",
+)
+
+
+@dataclass(frozen=True)
+class SourceStamp:
+  path: str
+  mtime_ns: int
+  size: int
+  sha256: str
+
+
+@dataclass
+class CompiledConfig:
+  version: tuple
+  sources: tuple[SourceStamp, ...]
+  cfg: TailorConfig
+
+
+def _version() -> tuple:
+  return (CACHE_VERSION, tuple(f.name for f in fields(TailorConfig)))
+
+
+def _stamp(path: Path) -> SourceStamp:
+  st = path.stat()
+  return SourceStamp(str(path), st.st_mtime_ns, st.st_size, hashlib.sha256(path.read_bytes()).hexdigest())
+
+
+def _sources(config_path: Path | None, stopwords_path: Path) -> list[Path]:
+  paths = [stopwords_path, *_CODE_SOURCES]
+  if config_path is not None:
+    paths.insert(0, config_path)
+  return [p.resolve() for p in paths]
+
+
+# ----------------------------
+# Compile
+# ----------------------------
+
+def validate_config(cfg: TailorConfig) -> None:
+  """
+  Reject values that would silently produce garbage scores. per_role_keep
+  below min_per_role_keep is fine: the floor is applied, then truncated.
+  """
+  for f in fields(TailorConfig):
+    if f.name.startswith("w_"):
+      v = getattr(cfg, f.name)
+      if not isinstance(v, (int, float)) or not math.isfinite(v):
+        raise ValueError(f"config: scoring.{f.name} must be a finite number, not {v!r}")
+  if not math.isfinite(cfg.drop_below_score):
+    raise ValueError(f"config: tailor.drop_below_score must be a finite number, not {cfg.drop_below_score!r}")
+  if cfg.max_auto_terms < 0:
+    raise ValueError(f"config: terms.max_auto_terms must be >= 0, not {cfg.max_auto_terms}")
+  for g in cfg.guardrails:
+    if g["min_keep"] < 0:
+      raise ValueError(f"config: guardrail {g['name']!r} min_keep must be >= 0")
+
+
+def compile_config(config_path: Path | None, stopwords_path: Path) -> TailorConfig:
+  """Parse TOML + YAML, freeze the stopwords and validate (load_config compiles the matcher)."""
+  from .config.stopwords import load_stopwords  # PyYAML: only imported when (re)compiling
+
+  cfg = load_config(config_path)
+  cfg.stopwords = frozenset(load_stopwords(stopwords_path))
+  validate_config(cfg)
+  return cfg
+
+
+# ----------------------------
+# Artifact cache
+# ----------------------------
+
+def artifact_path(config_path: Path | None, stopwords_path: Path) -> Path:
+  """.<config name>.compiled.pkl next to the config (or next to stopwords.yaml without one)."""
+  src = config_path if config_path is not None else stopwords_path
+  return src.with_name(f".{src.name}.compiled.pkl")
+
+
+def _fallback_path(artifact: Path) -> Path:
+  # read-only install: keep the artifact in the user cache dir instead
+  from .resume_cache import default_cache_dir
+  h = hashlib.sha256(str(artifact.resolve()).encode("utf-8")).hexdigest()[:16]
+  return default_cache_dir(TailorConfig()) / f"config_{h}.pkl"
+
+
+def _artifact_candidates(primary: Path):
+  yield primary
+  yield _fallback_path(primary)
+
+
+def _read(path: Path) -> CompiledConfig | None:
+  try:
+    with path.open("rb") as f:
+      obj = pickle.load(f)
+  except Exception:
+    # missing, truncated or from an incompatible version: recompile
+    return None
+  return obj if isinstance(obj, CompiledConfig) else None
+
+
+def _write(path: Path, compiled: CompiledConfig) -> bool:
+  try:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as f:
+      pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    return True
+  except OSError:
+    return False
+
+
+def _check(compiled: CompiledConfig, sources: list[Path]) -> str:
+  """
+  "fresh" (every source has its recorded mtime + size: nothing is read),
+  "touched" (mtimes moved, contents hash the same) or "stale".
+  """
+  if compiled.version != _version() or [s.path for s in compiled.sources] != [str(p) for p in sources]:
+    return "stale"
+  try:
+    if all((st := os.stat(s.path)).st_mtime_ns == s.mtime_ns and st.st_size == s.size for s in compiled.sources):
+      return "fresh"
+    same = all(hashlib.sha256(Path(s.path).read_bytes()).hexdigest() == s.sha256 for s in compiled.sources)
+  except OSError:
+    return "stale"
+  return "touched" if same else "stale"
+
+
+def load_compiled_config(config_path: Path | None, stopwords_path: Path, *, use_cache: bool = True) -> TailorConfig:
+  """
+  The compiled config for these sources. Warm path: stat the sources and
+  unpickle the artifact (no TOML/YAML parsing, PyYAML is not imported).
+  Each call returns a fresh object, so callers may adjust it.
+  """
+  if not stopwords_path.exists():
+    raise FileNotFoundError(f"Stopwords file not found: {stopwords_path}")
+  if config_path is not None and not config_path.exists():
+    raise FileNotFoundError(f"Config not found: {config_path}")
+  if not use_cache:
+    return compile_config(config_path, stopwords_path)
+
+  sources = _sources(config_path, stopwords_path)
+  primary = artifact_path(config_path, stopwords_path)
+  for path in _artifact_candidates(primary):
+    compiled = _read(path)
+    if compiled is None:
+      continue
+    state = _check(compiled, sources)
+    if state == "fresh":
+      return compiled.cfg
+    if state == "touched":
+      compiled.sources = tuple(_stamp(p) for p in sources)
+      _write(path, compiled)
+      return compiled.cfg
+
+  stamps = tuple(_stamp(p) for p in sources)
+  cfg = compile_config(config_path, stopwords_path)
+  compiled = CompiledConfig(version=_version(), sources=stamps, cfg=cfg)
+  if not _write(primary, compiled):
+    _write(_fallback_path(primary), compiled)
+  return cfg
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+from .tailor_config import TailorConfig
+from .phrase_matcher import normalized_phrases
+from .text_utils import normalize_text
+
+
+@dataclass(frozen=True)
+class Guardrail:
+  """One guardrail whose triggers the job mentions, ready to apply per role."""
+  idx: int
+  name: str
+  min_keep: int
+  # matched against bullet.lower() (counting kept bullets, fallback promotion)
+  must_phrases: tuple[str, ...]
+  # normalized, matched against normalize_text(bullet) (best dropped bullet, as phrase_hits)
+  must_norm: tuple[str, ...]
+
+
+def compile_guardrails(cfg: TailorConfig, triggered: Callable[[int], bool]) -> tuple[Guardrail, ...]:
+  """The config's guardrails that apply to this job, in config order (compiled once per job)."""
+  out: list[Guardrail] = []
+  for i, gr in enumerate(cfg.guardrails):
+    triggers = gr.get("triggers", [])
+    must_phrases = gr.get("must_keep_phrases", [])
+    min_keep = int(gr.get("min_keep", 1))
+
+    if not triggers or not must_phrases or min_keep <= 0:
+      continue
+    if not triggered(i):
+      continue
+
+    out.append(Guardrail(
+      idx=i,
+      name=gr.get("name", "unnamed"),
+      min_keep=min_keep,
+      must_phrases=tuple(must_phrases),
+      must_norm=tuple(normalized_phrases(must_phrases)),
+    ))
+  return tuple(out)
+
+
+_SEP = "\x00"
+
+
+class _PhraseIndex:
+  """
+  Which of a list of texts contain a phrase, via str.find over one
+  NUL-joined copy (one C-level scan per phrase instead of a Python loop
+  over the texts). Per-phrase results are memoized.
+  """
+
+  def __init__(self, texts: list[str]):
+    self.texts = texts
+    self.joined = _SEP.join(texts)
+    self.starts: list[int] = []
+    pos = 0
+    for t in texts:
+      self.starts.append(pos)
+      pos += len(t) + 1
+    self._hits: dict[str, list[int]] = {}
+
+  def containing(self, phrase: str) -> list[int]:
+    hits = self._hits.get(phrase)
+    if hits is not None:
+      return hits
+    if not phrase:
+      hits = list(range(len(self.texts)))
+    elif _SEP in phrase:
+      hits = [i for i, t in enumerate(self.texts) if phrase in t]
+    else:
+      hits = []
+      joined = self.joined
+      starts = self.starts
+      find = joined.find
+      j = find(phrase)
+      while j != -1:
+        i = bisect_right(starts, j) - 1
+        hits.append(i)
+        nxt = i + 1
+        if nxt >= len(starts):
+          break
+        j = find(phrase, starts[nxt])
+    self._hits[phrase] = hits
+    return hits
+
+
+class RoleIndex:
+  """
+  must-phrase -> positions of the role's bullets that contain it.
+
+  Built lazily per phrase and shared across guardrails, so each phrase is
+  searched once per role however many guardrails list it.
+  """
+
+  def __init__(self, bullets: Sequence[str]):
+    self.bullets = bullets
+    self._lower: _PhraseIndex | None = None
+    self._norm: _PhraseIndex | None = None
+
+  @staticmethod
+  def _union(lists: list[list[int]]) -> list[int]:
+    if len(lists) == 1:
+      return lists[0]
+    return sorted(set().union(*lists))
+
+  def keep_matches(self, gr: Guardrail) -> list[int]:
+    """Positions whose bullet.lower() contains any must phrase (ascending)."""
+    if self._lower is None:
+      self._lower = _PhraseIndex([b.lower() for b in self.bullets])
+    return self._union([self._lower.containing(p) for p in gr.must_phrases])
+
+  def pick_matches(self, gr: Guardrail) -> list[int]:
+    """Positions with phrase_hits(bullet, must_phrases) > 0 (ascending)."""
+    if not gr.must_norm:
+      return []
+    if self._norm is None:
+      self._norm = _PhraseIndex([normalize_text(b) for b in self.bullets])
+    return self._union([self._norm.containing(p) for p in gr.must_norm])
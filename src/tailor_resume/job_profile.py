@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .tailor_config import TailorConfig
+from .job_terms import TaggedJob, top_terms_from_job, tag_job
+from .phrase_matcher import PhraseMatcher, config_matcher, guardrail_class
+from .guardrails import Guardrail, compile_guardrails
+
+
+@dataclass(frozen=True)
+class JobProfile:
+  """
+  Everything the scorers need to know about one job post, computed once per run.
+
+  The job text is normalized and tokenized here, so scoring N bullets no
+  longer re-tokenizes (and, with NLTK, re-tags) the whole posting N times.
+  """
+  text: str
+  norm: str
+  tagged: TaggedJob
+  tokens: frozenset[str]
+  terms_auto: tuple[str, ...]
+
+  # config term lists (compiled at config load) + this job's auto terms
+  matcher: PhraseMatcher
+  auto_matcher: PhraseMatcher
+
+  # indexes into cfg.guardrails whose triggers the job mentions
+  guardrails_triggered: frozenset[int]
+  # ...and those of them that can promote bullets, compiled once for all roles
+  guardrails: tuple[Guardrail, ...]
+
+  def term_hits(self, text_norm: str) -> tuple[int, int, int]:
+    """(required, nice_to_have, domain) phrase hits for already-normalized text."""
+    c = self.matcher.counts(text_norm)
+    return c["required"], c["nice_to_have"], c["domain"]
+
+  def auto_hits(self, text_norm: str) -> int:
+    return self.auto_matcher.counts(text_norm)["auto"]
+
+  def guardrail_triggered(self, idx: int) -> bool:
+    return idx in self.guardrails_triggered
+
+
+def build_job_profile(job_text: str, cfg: TailorConfig) -> JobProfile:
+  # the posting is tokenized/tagged exactly once; chunker, ranker and scorer share it
+  tagged = tag_job(job_text, cfg)
+  norm = tagged.norm
+  terms_auto = tuple(top_terms_from_job(job_text, cfg, tagged))
+
+  matcher = config_matcher(cfg)
+  job_counts = matcher.counts(norm)
+  triggered = frozenset(i for i in range(len(cfg.guardrails)) if job_counts[guardrail_class(i)] > 0)
+
+  return JobProfile(
+    text=job_text,
+    norm=norm,
+    tagged=tagged,
+    tokens=frozenset(tagged.tokens(cfg.stopwords)),
+    terms_auto=terms_auto,
+    matcher=matcher,
+    auto_matcher=PhraseMatcher({"auto": terms_auto}),
+    guardrails_triggered=triggered,
+    guardrails=compile_guardrails(cfg, triggered.__contains__),
+  )
@@ -1,25 +1,69 @@
 from __future__ import annotations
 
-from typing import Iterable
+import heapq
+from dataclasses import dataclass
+from typing import Any, Iterable
 
 from .tailor_config import TailorConfig
-from .text_utils import NLTK_AVAILABLE, normalize_text, tokens_simple, tokens_nltk, _WORD_RE
+from .text_utils import (
+  load_nltk,
+  normalize_text,
+  tokens_simple,
+  tokens_nltk,
+  token_candidates_simple,
+  filter_token_candidates,
+  NLTK_MIN_TOKEN_LEN,
+  _lemma_candidates,
+  _WORD_RE,
+)
+
+
+@dataclass(frozen=True)
+class TaggedJob:
+  """
+  The job posting tokenized (and, in NLTK mode, POS-tagged) exactly once.
+
+  The NP chunker reads `tagged`; the frequency ranker and the bullet
+  scorer's job token set both come from `candidates` via tokens().
+  """
+  mode: str  # "nltk" or "simple" (NLTK requested but missing -> "simple")
+  norm: str
+  tagged: tuple[tuple[str, str], ...]
+  candidates: tuple[tuple[str, str], ...]
+
+  def tokens(self, stopwords: set[str]) -> list[str]:
+    min_len = NLTK_MIN_TOKEN_LEN if self.mode == "nltk" else 1
+    return filter_token_candidates(self.candidates, stopwords, min_len=min_len)
+
+
+def tag_job(job_text: str, cfg: TailorConfig) -> TaggedJob:
+  norm = normalize_text(job_text)
+  nl = load_nltk() if cfg.use_nltk else None
+  if nl is None:
+    return TaggedJob(mode="simple", norm=norm, tagged=(), candidates=tuple(token_candidates_simple(job_text)))
+
+  tagged = tuple(nl.pos_tag(nl.word_tokenize(norm)))
+  return TaggedJob(mode="nltk", norm=norm, tagged=tagged, candidates=tuple(_lemma_candidates(nl, tagged)))
 
 
 def extract_job_noun_phrases(job_text: str, stopwords: set[str]) -> list[str]:
-  if not NLTK_AVAILABLE:
+  nl = load_nltk()
+  if nl is None:
     return []
 
-  import nltk
-  from nltk import pos_tag, word_tokenize
-
   t = normalize_text(job_text)
-  raw = word_tokenize(t)
-  tagged = pos_tag(raw)
+  raw = nl.word_tokenize(t)
+  return noun_phrases_from_tagged(nl.pos_tag(raw), stopwords)
+
+
+def noun_phrases_from_tagged(tagged: Iterable[tuple[str, str]], stopwords: set[str]) -> list[str]:
+  nl = load_nltk()
+  if nl is None:
+    return []
 
   grammar = r"NP: {<JJ.*>*<NN.*>+}"
-  chunker = nltk.RegexpParser(grammar)
-  tree = chunker.parse(tagged)
+  chunker = nl.nltk.RegexpParser(grammar)
+  tree = chunker.parse(list(tagged))
 
   phrases: set[str] = set()
   for subtree in tree.subtrees(filter=lambda st: st.label() == "NP"):
@@ -42,27 +86,55 @@ def extract_job_noun_phrases(job_text: str, stopwords: set[str]) -> list[str]:
   return sorted(phrases)
 
 
-def top_terms_from_job_simple(job_text: str, stopwords: set[str], max_terms: int) -> list[str]:
-  toks = tokens_simple(job_text, stopwords)
+def _rank_terms(toks: Iterable[str], limit: int | None = None, idf: Any = None) -> list[str]:
+  """
+  Terms by count in the posting (x corpus IDF when `idf` has weights),
+  longer terms first on ties. With a limit only the top `limit` are kept
+  (heap selection, same order as the full sort).
+  """
   freq: dict[str, int] = {}
   for t in toks:
     if len(t) <= 2:
       continue
     freq[t] = freq.get(t, 0) + 1
-  ranked = sorted(freq.items(), key=lambda kv: (kv[1], len(kv[0])), reverse=True)
-  return [k for k, _ in ranked[:max_terms]]
-
 
-def top_terms_from_job_nltk(job_text: str, stopwords: set[str], max_terms: int) -> list[str]:
-  nps = extract_job_noun_phrases(job_text, stopwords)
-  toks = tokens_nltk(job_text, stopwords)
-  freq: dict[str, int] = {}
-  for t in toks:
-    if len(t) <= 2:
-      continue
-    freq[t] = freq.get(t, 0) + 1
-  ranked = sorted(freq.items(), key=lambda kv: (kv[1], len(kv[0])), reverse=True)
-  single_terms = [k for k, _ in ranked]
+  w = idf.weights(freq) if idf is not None else None
+  if w is None:
+    key = lambda kv: (kv[1], len(kv[0]))
+  else:
+    key = lambda kv: (kv[1] * w[kv[0]], len(kv[0]))
+  if limit is None:
+    ranked = sorted(freq.items(), key=key, reverse=True)
+  else:
+    ranked = heapq.nlargest(limit, freq.items(), key=key)
+  return [k for k, _ in ranked]
+
+
+def top_terms_from_job_simple(
+  job_text: str,
+  stopwords: set[str],
+  max_terms: int,
+  tagged: TaggedJob | None = None,
+  idf: Any = None,
+) -> list[str]:
+  toks = tagged.tokens(stopwords) if tagged is not None else tokens_simple(job_text, stopwords)
+  return _rank_terms(toks, max_terms, idf)
+
+
+def top_terms_from_job_nltk(
+  job_text: str,
+  stopwords: set[str],
+  max_terms: int,
+  tagged: TaggedJob | None = None,
+  idf: Any = None,
+) -> list[str]:
+  if tagged is not None:
+    nps = noun_phrases_from_tagged(tagged.tagged, stopwords) if tagged.mode == "nltk" else []
+    toks = tagged.tokens(stopwords)
+  else:
+    nps = extract_job_noun_phrases(job_text, stopwords)
+    toks = tokens_nltk(job_text, stopwords)
+  single_terms = _rank_terms(toks, idf=idf)
 
   out: list[str] = []
   seen: set[str] = set()
@@ -77,7 +149,7 @@ def top_terms_from_job_nltk(job_text: str, stopwords: set[str], max_terms: int)
   return out
 
 
-def top_terms_from_job(job_text: str, cfg: TailorConfig) -> list[str]:
+def top_terms_from_job(job_text: str, cfg: TailorConfig, tagged: TaggedJob | None = None) -> list[str]:
   if cfg.use_nltk:
-    return top_terms_from_job_nltk(job_text, cfg.stopwords, cfg.max_auto_terms)
-  return top_terms_from_job_simple(job_text, cfg.stopwords, cfg.max_auto_terms)
+    return top_terms_from_job_nltk(job_text, cfg.stopwords, cfg.max_auto_terms, tagged, cfg.term_idf)
+  return top_terms_from_job_simple(job_text, cfg.stopwords, cfg.max_auto_terms, tagged, cfg.term_idf)
@@ -8,10 +8,13 @@ from pathlib import Path
 import re
 
 from ..clipboard_flow import capture_from_clipboard
+from . import minhash
 from .io import write_jobpost
+from .store import NearDuplicate, find_near_duplicate, job_key, open_job_store, job_store_path, record_job_post
 from .types import JobPost
 
 from ..text_utils import safe_slug
+from ..timings import stage
 from .linkedin import parse_linkedin_job_post
 
 
@@ -24,6 +27,10 @@ class JobPostBuildResult:
   out_dir: Path
   jobpost_path: Path
   stopwords_delta: set[str]
+  # archived post this one nearly duplicates; skipped=True means nothing was
+  # written and post/out_dir/jobpost_path are the archived post's
+  duplicate_of: NearDuplicate | None = None
+  skipped: bool = False
 
 
 class MissingRequiredFieldsError(ValueError):
@@ -61,19 +68,8 @@ def _enforce_required_no_prompt(post: JobPost) -> None:
     raise MissingRequiredFieldsError(missing, source=post.source, url=post.url)
 
 
-def build_job_post_from_cli(args, cfg) -> JobPostBuildResult:
-  # 1) capture
-  if args.job_url and args.job_text:
-    url = args.job_url.strip()
-    job_text = Path(args.job_text).read_text(encoding="utf-8")
-    capture_method = "args"
-  else:
-    cap = capture_from_clipboard()
-    url = (cap.url or "").strip()
-    job_text = (cap.description or "")
-    capture_method = "clipboard"
-
-  # 2) parse
+def build_job_post(*, url: str, job_text: str, capture_method: str) -> JobPost:
+  """Parse captured url + text into a JobPost and enforce required fields."""
   if is_linkedin_url(url):
     post = parse_linkedin_job_post(url=url, full_text=job_text)
   else:
@@ -89,19 +85,27 @@ def build_job_post_from_cli(args, cfg) -> JobPostBuildResult:
 
   post.attributes.setdefault("capture_method", capture_method)
 
-  # 3) enforce required (no prompting in core flow)
+  # enforce required (no prompting in core flow)
   _enforce_required_no_prompt(post)
-
-  # 4) compute stopwords delta (do NOT mutate cfg here)
+  return post
+
+
+def finalize_job_post(
+  post: JobPost,
+  *,
+  base_out_root: Path,
+  dry_run: bool,
+  signature: tuple[int, ...] | None = None,
+) -> JobPostBuildResult:
+  """Compute stopwords delta + output dir and archive the job post."""
+  # compute stopwords delta (do NOT mutate cfg here)
   stopwords_delta = company_stopwords(post.company)
 
-  # 5) output dir
-  base_out_root = Path(args.out_dir) if args.out_dir else Path(cfg.paths_out_root)
   out_dir = _compute_out_dir(base_out_root=base_out_root, post=post)
 
-  # 6) write jobpost
-  if not args.dry_run:
+  if not dry_run:
     jobpost_path = write_jobpost(out_dir, post)
+    record_job_post(post, base_out_root=base_out_root, jobpost_path=jobpost_path, signature=signature)
   else:
     jobpost_path = out_dir / "DRY_RUN_jobpost.md"
 
@@ -112,6 +116,56 @@ def build_job_post_from_cli(args, cfg) -> JobPostBuildResult:
     stopwords_delta=stopwords_delta,
   )
 
+
+def build_job_post_from_cli(args, cfg) -> JobPostBuildResult:
+  # 1) capture
+  with stage("capture"):
+    if args.job_url and args.job_text:
+      url = args.job_url.strip()
+      job_text = Path(args.job_text).read_text(encoding="utf-8")
+      capture_method = "args"
+    else:
+      cap = capture_from_clipboard()
+      url = (cap.url or "").strip()
+      job_text = (cap.description or "")
+      capture_method = "clipboard"
+
+  # 2) parse + enforce required
+  with stage("jobpost_parse"):
+    post = build_job_post(url=url, job_text=job_text, capture_method=capture_method)
+
+  base_out_root = Path(args.out_dir) if args.out_dir else Path(cfg.paths_out_root)
+
+  # 3) near-duplicate check against the archived posts (MinHash/LSH)
+  sig = None
+  dup = None
+  if args.on_duplicate != "ignore":
+    with stage("jobpost_dedupe"):
+      sig = minhash.signature(post.description)
+      # re-running the same posting updates its own row: not a duplicate
+      dup = find_near_duplicate(
+        sig, base_out_root=base_out_root, threshold=args.duplicate_threshold, exclude_key=job_key(post)
+      )
+    if dup is not None and args.on_duplicate == "skip" and dup.hit.jobpost_path:
+      prev = open_job_store(job_store_path(base_out_root)).get(dup.hit.job_key)
+      if prev is not None:
+        jobpost_path = Path(dup.hit.jobpost_path)
+        return JobPostBuildResult(
+          post=prev,
+          out_dir=jobpost_path.parent,
+          jobpost_path=jobpost_path,
+          stopwords_delta=company_stopwords(prev.company),
+          duplicate_of=dup,
+          skipped=True,
+        )
+
+  # 4) stopwords delta, output dir, jobpost
+  with stage("jobpost_write"):
+    res = finalize_job_post(post, base_out_root=base_out_root, dry_run=args.dry_run, signature=sig)
+  res.duplicate_of = dup
+  return res
+
+
 def company_stopwords(company: str) -> set[str]:
   """
   Turn a company name into stopwords:
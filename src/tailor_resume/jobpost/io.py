@@ -50,3 +50,47 @@ def write_jobpost(out_dir: Path, post: JobPost) -> Path:
   path = out_dir / jobpost_filename(post)
   path.write_text(render_jobpost_markdown(post), encoding="utf-8")
   return path
+
+
+def _yaml_unescape(s: str) -> str:
+  s = s.strip()
+  if len(s) >= 2 and s[0] == '"' and s[-1] == '"':
+    s = s[1:-1]
+  return s.replace('\\"', '"')
+
+
+def read_jobpost_markdown(path: Path) -> JobPost | None:
+  """Inverse of render_jobpost_markdown; None if the file is not an archived job post."""
+  text = path.read_text(encoding="utf-8")
+  if not text.startswith("---\n"):
+    return None
+  head, sep, body = text[4:].partition("\n---\n")
+  if not sep or not body.startswith("\n# Job Post\n"):
+    return None
+
+  fields: dict[str, str] = {}
+  attributes: dict[str, str] = {}
+  for line in head.splitlines():
+    key, _, value = line.strip().partition(":")
+    if line.startswith("  "):
+      attributes[key] = _yaml_unescape(value)
+    elif key != "attributes":
+      fields[key] = _yaml_unescape(value)
+
+  if not fields.get("title") or not fields.get("company"):
+    return None
+  try:
+    date_pulled = date.fromisoformat(fields.get("date_pulled", ""))
+  except ValueError:
+    return None
+
+  description = body[len("\n# Job Post\n"):]
+  return JobPost(
+    url=fields.get("url", ""),
+    source=fields.get("source", ""),
+    date_pulled=date_pulled,
+    title=fields["title"],
+    company=fields["company"],
+    description=description.removeprefix("\n").removesuffix("\n"),
+    attributes=attributes,
+  )
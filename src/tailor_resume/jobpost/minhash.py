@@ -0,0 +1,96 @@
+# MinHash signatures of job descriptions, banded for LSH lookups.
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import random
+import struct
+import zlib
+
+from ..text_utils import normalize_text
+
+
+SHINGLE_WORDS = 3
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS  # 4 rows/band: candidate probability ~0.9998 at Jaccard 0.8, ~0.64 at 0.5
+
+# h_i(x) = (a_i * x + b_i) mod P over 32-bit shingle hashes; every product
+# fits in 64 bits, so the NumPy and pure-Python paths give identical signatures
+_P = (1 << 31) - 1
+_rng = random.Random(0x5EED)
+_A = tuple(_rng.randrange(1, _P) for _ in range(NUM_PERM))
+_B = tuple(_rng.randrange(0, _P) for _ in range(NUM_PERM))
+
+_SIG_FORMAT = f"<{NUM_PERM}I"
+
+# ----------------------------
+# Optional NumPy (imported lazily, like score_matrix)
+# ----------------------------
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+# Below this many shingles the pure-Python loop beats NumPy's call overhead.
+NUMPY_MIN_SHINGLES = 48
+
+_NP = None
+
+
+def _numpy():
+  global _NP
+  if _NP is None:
+    try:
+      import numpy
+      _NP = numpy
+    except Exception:
+      _NP = False
+  return _NP or None
+
+
+def shingle_hashes(text: str) -> set[int]:
+  """crc32 of every run of SHINGLE_WORDS normalized words (the whole text if shorter)."""
+  words = normalize_text(text).split()
+  if len(words) < SHINGLE_WORDS:
+    return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+  return {
+    zlib.crc32(" ".join(words[i:i + SHINGLE_WORDS]).encode("utf-8"))
+    for i in range(len(words) - SHINGLE_WORDS + 1)
+  }
+
+
+def signature(text: str) -> tuple[int, ...]:
+  """NUM_PERM minimum hash values (all _P for empty text)."""
+  hs = shingle_hashes(text)
+  if not hs:
+    return (_P,) * NUM_PERM
+
+  np = _numpy() if (NUMPY_AVAILABLE and len(hs) >= NUMPY_MIN_SHINGLES) else None
+  if np is not None:
+    x = np.fromiter(hs, dtype=np.uint64, count=len(hs)) % _P
+    a = np.array(_A, dtype=np.uint64)[:, None]
+    b = np.array(_B, dtype=np.uint64)[:, None]
+    return tuple(int(v) for v in ((a * x + b) % _P).min(axis=1))
+
+  xs = [h % _P for h in hs]
+  return tuple(min([(a * x + b) % _P for x in xs]) for a, b in zip(_A, _B))
+
+
+def similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+  """Estimated Jaccard similarity of the shingle sets."""
+  return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def band_buckets(sig: tuple[int, ...]) -> list[int]:
+  """One signed 64-bit bucket id per band (SQLite INTEGER)."""
+  out: list[int] = []
+  for band in range(BANDS):
+    rows = struct.pack(f"<B{ROWS}I", band, *sig[band * ROWS:(band + 1) * ROWS])
+    out.append(int.from_bytes(hashlib.blake2b(rows, digest_size=8).digest(), "little", signed=True))
+  return out
+
+
+def pack_signature(sig: tuple[int, ...]) -> bytes:
+  return struct.pack(_SIG_FORMAT, *sig)
+
+
+def unpack_signature(blob: bytes) -> tuple[int, ...]:
+  return struct.unpack(_SIG_FORMAT, blob)
@@ -0,0 +1,494 @@
+# SQLite store of every archived JobPost: upsert by canonical URL / LinkedIn
+# job ID, FTS5 full-text search over title, company and description, a
+# MinHash/LSH index of descriptions for near-duplicate lookups, and the
+# document frequency of every description term (corpus IDF for auto terms).
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import re
+import sqlite3
+import sys
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from . import minhash
+from .types import JobPost
+from ..text_utils import corpus_terms
+
+
+JOB_STORE_FILENAME = "jobs.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+  id INTEGER PRIMARY KEY,
+  job_key TEXT NOT NULL,
+  url TEXT NOT NULL,
+  source TEXT NOT NULL,
+  date_pulled TEXT NOT NULL,
+  title TEXT NOT NULL,
+  company TEXT NOT NULL,
+  attributes TEXT NOT NULL,
+  description TEXT NOT NULL,
+  jobpost_path TEXT NOT NULL DEFAULT '',
+  first_seen TEXT NOT NULL,
+  updated TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS jobs_job_key ON jobs(job_key);
+CREATE INDEX IF NOT EXISTS jobs_date_pulled ON jobs(date_pulled);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+  title, company, description,
+  content='jobs', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+  INSERT INTO jobs_fts(rowid, title, company, description) VALUES (new.id, new.title, new.company, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+  INSERT INTO jobs_fts(jobs_fts, rowid, title, company, description) VALUES ('delete', old.id, old.title, old.company, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_au AFTER UPDATE ON jobs BEGIN
+  INSERT INTO jobs_fts(jobs_fts, rowid, title, company, description) VALUES ('delete', old.id, old.title, old.company, old.description);
+  INSERT INTO jobs_fts(rowid, title, company, description) VALUES (new.id, new.title, new.company, new.description);
+END;
+
+CREATE TABLE IF NOT EXISTS job_minhash (
+  job_key TEXT PRIMARY KEY,
+  sig BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS job_lsh (
+  band INTEGER NOT NULL,
+  bucket INTEGER NOT NULL,
+  job_key TEXT NOT NULL,
+  PRIMARY KEY (band, bucket, job_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS job_lsh_job_key ON job_lsh(job_key);
+
+CREATE TABLE IF NOT EXISTS term_df (
+  term TEXT PRIMARY KEY,
+  df INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+# title and company matches weigh more than description matches
+_RANK = "bm25(5.0, 3.0, 1.0)"
+
+_UPSERT = """
+INSERT INTO jobs (job_key, url, source, date_pulled, title, company, attributes, description, jobpost_path, first_seen, updated)
+VALUES (:job_key, :url, :source, :date_pulled, :title, :company, :attributes, :description, :jobpost_path, :now, :now)
+ON CONFLICT(job_key) DO UPDATE SET
+  url = excluded.url,
+  source = excluded.source,
+  date_pulled = excluded.date_pulled,
+  title = excluded.title,
+  company = excluded.company,
+  attributes = excluded.attributes,
+  description = excluded.description,
+  jobpost_path = CASE WHEN excluded.jobpost_path != '' THEN excluded.jobpost_path ELSE jobs.jobpost_path END,
+  updated = excluded.updated
+"""
+
+_UPSERT_SIG = "INSERT OR REPLACE INTO job_minhash (job_key, sig) VALUES (?, ?)"
+
+_ADD_DF = "INSERT INTO term_df (term, df) VALUES (?, ?) ON CONFLICT(term) DO UPDATE SET df = df + excluded.df"
+
+# every stored post sharing at least one LSH bucket with the probe, with its signature
+_CANDIDATES = f"""
+WITH probe(band, bucket) AS (VALUES {", ".join(["(?, ?)"] * minhash.BANDS)}),
+cand AS (SELECT DISTINCT l.job_key FROM probe p JOIN job_lsh l ON l.band = p.band AND l.bucket = p.bucket)
+SELECT j.id, j.job_key, j.date_pulled, j.company, j.title, j.url, j.jobpost_path, m.sig
+FROM cand c JOIN job_minhash m ON m.job_key = c.job_key JOIN jobs j ON j.job_key = c.job_key
+"""
+
+# a description at least this similar (estimated Jaccard of word 3-shingles)
+# to an archived one is treated as the same posting
+DUPLICATE_THRESHOLD = 0.8
+
+
+# ----------------------------
+# Canonical job key
+# ----------------------------
+
+_LINKEDIN_JOB_ID_RES = (
+  re.compile(r"[?&]currentJobId=(\d+)"),
+  re.compile(r"/jobs/view/(?:[^/?#]*?-)?(\d+)(?:[/?#]|$)"),
+)
+
+# query parameters that only track where a click came from
+_TRACKING_PARAMS = {"ref", "refid", "trk", "trackingid", "gclid", "fbclid", "src", "source", "ebp", "lipi", "originalsubdomain"}
+
+
+def linkedin_job_id(url: str) -> str | None:
+  if "linkedin.com" not in url.lower():
+    return None
+  for rx in _LINKEDIN_JOB_ID_RES:
+    m = rx.search(url)
+    if m:
+      return m.group(1)
+  return None
+
+
+def canonical_url(url: str) -> str:
+  """Lowercased host without www., no fragment/tracking params, sorted query, no trailing slash."""
+  parts = urlsplit(url.strip())
+  host = (parts.hostname or "").lower().removeprefix("www.")
+  if parts.port:
+    host = f"{host}:{parts.port}"
+  query = sorted(
+    (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+    if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+  )
+  path = parts.path.rstrip("/") or "/"
+  return urlunsplit(((parts.scheme or "https").lower(), host, path, urlencode(query), ""))
+
+
+def job_key(post: JobPost) -> str:
+  """
+  Unique key of a posting: "linkedin:<job id>", else the canonical URL,
+  else (no URL captured) a hash of company + title + description.
+  """
+  url = (post.url or "").strip()
+  jid = linkedin_job_id(url) if url else None
+  if jid:
+    return f"linkedin:{jid}"
+  if url:
+    return "url:" + canonical_url(url)
+  h = hashlib.blake2b(f"{post.company}\n{post.title}\n{post.description}".encode("utf-8"), digest_size=16)
+  return "text:" + h.hexdigest()
+
+
+# ----------------------------
+# Store
+# ----------------------------
+
+@dataclass
+class JobHit:
+  id: int
+  job_key: str
+  date_pulled: str
+  company: str
+  title: str
+  url: str
+  jobpost_path: str
+  snippet: str = ""
+
+
+@dataclass
+class NearDuplicate:
+  similarity: float
+  hit: JobHit
+
+
+def fts_query(q: str) -> str:
+  """
+  Plain search words -> FTS5 query: every word must match (quoted, so
+  c++, data-driven, etc. are not parsed as operators); a trailing * keeps
+  prefix matching.
+  """
+  terms: list[str] = []
+  for w in q.split():
+    star = w.endswith("*") and len(w) > 1
+    w = w.rstrip("*") if star else w
+    terms.append('"' + w.replace('"', '""') + '"' + ("*" if star else ""))
+  return " ".join(terms)
+
+
+class JobStore:
+  def __init__(self, path: Path):
+    self.path = path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    self._conn = sqlite3.connect(str(path), timeout=10.0, check_same_thread=False)
+    self._conn.row_factory = sqlite3.Row
+    self._lock = threading.Lock()
+    with self._lock, self._conn:
+      has_df = self._conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'term_df'").fetchone()
+      self._conn.executescript(_SCHEMA)
+    if not has_df:
+      self.rebuild_term_df()  # store created before term_df existed
+
+  def close(self) -> None:
+    self._conn.close()
+
+  def __enter__(self) -> JobStore:
+    return self
+
+  def __exit__(self, *exc) -> None:
+    self.close()
+
+  def upsert(
+    self,
+    post: JobPost,
+    *,
+    jobpost_path: Path | None = None,
+    signature: tuple[int, ...] | None = None,
+  ) -> None:
+    self.upsert_many([(post, jobpost_path)], signatures=[signature])
+
+  def upsert_many(
+    self,
+    items: list[tuple[JobPost, Path | None]],
+    *,
+    signatures: list[tuple[int, ...] | None] | None = None,
+  ) -> None:
+    """
+    Upsert posts in one transaction (one fsync however many posts), with
+    their MinHash signatures (computed here unless passed in).
+    """
+    now = datetime.now().isoformat(timespec="seconds")
+    rows = [
+      {
+        "job_key": job_key(post),
+        "url": post.url,
+        "source": post.source,
+        "date_pulled": post.date_pulled.isoformat(),
+        "title": post.title,
+        "company": post.company,
+        "attributes": json.dumps(post.attributes, sort_keys=True),
+        "description": post.description,
+        "jobpost_path": str(jobpost_path) if jobpost_path else "",
+        "now": now,
+      }
+      for post, jobpost_path in items
+    ]
+    sigs = [
+      sig if sig is not None else minhash.signature(post.description)
+      for (post, _), sig in zip(items, signatures or [None] * len(items))
+    ]
+    keys = [r["job_key"] for r in rows]
+
+    # document frequencies: +1 per distinct term of each new description,
+    # -1 per term of the description it replaces (O(tokens) per post)
+    latest = {k: post for k, (post, _) in zip(keys, items)}  # upsert: the last one per key wins
+    delta: Counter[str] = Counter()
+    for post in latest.values():
+      delta.update(corpus_terms(post.description))
+    lsh = [
+      (band, bucket, key)
+      for key, sig in zip(keys, sigs)
+      for band, bucket in enumerate(minhash.band_buckets(sig))
+    ]
+    with self._lock, self._conn:
+      uniq = list(latest)
+      for i in range(0, len(uniq), 500):
+        chunk = uniq[i:i + 500]
+        q = f"SELECT description FROM jobs WHERE job_key IN ({', '.join('?' * len(chunk))})"
+        for (old,) in self._conn.execute(q, chunk):
+          delta.subtract(corpus_terms(old))
+      self._conn.executemany(_UPSERT, rows)
+      self._conn.executemany(_ADD_DF, [(t, n) for t, n in delta.items() if n])
+      if any(n < 0 for n in delta.values()):
+        self._conn.execute("DELETE FROM term_df WHERE df <= 0")
+      self._conn.executemany("DELETE FROM job_lsh WHERE job_key = ?", [(k,) for k in keys])
+      self._conn.executemany(_UPSERT_SIG, [(k, minhash.pack_signature(sig)) for k, sig in zip(keys, sigs)])
+      self._conn.executemany("INSERT OR IGNORE INTO job_lsh (band, bucket, job_key) VALUES (?, ?, ?)", lsh)
+
+  def count(self) -> int:
+    return self._conn.execute("SELECT count(*) FROM jobs").fetchone()[0]
+
+  def rebuild_term_df(self) -> None:
+    """Recount document frequencies from every stored description."""
+    df: Counter[str] = Counter()
+    for (desc,) in self._conn.execute("SELECT description FROM jobs"):
+      df.update(corpus_terms(desc))
+    with self._lock, self._conn:
+      self._conn.execute("DELETE FROM term_df")
+      self._conn.executemany("INSERT INTO term_df (term, df) VALUES (?, ?)", df.items())
+
+  def document_frequencies(self, terms: Iterable[str]) -> tuple[int, dict[str, int]]:
+    """(number of stored posts, df of each of `terms` that occurs in any)."""
+    terms = list(terms)
+    out: dict[str, int] = {}
+    for i in range(0, len(terms), 500):
+      chunk = terms[i:i + 500]
+      q = f"SELECT term, df FROM term_df WHERE term IN ({', '.join('?' * len(chunk))})"
+      out.update(self._conn.execute(q, chunk).fetchall())
+    return self.count(), out
+
+  def search(
+    self,
+    query: str,
+    *,
+    limit: int = 20,
+    company: str | None = None,
+    since: str | None = None,
+    raw: bool = False,
+  ) -> list[JobHit]:
+    """Best matches first (bm25; title and company weigh more than the description)."""
+    params: dict[str, object] = {"q": query if raw else fts_query(query), "rank": _RANK, "limit": limit}
+    filters: list[str] = []
+    if company:
+      filters.append("AND j.company LIKE :company")
+      params["company"] = f"%{company}%"
+    if since:
+      filters.append("AND j.date_pulled >= :since")
+      params["since"] = since
+
+    # ORDER BY rank + LIMIT lets FTS5 keep only the top rows, and snippet()
+    # is only evaluated for the rows it returns
+    snippet = "snippet(jobs_fts, 2, '[', ']', '...', 12) AS snippet"
+    if filters:
+      top = [
+        f"SELECT jobs_fts.rowid AS rowid, jobs_fts.rank AS rank, {snippet}",
+        "FROM jobs_fts JOIN jobs j ON j.id = jobs_fts.rowid",
+        "WHERE jobs_fts MATCH :q AND jobs_fts.rank MATCH :rank", *filters,
+        "ORDER BY jobs_fts.rank LIMIT :limit",
+      ]
+    else:
+      top = [
+        f"SELECT rowid, rank, {snippet} FROM jobs_fts",
+        "WHERE jobs_fts MATCH :q AND rank MATCH :rank ORDER BY rank LIMIT :limit",
+      ]
+    sql = [
+      "SELECT j.id, j.job_key, j.date_pulled, j.company, j.title, j.url, j.jobpost_path, top.snippet",
+      "FROM (", *top, ") top JOIN jobs j ON j.id = top.rowid",
+      "ORDER BY top.rank",
+    ]
+    rows = self._conn.execute("\n".join(sql), params).fetchall()
+    return [JobHit(**dict(r)) for r in rows]
+
+  def near_duplicates(
+    self,
+    sig: tuple[int, ...],
+    *,
+    threshold: float = DUPLICATE_THRESHOLD,
+    limit: int = 5,
+    exclude_key: str | None = None,
+  ) -> list[NearDuplicate]:
+    """
+    Stored posts whose estimated similarity to `sig` is at least threshold,
+    most similar first, leaving out the row keyed exclude_key (the posting
+    itself, when it is being re-run). One indexed lookup per LSH band; only
+    the candidates' signatures are compared.
+    """
+    params = [v for band, bucket in enumerate(minhash.band_buckets(sig)) for v in (band, bucket)]
+    out: list[NearDuplicate] = []
+    for r in self._conn.execute(_CANDIDATES, params):
+      if r["job_key"] == exclude_key:
+        continue
+      s = minhash.similarity(sig, minhash.unpack_signature(r["sig"]))
+      if s >= threshold:
+        out.append(NearDuplicate(s, JobHit(**{k: r[k] for k in r.keys() if k != "sig"})))
+    out.sort(key=lambda d: (-d.similarity, -d.hit.id))
+    return out[:limit]
+
+  def recent(self, *, limit: int = 20, company: str | None = None, since: str | None = None) -> list[JobHit]:
+    sql = ["SELECT id, job_key, date_pulled, company, title, url, jobpost_path FROM jobs WHERE 1"]
+    params: dict[str, object] = {"limit": limit}
+    if company:
+      sql.append("AND company LIKE :company")
+      params["company"] = f"%{company}%"
+    if since:
+      sql.append("AND date_pulled >= :since")
+      params["since"] = since
+    sql.append("ORDER BY date_pulled DESC, id DESC LIMIT :limit")
+    return [JobHit(**dict(r)) for r in self._conn.execute("\n".join(sql), params).fetchall()]
+
+  def get(self, ref: str) -> JobPost | None:
+    """Post by row id, job key, or URL (canonicalized the same way as on insert)."""
+    if ref.isdigit():
+      row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (int(ref),)).fetchone()
+    else:
+      key = ref if ref.startswith(("linkedin:", "url:", "text:")) else job_key(
+        JobPost(url=ref, source="", date_pulled=date.today(), title="", company="", description="")
+      )
+      row = self._conn.execute("SELECT * FROM jobs WHERE job_key = ?", (key,)).fetchone()
+    if row is None:
+      return None
+    return JobPost(
+      url=row["url"],
+      source=row["source"],
+      date_pulled=date.fromisoformat(row["date_pulled"]),
+      title=row["title"],
+      company=row["company"],
+      description=row["description"],
+      attributes=json.loads(row["attributes"]),
+    )
+
+
+@dataclass(frozen=True)
+class CorpusIDF:
+  """
+  Smoothed IDF, ln((1 + N) / (1 + df)) + 1, from the job store at `path`.
+  Holds only the path, so configs carrying it still pickle to worker
+  processes; each lookup is one indexed query for the posting's terms.
+  """
+  path: Path
+  # below this many stored posts IDF is noise: rank by plain frequency
+  min_docs: int = 20
+
+  def weights(self, terms: Iterable[str]) -> dict[str, float] | None:
+    """IDF per term, or None (no store yet / too few posts / unreadable)."""
+    if not self.path.exists():
+      return None
+    terms = list(terms)
+    try:
+      n, df = open_job_store(self.path).document_frequencies(terms)
+    except sqlite3.Error as e:
+      print(f"warning: corpus IDF unavailable ({e})", file=sys.stderr)
+      return None
+    if n < self.min_docs:
+      return None
+    return {t: math.log((1 + n) / (1 + df.get(t, 0))) + 1.0 for t in terms}
+
+
+# one open store per path, shared by every job of a run (batch / watch / capture)
+_OPEN: dict[Path, JobStore] = {}
+_OPEN_LOCK = threading.Lock()
+
+
+def job_store_path(base_out_root: Path) -> Path:
+  return base_out_root / JOB_STORE_FILENAME
+
+
+def open_job_store(path: Path) -> JobStore:
+  key = path.resolve()
+  with _OPEN_LOCK:
+    store = _OPEN.get(key)
+    if store is None:
+      store = _OPEN[key] = JobStore(path)
+    return store
+
+
+def record_job_post(
+  post: JobPost,
+  *,
+  base_out_root: Path,
+  jobpost_path: Path | None,
+  signature: tuple[int, ...] | None = None,
+) -> None:
+  """
+  Upsert an archived post into <out root>/jobs.sqlite3. Best effort: the
+  markdown archive is the record, the store is an index over it.
+  """
+  try:
+    open_job_store(job_store_path(base_out_root)).upsert(post, jobpost_path=jobpost_path, signature=signature)
+  except sqlite3.Error as e:
+    print(f"warning: job store not updated ({e})", file=sys.stderr)
+
+
+def find_near_duplicate(
+  sig: tuple[int, ...],
+  *,
+  base_out_root: Path,
+  threshold: float = DUPLICATE_THRESHOLD,
+  exclude_key: str | None = None,
+) -> NearDuplicate | None:
+  """
+  Most similar archived post under base_out_root other than exclude_key, if
+  any. Best effort, like record_job_post.
+  """
+  path = job_store_path(base_out_root)
+  if not path.exists():
+    return None
+  try:
+    found = open_job_store(path).near_duplicates(sig, threshold=threshold, limit=1, exclude_key=exclude_key)
+  except sqlite3.Error as e:
+    print(f"warning: duplicate check skipped ({e})", file=sys.stderr)
+    return None
+  return found[0] if found else None
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+from .jobpost.io import read_jobpost_markdown, render_jobpost_markdown
+from .jobpost.store import JobStore, job_store_path
+from .pipeline import load_run_config
+
+
+def build_argparser() -> argparse.ArgumentParser:
+  ap = argparse.ArgumentParser(
+    prog="tailor_resume jobs",
+    description="Search and inspect archived job posts (SQLite + FTS5 store under the output root).",
+  )
+  common = argparse.ArgumentParser(add_help=False)
+  common.add_argument("--db", default=None, help="Job store path (default: <out root>/jobs.sqlite3)")
+  common.add_argument("--out-dir", default=None, help="Output root the store lives under (default: from config)")
+  common.add_argument("--config", default=None, help="Optional TOML config")
+  sub = ap.add_subparsers(dest="command", required=True)
+
+  s = sub.add_parser("search", parents=[common], help="Full-text search over title, company and description")
+  s.add_argument("query", nargs="*", help="Words that must all match (word* = prefix); empty = most recent")
+  s.add_argument("--company", default=None, help="Only companies containing this text")
+  s.add_argument("--since", default=None, help="Only posts pulled on/after YYYY-MM-DD")
+  s.add_argument("--limit", type=int, default=20)
+  s.add_argument("--raw", action="store_true", help="Pass the query to FTS5 as-is (OR, NEAR, column:term, ...)")
+  s.add_argument("--json", action="store_true", help="One JSON object per hit")
+
+  sh = sub.add_parser("show", parents=[common], help="Print one post as archived markdown")
+  sh.add_argument("ref", help="Row id, job key, or URL")
+
+  im = sub.add_parser("import", parents=[common], help="Backfill the store from archived job post files")
+  im.add_argument("paths", nargs="*", help="Directories/files to scan (default: the output root)")
+  return ap
+
+
+def resolve_store_path(args) -> Path:
+  if args.db:
+    return Path(args.db)
+  if args.out_dir:
+    return job_store_path(Path(args.out_dir))
+  cfg = load_run_config(args.config)
+  return job_store_path(Path(cfg.paths_out_root))
+
+
+def cmd_search(store: JobStore, args) -> int:
+  q = " ".join(args.query).strip()
+  t0 = time.perf_counter()
+  if q:
+    try:
+      hits = store.search(q, limit=args.limit, company=args.company, since=args.since, raw=args.raw)
+    except sqlite3.OperationalError as e:
+      # only reachable with --raw; plain queries are quoted term by term
+      print(f"invalid FTS5 query: {e}", file=sys.stderr)
+      return 2
+  else:
+    hits = store.recent(limit=args.limit, company=args.company, since=args.since)
+  ms = (time.perf_counter() - t0) * 1000
+
+  if args.json:
+    for h in hits:
+      print(json.dumps(asdict(h)))
+    return 0
+
+  for h in hits:
+    print(f"{h.id:>6}  {h.date_pulled}  {h.company} / {h.title}")
+    if h.snippet:
+      print(f"        {' '.join(h.snippet.split())}")
+    print(f"        {h.jobpost_path or h.url}")
+  print(f"{len(hits)} hit(s) in {ms:.1f} ms ({store.count()} posts)", file=sys.stderr)
+  return 0
+
+
+def cmd_show(store: JobStore, args) -> int:
+  post = store.get(args.ref)
+  if post is None:
+    print(f"not found: {args.ref}", file=sys.stderr)
+    return 1
+  sys.stdout.write(render_jobpost_markdown(post))
+  return 0
+
+
+def cmd_import(store: JobStore, args) -> int:
+  roots = [Path(p) for p in args.paths] or [store.path.parent]
+  items = []
+  for root in roots:
+    files = [root] if root.is_file() else sorted(root.rglob("*.md"))
+    for p in files:
+      post = read_jobpost_markdown(p)
+      if post is not None:
+        items.append((post, p))
+  store.upsert_many(items)
+  print(f"imported {len(items)} job post(s) -> {store.path} ({store.count()} posts)")
+  return 0
+
+
+COMMANDS = {"search": cmd_search, "show": cmd_show, "import": cmd_import}
+
+
+def main(argv: list[str] | None = None) -> int:
+  args = build_argparser().parse_args(argv)
+  path = resolve_store_path(args)
+  if args.command != "import" and not path.exists():
+    # don't leave an empty store behind for a mistyped --db / --out-dir
+    print(f"no job store at {path} (run `jobs import` to build one)", file=sys.stderr)
+    return 1
+  with JobStore(path) as store:
+    return COMMANDS[args.command](store, args)
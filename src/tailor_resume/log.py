@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from .pipeline import load_run_config, resolve_csv_log_path
+from .run_log import RunStore, open_run_store
+
+
+STATS_GROUPS = ("profile", "status", "day", "month")
+
+
+def build_argparser() -> argparse.ArgumentParser:
+  ap = argparse.ArgumentParser(
+    prog="tailor_resume log",
+    description="Query the run log (SQLite store next to the CSV log; an existing CSV is imported on first use).",
+  )
+  common = argparse.ArgumentParser(add_help=False)
+  common.add_argument("--log-csv", default=None, help="CSV log whose store to use (default: from config)")
+  common.add_argument("--db", default=None, help="Run store path (default: the CSV log path with .sqlite3)")
+  common.add_argument("--config", default=None, help="Optional TOML config")
+  common.add_argument("--since", default=None, help="Only runs on/after this date (YYYY-MM-DD)")
+  common.add_argument("--profile", default=None, help="Only runs with this profile")
+  sub = ap.add_subparsers(dest="command", required=True)
+
+  s = sub.add_parser("stats", parents=[common], help="Run counts and kept/dropped averages per group")
+  s.add_argument(
+    "--by", nargs="*", choices=STATS_GROUPS, default=["profile", "status"],
+    help="Group by these (default: profile status); none = one total row",
+  )
+  s.add_argument("--json", action="store_true", help="One JSON object per group")
+
+  t = sub.add_parser("tail", parents=[common], help="Print the last runs")
+  t.add_argument("-n", type=int, default=10)
+
+  e = sub.add_parser("export", parents=[common], help="Rewrite a CSV from the store")
+  e.add_argument("--out", default=None, help="CSV to write (default: the CSV log itself)")
+  return ap
+
+
+def open_store(args) -> tuple[RunStore, Path | None]:
+  """(store, csv log path or None when --db was given)."""
+  if args.db:
+    return RunStore(Path(args.db)), None
+  cfg = load_run_config(args.config)
+  csv_path = resolve_csv_log_path(args.log_csv, cfg)
+  if csv_path is None:
+    raise SystemExit("no run log: pass --log-csv or --db, or set paths.csv_log in the config")
+  return open_run_store(csv_path), csv_path
+
+
+def print_table(rows: list[dict], cols: list[str]) -> None:
+  cells = [["" if r[c] is None else str(r[c]) for c in cols] for r in rows]
+  widths = [max([len(c)] + [len(row[i]) for row in cells]) for i, c in enumerate(cols)]
+  print("  ".join(c.ljust(w) for c, w in zip(cols, widths)).rstrip())
+  for row in cells:
+    print("  ".join(v.ljust(w) for v, w in zip(row, widths)).rstrip())
+
+
+def cmd_stats(store: RunStore, args, csv_path: Path | None) -> int:
+  t0 = time.perf_counter()
+  rows = store.stats(args.by, since=args.since, profile=args.profile)
+  ms = (time.perf_counter() - t0) * 1000
+  if args.json:
+    for r in rows:
+      print(json.dumps(r))
+    return 0
+  if rows:
+    print_table(rows, list(rows[0]))
+  print(f"{sum(r['runs'] for r in rows)} run(s), {len(rows)} group(s) in {ms:.1f} ms", file=sys.stderr)
+  return 0
+
+
+def cmd_tail(store: RunStore, args, csv_path: Path | None) -> int:
+  rows = store.rows(since=args.since, profile=args.profile, last=args.n)
+  if rows:
+    print_table(rows, ["timestamp", "profile", "submission_status", "kept_bullets_total", "resume_out"])
+  return 0
+
+
+def cmd_export(store: RunStore, args, csv_path: Path | None) -> int:
+  out = Path(args.out) if args.out else csv_path
+  if out is None:
+    raise SystemExit("export: pass --out (no CSV log path with --db)")
+  n = store.export_csv(out, since=args.since, profile=args.profile)
+  print(f"exported {n} run(s) -> {out}")
+  return 0
+
+
+COMMANDS = {"stats": cmd_stats, "tail": cmd_tail, "export": cmd_export}
+
+
+def main(argv: list[str] | None = None) -> int:
+  args = build_argparser().parse_args(argv)
+  store, csv_path = open_store(args)
+  return COMMANDS[args.command](store, args, csv_path)
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass
+class PostProcessed:
+  markdown: str
+  markdown_errors: list[str]
+  note_errors: list[str]
+
+
+def _is_cc_header(line: str) -> bool:
+  return line.startswith("## ") and line[3:].strip().lower() == "core_competencies"
+
+
+def _tail_trimmer(emit: Callable[[str], None]) -> tuple[Callable[[str], None], Callable[[], None]]:
+  """
+  Streaming `splitlines("\\n".join(lines).rstrip() + "\\n")`: whitespace-only
+  lines are held back until more content follows; at the end they are
+  dropped and the last content line is rstripped.
+  """
+  held: str | None = None
+  tail: list[str] = []
+
+  def push(line: str) -> None:
+    nonlocal held
+    if not line.strip():
+      tail.append(line)
+      return
+    if held is not None:
+      emit(held)
+    if tail:
+      for t in tail:
+        emit(t)
+      tail.clear()
+    held = line
+
+  def close() -> None:
+    emit(held.rstrip() if held is not None else "")
+
+  return push, close
+
+
+def postprocess_markdown(md: str, reordered_competencies: list[str] | None = None) -> PostProcessed:
+  """
+  One streaming walk over the rendered resume, equivalent to (same output,
+  same error messages as) the former chain of whole-document passes:
+
+    apply_reordered_core_competencies -> normalize_markdown_spacing
+    -> validate_markdown -> strip_notes_from_markdown -> validate_notes_placement
+
+  Each former pass is a small line state machine feeding the next one
+  (A -> [trim] -> B -> C -> [trim] -> E -> [trim] -> G), so no intermediate
+  document is ever joined or split again. The first trim only runs with a
+  reorder list, as the old `.rstrip() + "\n"` after the reorder did.
+  """
+  out: list[str] = []
+  md_errors: list[str] = []
+  note_errors: list[str] = []
+
+  # ---- G: validate_notes_placement (over the final lines) ----
+  g_in_summary = False
+  g_blanks = 0
+  g_prev: str | None = None
+
+  def g_line(line: str) -> None:
+    nonlocal g_in_summary, g_blanks, g_prev
+    i = len(out)
+    out.append(line)
+    if line.startswith("## "):
+      g_in_summary = line[3:].strip().lower() == "summary"
+    elif not g_in_summary:
+      s = line.lstrip()
+      if s.startswith(">"):
+        if g_blanks > 1:
+          note_errors.append(f"Line {i+1}: blockquote is separated from bullet by >1 blank line.")
+        if g_prev is None or not (g_prev.startswith("- ") or g_prev.startswith("* ")):
+          note_errors.append(f"Line {i+1}: blockquote must follow a bullet ('- ' or '* ').")
+      elif s.startswith("<!--"):
+        note_errors.append(f"Line {i+1}: HTML comment found outside SUMMARY (did stripping run?).")
+
+    if line.strip():
+      g_blanks = 0
+      g_prev = line
+    else:
+      g_blanks += 1
+
+  f_push, f_close = _tail_trimmer(g_line)
+
+  # ---- E: validate_markdown + strip_notes_from_markdown (over normalized lines) ----
+  e_i = 0
+  e_prev: str | None = None
+  e_in_summary = False
+
+  def e_line(line: str) -> None:
+    nonlocal e_i, e_prev, e_in_summary
+    if e_prev is not None:
+      if e_prev.startswith("- ") and line.startswith("#"):
+        md_errors.append(f"Line {e_i}: bullet immediately followed by header: {e_prev!r} -> {line!r}")
+      if e_prev == "" and line == "":
+        md_errors.append(f"Line {e_i}: multiple consecutive blank lines")
+    e_prev = line
+    e_i += 1
+
+    if line.startswith("## "):
+      e_in_summary = line[3:].strip().lower() == "summary"
+    elif not e_in_summary:
+      s = line.strip()
+      if s.startswith("<!--") or s.startswith(">"):
+        return
+    f_push(line)
+
+  d_push, d_close = _tail_trimmer(e_line)
+
+  # ---- C: normalize pass 2 (blank line before headers, collapse blank runs) ----
+  c_prev_blank = False
+  c_last: str | None = None
+
+  def c_line(line: str) -> None:
+    nonlocal c_prev_blank, c_last
+    if line == "":
+      if c_prev_blank:
+        return
+      c_prev_blank = True
+    else:
+      if line.startswith("#") and c_last is not None and c_last != "":
+        d_push("")
+      c_prev_blank = False
+    c_last = line
+    d_push(line)
+
+  # ---- B: normalize pass 1 (drop blank lines between bullets) ----
+  b_after_bullet = False
+  b_pending = 0
+
+  def b_line(line: str) -> None:
+    nonlocal b_after_bullet, b_pending
+    if line == "":
+      if b_after_bullet:
+        b_pending += 1
+      else:
+        c_line("")
+      return
+    is_bullet = line.startswith("- ")
+    if b_pending:
+      if not is_bullet:
+        for _ in range(b_pending):
+          c_line("")
+      b_pending = 0
+    b_after_bullet = is_bullet
+    c_line(line)
+
+  # ---- A: CORE_COMPETENCIES reorder ----
+  a_push, a_close = _tail_trimmer(b_line) if reordered_competencies else (b_line, None)
+
+  lines = md.splitlines()
+  n = len(lines)
+  i = 0
+  if reordered_competencies:
+    held: list[str] = []
+    in_cc = False
+    while i < n:
+      line = lines[i]
+      i += 1
+      if _is_cc_header(line):
+        # a repeated header restarts the section (matches extract_core_competencies)
+        for h in held:
+          a_push(h)
+        held = []
+        in_cc = True
+        a_push(line)
+      elif not in_cc:
+        a_push(line)
+      elif line.startswith("## "):
+        for it in reordered_competencies:
+          a_push(it)
+        in_cc = False
+        a_push(line)
+        break
+      else:
+        held.append(line)
+    else:
+      if in_cc:
+        for it in reordered_competencies:
+          a_push(it)
+
+  while i < n:
+    a_push(lines[i])
+    i += 1
+
+  if a_close is not None:
+    a_close()
+  for _ in range(b_pending):
+    c_line("")
+  d_close()
+  f_close()
+
+  return PostProcessed(markdown="\n".join(out) + "\n", markdown_errors=md_errors, note_errors=note_errors)
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable, Mapping
+
+from .text_utils import normalize_text
+
+
+class PhraseMatcher:
+  """
+  Aho-Corasick automaton over many phrases, each tagged with a term class.
+
+  One pass over a text finds every phrase that occurs as a substring, and
+  counts() turns that into hits per class. The semantics match a per-phrase
+  `phrase in text` loop: a phrase counts once per listing, however often it
+  occurs, and an empty phrase matches everything. Matching is case-sensitive,
+  so callers pass phrases and texts already normalized.
+  """
+
+  def __init__(self, classes: Mapping[str, Iterable[str]], *, key: object = None):
+    self.key = key
+    # the phrases of each class, as given (config matchers: normalized term tuples)
+    self.phrases: dict[str, tuple[str, ...]] = {c: tuple(ps) for c, ps in classes.items()}
+    classes = self.phrases
+    self.classes: tuple[str, ...] = tuple(classes)
+    self._always = [0] * len(self.classes)
+
+    pattern_ids: dict[str, int] = {}
+    weights: list[dict[int, int]] = []
+    for ci, phrases in enumerate(classes.values()):
+      for p in phrases:
+        if not p:
+          self._always[ci] += 1
+          continue
+        pid = pattern_ids.get(p)
+        if pid is None:
+          pid = pattern_ids[p] = len(weights)
+          weights.append({})
+        weights[pid][ci] = weights[pid].get(ci, 0) + 1
+    self._weights: list[tuple[tuple[int, int], ...]] = [tuple(w.items()) for w in weights]
+    self.size = len(weights)
+    # phrase -> pattern id (ids follow first-seen order)
+    self.pattern_ids = pattern_ids
+    self._lens = [len(p) for p in pattern_ids]
+
+    # trie
+    goto: list[dict[str, int]] = [{}]
+    out: list[list[int]] = [[]]
+    for p, pid in pattern_ids.items():
+      s = 0
+      for ch in p:
+        nxt = goto[s].get(ch)
+        if nxt is None:
+          nxt = len(goto)
+          goto[s][ch] = nxt
+          goto.append({})
+          out.append([])
+        s = nxt
+      out[s].append(pid)
+
+    # failure links (BFS), merging outputs along the fail chain
+    fail = [0] * len(goto)
+    q: deque[int] = deque(goto[0].values())
+    while q:
+      s = q.popleft()
+      for ch, nxt in goto[s].items():
+        q.append(nxt)
+        f = fail[s]
+        while f and ch not in goto[f]:
+          f = fail[f]
+        fail[nxt] = goto[f].get(ch, 0)
+        out[nxt].extend(out[fail[nxt]])
+
+    self._goto = goto
+    self._fail = fail
+    self._out: list[tuple[int, ...]] = [tuple(o) for o in out]
+
+  def scan(self, text: str) -> set[int]:
+    """Ids of all patterns occurring in text."""
+    goto = self._goto
+    fail = self._fail
+    out = self._out
+    found: set[int] = set()
+    s = 0
+    for ch in text:
+      while s and ch not in goto[s]:
+        s = fail[s]
+      s = goto[s].get(ch, 0)
+      if out[s]:
+        found.update(out[s])
+    return found
+
+  def occurrences(self, text: str) -> list[int]:
+    """
+    Per pattern id, how often it occurs in text, with `text.count(phrase)`
+    semantics (non-overlapping, leftmost first) for every phrase in one pass.
+    """
+    goto = self._goto
+    fail = self._fail
+    out = self._out
+    lens = self._lens
+    n = [0] * self.size
+    next_free = [0] * self.size
+    s = 0
+    for i, ch in enumerate(text):
+      while s and ch not in goto[s]:
+        s = fail[s]
+      s = goto[s].get(ch, 0)
+      if out[s]:
+        for pid in out[s]:
+          start = i + 1 - lens[pid]
+          if start >= next_free[pid]:
+            n[pid] += 1
+            next_free[pid] = i + 1
+    return n
+
+  def counts(self, text: str) -> dict[str, int]:
+    totals = list(self._always)
+    if self.size:
+      weights = self._weights
+      for pid in self.scan(text):
+        for ci, w in weights[pid]:
+          totals[ci] += w
+    return dict(zip(self.classes, totals))
+
+
+def normalized_phrases(phrases: Iterable[str]) -> list[str]:
+  """normalize + strip, dropping empties (same rules as text_utils.phrase_hits)."""
+  out: list[str] = []
+  for p in phrases:
+    p2 = normalize_text(p).strip()
+    if p2:
+      out.append(p2)
+  return out
+
+
+# ----------------------------
+# Config-level matcher
+# ----------------------------
+
+def guardrail_class(idx: int) -> str:
+  return f"guardrail:{idx}"
+
+
+def _config_matcher_key(cfg) -> tuple:
+  return (
+    tuple(cfg.required_terms),
+    tuple(cfg.nice_to_have_terms),
+    tuple(cfg.domain_terms),
+    tuple(sorted(cfg.generic_penalties)),
+    tuple(tuple(gr.get("triggers", [])) for gr in cfg.guardrails),
+  )
+
+
+def compile_config_matcher(cfg) -> PhraseMatcher:
+  classes: dict[str, list[str]] = {
+    "required": normalized_phrases(cfg.required_terms),
+    "nice_to_have": normalized_phrases(cfg.nice_to_have_terms),
+    "domain": normalized_phrases(cfg.domain_terms),
+    # is_generic() matches the raw phrases against normalized text
+    "generic": sorted(cfg.generic_penalties),
+  }
+  for i, gr in enumerate(cfg.guardrails):
+    classes[guardrail_class(i)] = normalized_phrases(gr.get("triggers", []))
+  return PhraseMatcher(classes, key=_config_matcher_key(cfg))
+
+
+def config_matcher(cfg) -> PhraseMatcher:
+  """
+  The config's compiled matcher. load_config builds it eagerly; this
+  rebuilds it if the term lists were changed on the config afterwards.
+  """
+  key = _config_matcher_key(cfg)
+  m = cfg.term_matcher
+  if m is None or m.key != key:
+    m = compile_config_matcher(cfg)
+    cfg.term_matcher = m
+  return m
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+from .models import ResumeDoc, Role
+from .jobpost.types import JobPost
+from .resume_parse import render_resume_with_new_roles
+from .resume_cache import PreparedResume, prepare_resume, default_cache_dir
+from .tailor_engine import tailor
+from .markdown_postprocess import postprocess_markdown
+from .text_utils import make_contact_table, safe_slug, now_iso_local
+from .scoring import BulletFeatures
+from .resume_frontmatter import render_resume_frontmatter
+from .config_cache import load_compiled_config
+from .tailor_config import TailorConfig
+from .timings import stage
+
+
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parent / "config/tailor_resume.toml"
+STOPWORDS_PATH = Path(__file__).resolve().parent / "config" / "stopwords.yaml"
+
+
+@dataclass
+class TailoredResume:
+  markdown: str
+  report: dict
+  resume_out: Path
+  report_out: Path
+
+
+def load_run_config(config_path: str | None, *, use_nltk: bool = False, out_dir: str | None = None) -> TailorConfig:
+  """
+  TOML config + global stopwords (compiled, see config_cache) with CLI
+  overrides applied. out_dir is the run's --out-dir, if any.
+  """
+  cfg_path = Path(config_path) if config_path else DEFAULT_CONFIG_PATH
+  cfg = load_compiled_config(cfg_path if cfg_path.exists() else None, STOPWORDS_PATH)
+
+  # enforce mandatory contact info
+  if not (cfg.contact_email.strip() and cfg.contact_location.strip() and cfg.contact_phone.strip()):
+    raise RuntimeError("Contact info is mandatory in tailor_resume.toml")
+
+  if use_nltk:
+    cfg.use_nltk = True
+
+  bind_term_idf(cfg, Path(out_dir) if out_dir else Path(cfg.paths_out_root))
+  return cfg
+
+
+def bind_term_idf(cfg: TailorConfig, base_out_root: Path) -> None:
+  """
+  With [terms] ranking = "tfidf", rank auto terms by IDF over [paths]
+  idf_store, else over the job store the run records into.
+  """
+  if cfg.auto_term_ranking != "tfidf":
+    return
+  from .jobpost.store import CorpusIDF, job_store_path
+  cfg.term_idf = CorpusIDF(Path(cfg.paths_idf_store) if cfg.paths_idf_store else job_store_path(base_out_root))
+
+
+def load_base_resume(base_resume: Path, cfg: TailorConfig, *, cache_dir: Path | None = None) -> PreparedResume:
+  """
+  Read the base resume template, inject the contact line, then parse and
+  featurize it (served from cache_dir when the content hash matches).
+  """
+  intermediate_md_resume = base_resume.read_text(encoding="utf-8")
+
+  # mandatory contact line injection
+  contact_block = make_contact_table(cfg.contact_email, cfg.contact_location, cfg.contact_phone)
+  if not contact_block:
+    raise RuntimeError("Contact table rendered empty (contact info missing in config).")
+
+  if "{{CONTACT_LINE}}" in intermediate_md_resume:
+    intermediate_md_resume = intermediate_md_resume.replace("{{CONTACT_LINE}}", contact_block.rstrip() + "\n", 1)
+  else:
+    raise RuntimeError("Missing {{CONTACT_LINE}} placeholder in base resume.")
+
+  return prepare_resume(intermediate_md_resume, cfg, cache_dir=cache_dir)
+
+
+def tailor_resume_markdown(
+  doc: ResumeDoc,
+  job_text: str,
+  cfg: TailorConfig,
+  features: dict[str, BulletFeatures] | None = None,
+) -> tuple[str, dict]:
+  """tailor -> render -> reorder competencies -> normalize/validate -> strip notes."""
+  new_roles, report = tailor(doc, job_text, cfg, features)
+  return render_tailored_markdown(doc, new_roles, report), report
+
+
+def render_tailored_markdown(doc: ResumeDoc, new_roles: list[Role], report: dict) -> str:
+  """render, then one fused pass: reorder competencies -> normalize/validate -> strip notes/validate."""
+  with stage("markdown_render"):
+    out_md = render_resume_with_new_roles(doc, new_roles)
+
+  with stage("markdown_postprocess"):
+    post = postprocess_markdown(out_md, report.get("core_competencies_reordered") or [])
+
+  md_errors = post.markdown_errors
+  if md_errors:
+    raise RuntimeError("Markdown validation failed:\n" + "\n".join(f"- {e}" for e in md_errors[:25]))
+
+  note_errors = post.note_errors
+  if note_errors:
+    raise RuntimeError("Note validation failed:\n" + "\n".join(f"- {e}" for e in note_errors[:50]))
+
+  return post.markdown
+
+
+def resume_output_paths(post: JobPost, out_dir: Path) -> tuple[Path, Path]:
+  """(resume_out, report_out) for a job post."""
+  date_prefix = post.date_pulled.strftime("%Y-%m-%d")
+  name_slug = safe_slug(f"{post.company}_{post.title}")
+  return (
+    out_dir / f"{date_prefix}_resume_{name_slug}.md",
+    out_dir / f"{date_prefix}_report_{name_slug}.json",
+  )
+
+
+def tailor_job_post(resume: PreparedResume, post: JobPost, out_dir: Path, cfg: TailorConfig) -> TailoredResume:
+  out_md, report = tailor_resume_markdown(resume.doc, post.description, cfg, resume.features)
+  resume_out, report_out = resume_output_paths(post, out_dir)
+  return TailoredResume(markdown=out_md, report=report, resume_out=resume_out, report_out=report_out)
+
+
+def job_metadata(post: JobPost, *, jobpost_path: Path | None, profile: str) -> dict:
+  """What `rescore` needs to re-emit a resume: frontmatter fields + archived job post."""
+  return {
+    "title": post.title,
+    "company": post.company,
+    "date_pulled": post.date_pulled.isoformat(),
+    "source": post.source,
+    "url": post.url,
+    "profile": profile,
+    "jobpost_path": str(jobpost_path) if jobpost_path else "",
+  }
+
+
+def write_tailored_resume(
+  result: TailoredResume,
+  post: JobPost,
+  *,
+  profile: str,
+  jobpost_path: Path | None = None,
+) -> None:
+  frontmatter = render_resume_frontmatter(
+    job_title=post.title,
+    company=post.company,
+    date_pulled=post.date_pulled,
+    source=post.source,
+    url=post.url,
+    profile=profile,
+  )
+  result.report["job"] = job_metadata(post, jobpost_path=jobpost_path, profile=profile)
+  result.resume_out.write_text(frontmatter + result.markdown, encoding="utf-8")
+  result.report_out.write_text(json.dumps(result.report, indent=2), encoding="utf-8")
+
+
+def resolve_cache_dir(no_cache: bool, cfg: TailorConfig) -> Path | None:
+  return None if no_cache else default_cache_dir(cfg)
+
+
+def resolve_csv_log_path(log_csv: str | None, cfg: TailorConfig) -> Path | None:
+  """CSV log path: CLI flag wins, else config default, else no log."""
+  if log_csv:
+    return Path(log_csv)
+  if getattr(cfg, "paths_csv_log", ""):
+    return Path(cfg.paths_csv_log)
+  return None
+
+
+def build_log_row(
+  *,
+  result: TailoredResume,
+  jobpost_path: Path,
+  base_resume: Path,
+  cfg: TailorConfig,
+  profile: str,
+  status: str,
+) -> dict:
+  report = result.report
+  missing = report.get("missing_keywords", [])
+  missing_top = "; ".join([m.get("keyword", "") for m in missing[:10]]) if isinstance(missing, list) else ""
+
+  kept_count = 0
+  dropped_count = 0
+  for r in report.get("roles", []):
+    kept_count += len(r.get("kept", []))
+    dropped_count += len(r.get("dropped", []))
+
+  return {
+    "timestamp": now_iso_local(),
+    "profile": profile,
+    "submission_status": status,
+    "job_file": str(jobpost_path),
+    "resume_in": str(base_resume),
+    "resume_out": str(result.resume_out),
+    "report_out": str(result.report_out),
+    "use_nltk": str(cfg.use_nltk),
+    "per_role_keep": str(cfg.per_role_keep),
+    "min_per_role_keep": str(cfg.min_per_role_keep),
+    "drop_below_score": str(cfg.drop_below_score),
+    "kept_bullets_total": str(kept_count),
+    "dropped_bullets_total": str(dropped_count),
+    "missing_keywords_top10": missing_top,
+  }
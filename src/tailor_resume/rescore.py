@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Iterable
+
+from .models import ResumeDoc, Role
+from .tailor_config import TailorConfig, tomllib
+from .tailor_engine import select_role_bullets
+from .guardrails import compile_guardrails
+from .phrase_matcher import config_matcher, guardrail_class
+from .text_utils import normalize_text
+from .resume_frontmatter import render_resume_frontmatter
+from .score_matrix import score_rows
+from .scoring import (
+  FEATURE_NAMES,
+  bullet_weights,
+  competency_weights,
+  details_from_row,
+  extract_core_competencies,
+)
+from .pipeline import (
+  load_run_config,
+  load_base_resume,
+  render_tailored_markdown,
+  resolve_cache_dir,
+)
+
+
+# [scoring] / [tailor] knobs a weight set may override
+RESCORE_KEYS = {
+  "w_required",
+  "w_nice",
+  "w_domain",
+  "w_overlap",
+  "w_metric",
+  "w_action_verb",
+  "w_generic_penalty",
+  "w_length_penalty",
+  "per_role_keep",
+  "min_per_role_keep",
+  "drop_below_score",
+}
+
+_INT_KEYS = {"per_role_keep", "min_per_role_keep"}
+
+
+@dataclass
+class StoredReport:
+  """A report JSON plus its feature rows, checked against the base resume."""
+  path: Path
+  report: dict
+  rows_by_role: list[list[list[int]]]
+  cc_rows: list[list[int]]
+  job_text: str | None
+
+
+@dataclass
+class Rescored:
+  new_roles: list[Role]
+  report: dict
+
+
+def build_argparser() -> argparse.ArgumentParser:
+  ap = argparse.ArgumentParser(
+    prog="tailor_resume rescore",
+    description="Re-rank saved runs from their report feature rows (no re-tokenizing) and re-emit resumes.",
+  )
+  ap.add_argument("reports", nargs="+", help="*_report_*.json files, or directories to search for them")
+  ap.add_argument("--resume", required=True, help="Base resume the reports were produced from")
+  ap.add_argument("--config", default=None, help="TOML config with the new [scoring]/[tailor]/guardrails")
+  ap.add_argument("--out-dir", default=None, help="Write re-emitted resume + report here (default: next to each report)")
+  ap.add_argument("--dry-run", action="store_true", help="Rescore and summarize, but write nothing")
+  ap.add_argument("--no-cache", action="store_true", help="Re-parse the base resume (skip the on-disk cache)")
+  ap.add_argument(
+    "--grid",
+    default=None,
+    help="TOML file of [[weights]] tables (name + [scoring]/[tailor] overrides); "
+    "evaluates every set over every report and prints a summary instead of re-emitting",
+  )
+  ap.add_argument("--grid-out", default=None, help="Write the grid summary (per set and per job) as JSON")
+  return ap
+
+
+# ----------------------------
+# Loading
+# ----------------------------
+
+def iter_report_paths(items: Iterable[str]) -> list[Path]:
+  out: list[Path] = []
+  for it in items:
+    p = Path(it)
+    if p.is_dir():
+      out.extend(sorted(p.rglob("*_report_*.json")))
+    elif p.exists():
+      out.append(p)
+    else:
+      raise FileNotFoundError(f"Report not found: {p}")
+  return out
+
+
+def _read_job_description(jobpost_path: str) -> str | None:
+  if not jobpost_path:
+    return None
+  p = Path(jobpost_path)
+  if not p.exists():
+    return None
+  # jobpost.io.render_jobpost_markdown: frontmatter, "# Job Post", description
+  _, sep, desc = p.read_text(encoding="utf-8").partition("\n# Job Post\n")
+  return desc if sep else None
+
+
+def load_stored_report(path: Path, doc: ResumeDoc) -> StoredReport:
+  report = json.loads(path.read_text(encoding="utf-8"))
+
+  if report.get("feature_names") != list(FEATURE_NAMES):
+    raise ValueError(f"{path}: no matching feature rows (report predates `rescore`); re-run tailoring once")
+
+  roles = report.get("roles", [])
+  if len(roles) != len(doc.roles):
+    raise ValueError(f"{path}: {len(roles)} roles in report, {len(doc.roles)} in base resume")
+
+  rows_by_role: list[list[list[int]]] = []
+  for role, r in zip(doc.roles, roles):
+    rows = r.get("features", [])
+    if r.get("role_header") != role.role_header or len(rows) != len(role.bullet_lines):
+      raise ValueError(f"{path}: role {role.role_header!r} does not match the base resume")
+    rows_by_role.append(rows)
+
+  _, _, cc_items = extract_core_competencies(doc.lines)
+  cc_rows = report.get("core_competencies_features", [])
+  if len(cc_rows) != len(cc_items):
+    raise ValueError(f"{path}: CORE_COMPETENCIES do not match the base resume")
+
+  job_text = _read_job_description((report.get("job") or {}).get("jobpost_path", ""))
+  return StoredReport(path=path, report=report, rows_by_role=rows_by_role, cc_rows=cc_rows, job_text=job_text)
+
+
+# ----------------------------
+# Rescoring
+# ----------------------------
+
+def apply_overrides(cfg: TailorConfig, overrides: dict) -> TailorConfig:
+  unknown = set(overrides) - RESCORE_KEYS
+  if unknown:
+    raise ValueError(f"Unknown weight keys: {', '.join(sorted(unknown))}")
+  out = copy.copy(cfg)
+  for k, v in overrides.items():
+    setattr(out, k, int(v) if k in _INT_KEYS else float(v))
+  return out
+
+
+def load_weight_grid(path: Path) -> list[tuple[str, dict]]:
+  if tomllib is None:
+    raise RuntimeError("TOML parser not available. Use Python 3.11+ (tomllib) or install tomli.")
+  data = tomllib.loads(path.read_text(encoding="utf-8")) or {}
+  sets = data.get("weights")
+  if not isinstance(sets, list) or not sets:
+    raise ValueError(f"{path}: expected one or more [[weights]] tables")
+  out: list[tuple[str, dict]] = []
+  for i, ws in enumerate(sets, start=1):
+    ws = dict(ws)
+    name = str(ws.pop("name", f"set{i}"))
+    out.append((name, ws))
+  return out
+
+
+def triggered_guardrails(stored: StoredReport, cfg: TailorConfig) -> set[int]:
+  """Re-evaluate the config's guardrail triggers against the archived job post.
+
+  Falls back to the guardrail names the original run recorded when the
+  job post file is gone.
+  """
+  if stored.job_text is not None:
+    counts = config_matcher(cfg).counts(normalize_text(stored.job_text))
+    return {i for i in range(len(cfg.guardrails)) if counts[guardrail_class(i)] > 0}
+  names = set(stored.report.get("guardrails_triggered", []))
+  return {i for i, gr in enumerate(cfg.guardrails) if gr.get("name", "unnamed") in names}
+
+
+def rescore_stored(stored: StoredReport, doc: ResumeDoc, cfg: TailorConfig, scores: list[float]) -> Rescored:
+  """
+  Keep/drop from precomputed scores (bullets in document order, then
+  competencies), with the same selection as tailor().
+  """
+  triggered = triggered_guardrails(stored, cfg)
+  report = dict(stored.report)
+  report["guardrails"] = cfg.guardrails
+  report["guardrails_triggered"] = [cfg.guardrails[i].get("name", "unnamed") for i in sorted(triggered)]
+  report["config"] = {
+    "per_role_keep": cfg.per_role_keep,
+    "min_per_role_keep": cfg.min_per_role_keep,
+    "drop_below_score": cfg.drop_below_score,
+  }
+
+  guardrails = compile_guardrails(cfg, triggered.__contains__)
+  new_roles: list[Role] = []
+  report_roles: list[dict] = []
+  k = 0
+  for role, rows in zip(doc.roles, stored.rows_by_role):
+    scored = []
+    for b, row in zip(role.bullet_lines, rows):
+      scored.append((scores[k], b, details_from_row(row)))
+      k += 1
+    kept, dropped, guardrail_applied = select_role_bullets(scored, cfg, guardrails)
+
+    new_roles.append(Role(
+      role_header=role.role_header,
+      company_header=role.company_header,
+      other_lines=list(role.other_lines),
+      bullet_lines=[b for _, b, _ in kept],
+    ))
+    report_roles.append({
+      "role_header": role.role_header,
+      "company_header": role.company_header,
+      "guardrails_applied": guardrail_applied,
+      "kept": [{"score": round(s, 3), "bullet": b, "details": d} for s, b, d in kept],
+      "dropped": [{"score": round(s, 3), "bullet": b, "details": d} for s, b, d in dropped],
+      "features": rows,
+    })
+  report["roles"] = report_roles
+
+  _, _, cc_items = extract_core_competencies(doc.lines)
+  scored_cc = [(scores[k + i], it) for i, it in enumerate(cc_items)]
+  scored_cc.sort(key=lambda t: t[0], reverse=True)
+  report["core_competencies_reordered"] = [it for _, it in scored_cc]
+
+  return Rescored(new_roles=new_roles, report=report)
+
+
+def score_all(stored_reports: list[StoredReport], cfg: TailorConfig) -> list[list[float]]:
+  """One score_rows call over every bullet + competency of every report."""
+  rows: list[list[int]] = []
+  weights: list[tuple[float, ...]] = []
+  sizes: list[int] = []
+  bw = bullet_weights(cfg)
+  cw = competency_weights(cfg)
+  for st in stored_reports:
+    n = 0
+    for role_rows in st.rows_by_role:
+      rows.extend(role_rows)
+      weights.extend([bw] * len(role_rows))
+      n += len(role_rows)
+    rows.extend(st.cc_rows)
+    weights.extend([cw] * len(st.cc_rows))
+    sizes.append(n + len(st.cc_rows))
+
+  flat = score_rows(rows, weights)
+  out: list[list[float]] = []
+  i = 0
+  for n in sizes:
+    out.append(flat[i:i + n])
+    i += n
+  return out
+
+
+# ----------------------------
+# Output
+# ----------------------------
+
+def _kept_set(report: dict) -> set[str]:
+  return {k["bullet"] for r in report.get("roles", []) for k in r.get("kept", [])}
+
+
+def emit(stored: StoredReport, doc: ResumeDoc, res: Rescored, out_dir: Path | None) -> tuple[Path, Path]:
+  job = stored.report.get("job")
+  if not job:
+    raise ValueError(f"{stored.path}: no job metadata in report; cannot re-emit the resume")
+
+  out_md = render_tailored_markdown(doc, res.new_roles, res.report)
+  frontmatter = render_resume_frontmatter(
+    job_title=job.get("title", ""),
+    company=job.get("company", ""),
+    date_pulled=date.fromisoformat(job["date_pulled"]),
+    source=job.get("source", ""),
+    url=job.get("url", ""),
+    profile=job.get("profile", ""),
+  )
+
+  target_dir = out_dir or stored.path.parent
+  target_dir.mkdir(parents=True, exist_ok=True)
+  report_out = target_dir / stored.path.name
+  resume_out = target_dir / (stored.path.stem.replace("_report_", "_resume_", 1) + ".md")
+  resume_out.write_text(frontmatter + out_md, encoding="utf-8")
+  report_out.write_text(json.dumps(res.report, indent=2), encoding="utf-8")
+  return resume_out, report_out
+
+
+def run_grid(stored_reports: list[StoredReport], doc: ResumeDoc, cfg: TailorConfig, grid: list[tuple[str, dict]]) -> dict:
+  summary: dict = {"sets": [], "jobs": []}
+  per_job: list[dict] = [{"report": str(st.path), "sets": {}} for st in stored_reports]
+
+  for name, overrides in grid:
+    set_cfg = apply_overrides(cfg, overrides)
+    all_scores = score_all(stored_reports, set_cfg)
+
+    kept_total = 0
+    dropped_total = 0
+    kept_score_sum = 0.0
+    changed = 0
+    for st, scores, job_row in zip(stored_reports, all_scores, per_job):
+      res = rescore_stored(st, doc, set_cfg, scores)
+      kept = [k for r in res.report["roles"] for k in r["kept"]]
+      n_dropped = sum(len(r["dropped"]) for r in res.report["roles"])
+      kept_total += len(kept)
+      dropped_total += n_dropped
+      kept_score_sum += sum(k["score"] for k in kept)
+      is_changed = _kept_set(res.report) != _kept_set(st.report)
+      changed += int(is_changed)
+      job_row["sets"][name] = {"kept": len(kept), "dropped": n_dropped, "changed": is_changed}
+
+    summary["sets"].append({
+      "name": name,
+      "overrides": overrides,
+      "jobs": len(stored_reports),
+      "kept_total": kept_total,
+      "dropped_total": dropped_total,
+      "mean_kept_score": round(kept_score_sum / kept_total, 3) if kept_total else 0.0,
+      "jobs_changed": changed,
+    })
+  summary["jobs"] = per_job
+  return summary
+
+
+def print_grid(summary: dict) -> None:
+  print(f"{'set':<20} {'jobs':>5} {'kept':>6} {'dropped':>8} {'mean_kept':>10} {'changed':>8}")
+  for s in summary["sets"]:
+    print(
+      f"{s['name']:<20} {s['jobs']:>5} {s['kept_total']:>6} {s['dropped_total']:>8} "
+      f"{s['mean_kept_score']:>10.3f} {s['jobs_changed']:>8}"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+  args = build_argparser().parse_args(argv)
+
+  base_resume = Path(args.resume)
+  if not base_resume.exists():
+    raise FileNotFoundError(f"Resume not found: {base_resume}")
+
+  cfg = load_run_config(args.config)
+  doc = load_base_resume(base_resume, cfg, cache_dir=resolve_cache_dir(args.no_cache, cfg)).doc
+  stored_reports = [load_stored_report(p, doc) for p in iter_report_paths(args.reports)]
+
+  if args.grid:
+    summary = run_grid(stored_reports, doc, cfg, load_weight_grid(Path(args.grid)))
+    print_grid(summary)
+    if args.grid_out and not args.dry_run:
+      Path(args.grid_out).write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    return 0
+
+  out_dir = Path(args.out_dir) if args.out_dir else None
+  for st, scores in zip(stored_reports, score_all(stored_reports, cfg)):
+    res = rescore_stored(st, doc, cfg, scores)
+    changed = _kept_set(res.report) != _kept_set(st.report)
+    if args.dry_run:
+      print(f"{'changed' if changed else 'same   '} {st.path}")
+      continue
+    resume_out, _ = emit(st, doc, res, out_dir)
+    print(f"{'changed' if changed else 'same   '} {st.path} -> {resume_out}")
+  return 0
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+from dataclasses import dataclass
+from pathlib import Path
+
+from .models import ResumeDoc
+from .resume_parse import parse_professional_experience
+from .tailor_config import TailorConfig
+from .text_utils import tokenizer_mode
+from .scoring import BulletFeatures, featurize_resume
+
+
+# Bump whenever ResumeDoc / BulletFeatures or featurization changes shape.
+CACHE_VERSION = 1
+
+
+@dataclass
+class PreparedResume:
+  doc: ResumeDoc
+  features: dict[str, BulletFeatures]
+
+
+def default_cache_dir(cfg: TailorConfig) -> Path:
+  if cfg.paths_cache_dir:
+    return Path(cfg.paths_cache_dir).expanduser()
+  base = os.environ.get("XDG_CACHE_HOME") or "~/.cache"
+  return Path(base).expanduser() / "tailor_resume"
+
+
+def resume_cache_key(resume_text: str, cfg: TailorConfig) -> str:
+  """
+  Hash of everything the parsed doc + static features depend on.
+
+  Stopwords are deliberately not part of the key: features keep the
+  unfiltered token candidates and stopwords (incl. per-job company words)
+  are applied at scoring time.
+  """
+  parts = {
+    "version": CACHE_VERSION,
+    "resume": resume_text,
+    "tokenizer": tokenizer_mode(cfg),
+    "action_verbs": sorted(cfg.action_verbs),
+    "generic_penalties": sorted(cfg.generic_penalties),
+  }
+  blob = json.dumps(parts, sort_keys=True, ensure_ascii=False).encode("utf-8")
+  return hashlib.sha256(blob).hexdigest()
+
+
+def _load(path: Path) -> PreparedResume | None:
+  try:
+    with path.open("rb") as f:
+      obj = pickle.load(f)
+  except Exception:
+    # missing, truncated or from an incompatible version: rebuild
+    return None
+  return obj if isinstance(obj, PreparedResume) else None
+
+
+def _store(path: Path, prepared: PreparedResume) -> None:
+  path.parent.mkdir(parents=True, exist_ok=True)
+  tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+  with tmp.open("wb") as f:
+    pickle.dump(prepared, f, protocol=pickle.HIGHEST_PROTOCOL)
+  os.replace(tmp, path)
+
+
+def prepare_resume(
+  resume_text: str,
+  cfg: TailorConfig,
+  *,
+  cache_dir: Path | None,
+) -> PreparedResume:
+  """
+  Parse + featurize the (contact-injected) resume, reusing the on-disk
+  cache when the key matches. cache_dir=None disables the cache.
+  """
+  path = None
+  if cache_dir is not None:
+    path = cache_dir / f"resume_{resume_cache_key(resume_text, cfg)}.pkl"
+    cached = _load(path)
+    if cached is not None:
+      return cached
+
+  doc = parse_professional_experience(resume_text)
+  prepared = PreparedResume(doc=doc, features=featurize_resume(doc, cfg))
+
+  if path is not None:
+    try:
+      _store(path, prepared)
+    except OSError:
+      pass  # cache is best-effort
+  return prepared
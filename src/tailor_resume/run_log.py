@@ -1,20 +1,289 @@
-# mechanical move of CSV logging helpers
+# Run log: one row per tailored job in a SQLite store (WAL) next to the CSV
+# log, which is kept as a plain-text mirror and can be re-exported any time.
 
 from __future__ import annotations
 
+import csv
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
 
+# ----------------------------
+# CSV mirror
+# ----------------------------
+
+def _csv_line(header: list[str], row: dict) -> str:
+  values: list[str] = []
+  for h in header:
+    v = str(row.get(h, ""))
+    if any(ch in v for ch in [",", '"', "\n", "\r"]):
+      v = '"' + v.replace('"', '""') + '"'
+    values.append(v)
+  return ",".join(values) + "\n"
+
+
+def _read_header(csv_path: Path) -> list[str]:
+  with csv_path.open("r", encoding="utf-8", newline="") as f:
+    return next(csv.reader(f), [])
+
+
+def _widen_csv(csv_path: Path, header: list[str]) -> None:
+  """Rewrite the log under a wider header (older rows get blanks for the new columns)."""
+  with csv_path.open("r", encoding="utf-8", newline="") as f:
+    rows = list(csv.DictReader(f))
+  tmp = csv_path.with_name(csv_path.name + ".tmp")
+  with tmp.open("w", encoding="utf-8", newline="") as f:
+    f.write(",".join(header) + "\n")
+    for r in rows:
+      f.write(_csv_line(header, r))
+  os.replace(tmp, csv_path)
+
+
 def append_csv_row(csv_path: Path, header: list[str], row: dict) -> None:
+  """
+  Append one row. If the log already exists its column order wins; columns
+  it lacks (e.g. --timings) widen the header once instead of misaligning rows.
+  Not safe against concurrent writers on its own: record_run() calls it
+  while holding the run store's write lock.
+  """
   csv_path.parent.mkdir(parents=True, exist_ok=True)
-  exists = csv_path.exists()
+  exists = csv_path.exists() and csv_path.stat().st_size > 0
+  if exists:
+    existing = _read_header(csv_path)
+    extra = [h for h in header if h not in existing]
+    if extra:
+      _widen_csv(csv_path, existing + extra)
+    header = existing + extra
   with csv_path.open("a", encoding="utf-8", newline="") as f:
     if not exists:
       f.write(",".join(header) + "\n")
-    values: list[str] = []
-    for h in header:
-      v = str(row.get(h, ""))
-      if any(ch in v for ch in [",", '"', "\n", "\r"]):
-        v = '"' + v.replace('"', '""') + '"'
-      values.append(v)
-    f.write(",".join(values) + "\n")
+    f.write(_csv_line(header, row))
+
+
+def write_csv(csv_path: Path, header: list[str], rows) -> int:
+  """Write a whole CSV atomically (temp file + rename); returns the row count."""
+  csv_path.parent.mkdir(parents=True, exist_ok=True)
+  tmp = csv_path.with_name(csv_path.name + ".tmp")
+  n = 0
+  with tmp.open("w", encoding="utf-8", newline="") as f:
+    f.write(",".join(header) + "\n")
+    for r in rows:
+      f.write(_csv_line(header, r))
+      n += 1
+  os.replace(tmp, csv_path)
+  return n
+
+
+# ----------------------------
+# Run store
+# ----------------------------
+
+# Schema migrations, applied in order; PRAGMA user_version = how many ran.
+# Append new ones, never edit old ones. Columns a row brings beyond these
+# (t_<stage>_* from --timings, ...) are added as TEXT columns on first use.
+_MIGRATIONS = (
+  """
+  CREATE TABLE runs (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL DEFAULT '',
+    profile TEXT NOT NULL DEFAULT '',
+    submission_status TEXT NOT NULL DEFAULT '',
+    job_file TEXT NOT NULL DEFAULT '',
+    resume_in TEXT NOT NULL DEFAULT '',
+    resume_out TEXT NOT NULL DEFAULT '',
+    report_out TEXT NOT NULL DEFAULT '',
+    use_nltk TEXT NOT NULL DEFAULT '',
+    per_role_keep TEXT NOT NULL DEFAULT '',
+    min_per_role_keep TEXT NOT NULL DEFAULT '',
+    drop_below_score TEXT NOT NULL DEFAULT '',
+    kept_bullets_total TEXT NOT NULL DEFAULT '',
+    dropped_bullets_total TEXT NOT NULL DEFAULT '',
+    missing_keywords_top10 TEXT NOT NULL DEFAULT ''
+  );
+  -- covers `log stats` grouping (profile, status, day/month) without touching the table
+  CREATE INDEX runs_stats ON runs(profile, submission_status, timestamp, kept_bullets_total, dropped_bullets_total);
+  CREATE INDEX runs_ts ON runs(timestamp);
+  """,
+)
+
+RUN_STORE_SUFFIX = ".sqlite3"
+
+
+def _quote(name: str) -> str:
+  return '"' + name.replace('"', '""') + '"'
+
+
+class RunStore:
+  """
+  SQLite run log in WAL mode: readers never block the writer, and every
+  write is one BEGIN IMMEDIATE transaction, so parallel runs (other
+  processes included) queue on SQLite's lock instead of interleaving.
+  """
+
+  def __init__(self, path: Path, *, legacy_csv: Path | None = None):
+    self.path = path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    self._conn = sqlite3.connect(str(path), timeout=30.0, isolation_level=None, check_same_thread=False)
+    self._conn.row_factory = sqlite3.Row
+    self._lock = threading.Lock()
+    self._conn.execute("PRAGMA journal_mode=WAL")
+    self._conn.execute("PRAGMA synchronous=NORMAL")
+    with self._write():
+      fresh = self._migrate()
+      if fresh and legacy_csv is not None and legacy_csv.exists():
+        # first use next to an existing CSV log: take over its rows
+        with legacy_csv.open("r", encoding="utf-8", newline="") as f:
+          for r in csv.DictReader(f):
+            self._insert({k: v for k, v in r.items() if k})
+    self._columns = self._table_columns()
+
+  def close(self) -> None:
+    self._conn.close()
+
+  def __enter__(self) -> RunStore:
+    return self
+
+  def __exit__(self, *exc) -> None:
+    self.close()
+
+  @contextmanager
+  def _write(self):
+    """One write transaction; BEGIN IMMEDIATE takes SQLite's write lock up front."""
+    with self._lock:
+      self._conn.execute("BEGIN IMMEDIATE")
+      try:
+        yield
+      except BaseException:
+        self._conn.execute("ROLLBACK")
+        raise
+      self._conn.execute("COMMIT")
+
+  def _migrate(self) -> bool:
+    """Apply pending migrations (inside the write lock); True if the store was empty."""
+    version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+    for i, sql in enumerate(_MIGRATIONS[version:], start=version + 1):
+      for stmt in sql.split(";"):
+        if stmt.strip():
+          self._conn.execute(stmt)
+      self._conn.execute(f"PRAGMA user_version = {i}")
+    return version == 0
+
+  def _table_columns(self) -> list[str]:
+    return [r["name"] for r in self._conn.execute("PRAGMA table_info(runs)") if r["name"] != "id"]
+
+  def _insert(self, row: dict) -> None:
+    cols = self._table_columns()
+    for k in row:
+      if k not in cols:
+        self._conn.execute(f"ALTER TABLE runs ADD COLUMN {_quote(k)} TEXT NOT NULL DEFAULT ''")
+        cols.append(k)
+    keys = list(row)
+    self._conn.execute(
+      f"INSERT INTO runs ({', '.join(map(_quote, keys))}) VALUES ({', '.join('?' * len(keys))})",
+      [str(row[k]) for k in keys],
+    )
+    self._columns = cols
+
+  def record(self, row: dict, *, csv_path: Path | None = None) -> None:
+    """Insert one run; with csv_path, append it to the CSV mirror under the same lock."""
+    with self._write():
+      self._insert(row)
+      if csv_path is not None:
+        append_csv_row(csv_path, list(row), row)
+
+  @property
+  def columns(self) -> list[str]:
+    return list(self._columns)
+
+  def count(self) -> int:
+    return self._conn.execute("SELECT count(*) FROM runs").fetchone()[0]
+
+  def rows(self, *, since: str | None = None, profile: str | None = None, last: int | None = None) -> list[dict]:
+    """Runs in insertion order (the last `last` of them, if given)."""
+    sql = ["SELECT * FROM runs WHERE 1"]
+    params: dict[str, object] = {}
+    if since:
+      sql.append("AND timestamp >= :since")
+      params["since"] = since
+    if profile:
+      sql.append("AND profile = :profile")
+      params["profile"] = profile
+    if last:
+      sql = ["SELECT * FROM (", *sql, "ORDER BY id DESC LIMIT :last) ORDER BY id"]
+      params["last"] = last
+    else:
+      sql.append("ORDER BY id")
+    out = []
+    for r in self._conn.execute("\n".join(sql), params):
+      d = dict(r)
+      d.pop("id")
+      out.append(d)
+    return out
+
+  def export_csv(self, csv_path: Path, *, since: str | None = None, profile: str | None = None) -> int:
+    """Rewrite csv_path from the store (column order = schema order); returns the row count."""
+    self._columns = self._table_columns()
+    return write_csv(csv_path, self.columns, self.rows(since=since, profile=profile))
+
+  def stats(self, by: list[str], *, since: str | None = None, profile: str | None = None) -> list[dict]:
+    """
+    Run counts per group. `by` items: profile, status, day, month.
+    Also averages kept/dropped bullets and the first/last run timestamp.
+    """
+    exprs = {
+      "profile": "profile",
+      "status": "submission_status",
+      "day": "substr(timestamp, 1, 10)",
+      "month": "substr(timestamp, 1, 7)",
+    }
+    keys = [f"{exprs[b]} AS {b}" for b in by]
+    sql = [
+      "SELECT", ", ".join([
+        *keys,
+        "count(*) AS runs",
+        "round(avg(CAST(nullif(kept_bullets_total, '') AS REAL)), 1) AS avg_kept",
+        "round(avg(CAST(nullif(dropped_bullets_total, '') AS REAL)), 1) AS avg_dropped",
+        "min(timestamp) AS first",
+        "max(timestamp) AS last",
+      ]),
+      "FROM runs WHERE 1",
+    ]
+    params: dict[str, object] = {}
+    if since:
+      sql.append("AND timestamp >= :since")
+      params["since"] = since
+    if profile:
+      sql.append("AND profile = :profile")
+      params["profile"] = profile
+    if by:
+      sql.append("GROUP BY " + ", ".join(map(str, range(1, len(by) + 1))))
+      sql.append("ORDER BY " + ", ".join(map(str, range(1, len(by) + 1))))
+    return [dict(r) for r in self._conn.execute("\n".join(sql), params)]
+
+
+# one open store per path, shared by every job of a run (batch / capture)
+_OPEN: dict[Path, RunStore] = {}
+_OPEN_LOCK = threading.Lock()
+
+
+def run_store_path(csv_path: Path) -> Path:
+  """logs/resume_runs.csv -> logs/resume_runs.sqlite3"""
+  return csv_path.with_suffix(RUN_STORE_SUFFIX)
+
+
+def open_run_store(csv_path: Path) -> RunStore:
+  path = run_store_path(csv_path)
+  key = path.resolve()
+  with _OPEN_LOCK:
+    store = _OPEN.get(key)
+    if store is None:
+      store = _OPEN[key] = RunStore(path, legacy_csv=csv_path)
+    return store
+
+
+def record_run(csv_path: Path, row: dict) -> None:
+  """Log one run: insert into the run store next to csv_path, then mirror to the CSV."""
+  open_run_store(csv_path).record(row, csv_path=csv_path)
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import importlib.util
+from typing import Sequence
+
+# ----------------------------
+# Optional NumPy (imported lazily, like NLTK in text_utils)
+# ----------------------------
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+# Below this many rows the pure-Python loop beats NumPy's call overhead.
+NUMPY_MIN_ROWS = 64
+
+_NP = None
+
+
+def _numpy():
+  global _NP
+  if _NP is None:
+    try:
+      import numpy
+      _NP = numpy
+    except Exception:
+      _NP = False
+  return _NP or None
+
+
+def weighted_sum(row: Sequence[float], weights: Sequence[float]) -> float:
+  score = 0.0
+  for x, w in zip(row, weights):
+    score += w * x
+  return score
+
+
+def score_rows(rows: Sequence[Sequence[float]], weights: Sequence[Sequence[float]]) -> list[float]:
+  """
+  Score an items x features matrix against per-row weight vectors.
+
+  Columns are accumulated left to right (acc += W[:, j] * M[:, j]), not
+  with a BLAS dot, so every score is bit-identical to weighted_sum() and
+  to the old scalar `score += w * x` chain.
+  """
+  if not rows:
+    return []
+
+  np = _numpy() if (NUMPY_AVAILABLE and len(rows) >= NUMPY_MIN_ROWS) else None
+  if np is None:
+    return [weighted_sum(r, w) for r, w in zip(rows, weights)]
+
+  m = np.asarray(rows, dtype=np.float64)
+  wm = np.asarray(weights, dtype=np.float64)
+  acc = np.zeros(m.shape[0], dtype=np.float64)
+  for j in range(m.shape[1]):
+    acc += wm[:, j] * m[:, j]
+  return acc.tolist()
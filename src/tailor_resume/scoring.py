@@ -1,66 +1,151 @@
 from __future__ import annotations
 
-from typing import Iterable
+from dataclasses import dataclass
+from typing import Iterable, Sequence
 
 from .tailor_config import TailorConfig
+from .models import ResumeDoc
+from .job_profile import JobProfile
+from .phrase_matcher import PhraseMatcher, config_matcher
+from .score_matrix import weighted_sum, score_rows
 from .text_utils import (
   normalize_text,
   phrase_hits,
   starts_with_action_verb,
-  is_generic,
-  tok_fn,
+  token_candidates,
+  token_candidates_batch,
+  filter_tokens,
   metric_regex,
 )
 
 
-def score_bullet(
+@dataclass(frozen=True)
+class BulletFeatures:
+  """Job-independent features of a bullet or competency item (safe to cache)."""
+  norm: str
+  token_candidates: tuple[tuple[str, str], ...]
+  metric: int
+  action: int
+  generic: int
+  length_pen: int
+
+
+def featurize_bullet(
   bullet: str,
-  job_text: str,
   cfg: TailorConfig,
-  job_terms_auto: list[str],
-) -> tuple[float, dict]:
+  matcher: PhraseMatcher | None = None,
+  candidates: Iterable[tuple[str, str]] | None = None,
+) -> BulletFeatures:
   b = bullet.strip()
   b_norm = normalize_text(b)
+  m = matcher or config_matcher(cfg)
+  if candidates is None:
+    candidates = token_candidates(b, cfg)
+  return BulletFeatures(
+    norm=b_norm,
+    token_candidates=tuple(candidates),
+    metric=1 if metric_regex().search(b) else 0,
+    action=1 if starts_with_action_verb(b, cfg.action_verbs) else 0,
+    generic=1 if m.counts(b_norm)["generic"] > 0 else 0,
+    length_pen=1 if len(b) > 240 else 0,
+  )
+
+
+def featurize_resume(doc: ResumeDoc, cfg: TailorConfig) -> dict[str, BulletFeatures]:
+  """Features for every role bullet and CORE_COMPETENCIES item, keyed by line."""
+  lines: list[str] = [b for role in doc.roles for b in role.bullet_lines]
+  _, _, cc_items = extract_core_competencies(doc.lines)
+  lines.extend(cc_items)
+  unique = list(dict.fromkeys(lines))
+
+  # one tokenizer/tagger pass over every bullet + competency (pos_tag_sents in NLTK mode)
+  candidates = token_candidates_batch([ln.strip() for ln in unique], cfg)
 
-  tf = tok_fn(cfg)
-  b_toks = set(tf(b, cfg.stopwords))
-  j_toks = set(tf(job_text, cfg.stopwords))
-  overlap = len(b_toks & j_toks)
-
-  required_hits = phrase_hits(b, cfg.required_terms)
-  nice_hits = phrase_hits(b, cfg.nice_to_have_terms)
-  domain_hits = phrase_hits(b, cfg.domain_terms)
-
-  auto_hits = sum(1 for term in job_terms_auto if term in b_norm)
-
-  metric = 1 if metric_regex().search(b) else 0
-  action = 1 if starts_with_action_verb(b, cfg.action_verbs) else 0
-  generic = 1 if is_generic(b, cfg.generic_penalties) else 0
-  length_pen = 1 if len(b) > 240 else 0
-
-  score = 0.0
-  score += cfg.w_overlap * overlap
-  score += cfg.w_required * required_hits
-  score += cfg.w_nice * nice_hits
-  score += cfg.w_domain * domain_hits
-  score += (cfg.w_overlap * 0.6) * auto_hits
-  score += cfg.w_metric * metric
-  score += cfg.w_action_verb * action
-  score -= cfg.w_generic_penalty * generic
-  score -= cfg.w_length_penalty * length_pen
-
-  details = {
-    "overlap": overlap,
-    "required_hits": required_hits,
-    "nice_hits": nice_hits,
-    "domain_hits": domain_hits,
-    "auto_hits": auto_hits,
-    "metric": metric,
-    "action_verb": action,
-    "generic_penalty": generic,
-    "length_penalty": length_pen,
-  }
-  return score, details
+  matcher = config_matcher(cfg)
+  return {ln: featurize_bullet(ln, cfg, matcher, cands) for ln, cands in zip(unique, candidates)}
+
+
+# ----------------------------
+# Feature rows + weights (items x features matrix, see score_matrix)
+# ----------------------------
+
+# Column order is also the accumulation order of the score.
+FEATURE_NAMES: tuple[str, ...] = (
+  "overlap",
+  "required_hits",
+  "nice_hits",
+  "domain_hits",
+  "auto_hits",
+  "metric",
+  "action_verb",
+  "generic_penalty",
+  "length_penalty",
+)
+
+
+def feature_row(f: BulletFeatures, job: JobProfile, cfg: TailorConfig) -> tuple[int, ...]:
+  # company stopwords vary per job, so filtering happens here, not in the cache
+  b_toks = set(filter_tokens(f.token_candidates, cfg, cfg.stopwords))
+  overlap = len(b_toks & job.tokens)
+
+  required_hits, nice_hits, domain_hits = job.term_hits(f.norm)
+  auto_hits = job.auto_hits(f.norm)
+
+  return (
+    overlap,
+    required_hits,
+    nice_hits,
+    domain_hits,
+    auto_hits,
+    f.metric,
+    f.action,
+    f.generic,
+    f.length_pen,
+  )
+
+
+def bullet_weights(cfg: TailorConfig) -> tuple[float, ...]:
+  return (
+    cfg.w_overlap,
+    cfg.w_required,
+    cfg.w_nice,
+    cfg.w_domain,
+    cfg.w_overlap * 0.6,
+    cfg.w_metric,
+    cfg.w_action_verb,
+    -cfg.w_generic_penalty,
+    -cfg.w_length_penalty,
+  )
+
+
+def competency_weights(cfg: TailorConfig) -> tuple[float, ...]:
+  # competencies are ranked on relevance only: no metric/verb/penalty terms
+  return (
+    cfg.w_overlap,
+    cfg.w_required,
+    cfg.w_nice,
+    cfg.w_domain,
+    cfg.w_overlap * 0.5,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+  )
+
+
+def details_from_row(row: Sequence[int]) -> dict:
+  return {name: int(v) for name, v in zip(FEATURE_NAMES, row)}
+
+
+def score_bullet(
+  bullet: str,
+  job: JobProfile,
+  cfg: TailorConfig,
+  feats: BulletFeatures | None = None,
+) -> tuple[float, dict]:
+  f = feats or featurize_bullet(bullet, cfg, job.matcher)
+  row = feature_row(f, job, cfg)
+  return weighted_sum(row, bullet_weights(cfg)), details_from_row(row)
 
 
 def resume_mentions_any(text: str, phrases: Iterable[str]) -> bool:
@@ -112,22 +197,49 @@ def extract_core_competencies(lines: list[str]) -> tuple[int | None, int | None,
   return start, end, items
 
 
-def score_competency(item: str, job_text: str, cfg: TailorConfig, job_terms_auto: list[str]) -> float:
-  tf = tok_fn(cfg)
-  overlap = len(set(tf(item, cfg.stopwords)) & set(tf(job_text, cfg.stopwords)))
-  required_hits = phrase_hits(item, cfg.required_terms)
-  nice_hits = phrase_hits(item, cfg.nice_to_have_terms)
-  domain_hits = phrase_hits(item, cfg.domain_terms)
-  t_norm = normalize_text(item)
-  auto_hits = sum(1 for term in job_terms_auto if term in t_norm)
-
-  score = 0.0
-  score += cfg.w_overlap * overlap
-  score += cfg.w_required * required_hits
-  score += cfg.w_nice * nice_hits
-  score += cfg.w_domain * domain_hits
-  score += (cfg.w_overlap * 0.5) * auto_hits
-  return score
+def score_competency(
+  item: str,
+  job: JobProfile,
+  cfg: TailorConfig,
+  feats: BulletFeatures | None = None,
+) -> float:
+  f = feats or featurize_bullet(item, cfg, job.matcher)
+  return weighted_sum(feature_row(f, job, cfg), competency_weights(cfg))
+
+
+def score_resume(
+  doc: ResumeDoc,
+  job: JobProfile,
+  cfg: TailorConfig,
+  features: dict[str, BulletFeatures],
+) -> tuple[list[list[tuple[float, str, dict]]], list[tuple[float, str, dict]]]:
+  """
+  Score every role bullet and CORE_COMPETENCIES item in one matrix op.
+
+  Returns (per-role [(score, bullet, details)], [(score, competency, details)]),
+  both in document order; details dicts are derived from the matrix rows.
+  """
+  _, _, cc_items = extract_core_competencies(doc.lines)
+  bullets = [b for role in doc.roles for b in role.bullet_lines]
+
+  rows: list[tuple[int, ...]] = []
+  for text in bullets + cc_items:
+    f = features.get(text) or featurize_bullet(text, cfg, job.matcher)
+    rows.append(feature_row(f, job, cfg))
+
+  weights = [bullet_weights(cfg)] * len(bullets) + [competency_weights(cfg)] * len(cc_items)
+  scores = score_rows(rows, weights)
+
+  per_role: list[list[tuple[float, str, dict]]] = []
+  i = 0
+  for role in doc.roles:
+    n = len(role.bullet_lines)
+    per_role.append([(scores[k], bullets[k], details_from_row(rows[k])) for k in range(i, i + n)])
+    i += n
+
+  nb = len(bullets)
+  scored_cc = [(scores[nb + k], it, details_from_row(rows[nb + k])) for k, it in enumerate(cc_items)]
+  return per_role, scored_cc
 
 
 def apply_reordered_core_competencies(lines: list[str], reordered: list[str]) -> list[str]:
@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import bisect
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .batch import JobInput, JobOutcome, init_worker, tailor_job
+from .resume_frontmatter import render_resume_frontmatter
+from .pipeline import load_run_config, load_base_resume, resolve_cache_dir, job_metadata
+
+
+MAX_BODY_BYTES = 2 * 1024 * 1024
+MAX_HEADER_LINES = 100
+
+# upper bounds (ms) of the latency histogram buckets; the last bucket is +Inf
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+REASONS = {
+  200: "OK",
+  204: "No Content",
+  400: "Bad Request",
+  404: "Not Found",
+  405: "Method Not Allowed",
+  413: "Payload Too Large",
+  422: "Unprocessable Entity",
+  500: "Internal Server Error",
+  503: "Service Unavailable",
+}
+
+
+def build_argparser() -> argparse.ArgumentParser:
+  ap = argparse.ArgumentParser(
+    prog="tailor_resume serve",
+    description="Local HTTP API: POST job text, get the tailored resume markdown + report back.",
+  )
+  ap.add_argument("--resume", required=True, help="Path to resume_base.md")
+  ap.add_argument("--config", default=None, help="Optional TOML config")
+  ap.add_argument("--use-nltk", action="store_true", help="Enable NLTK if installed")
+  ap.add_argument("--no-cache", action="store_true", help="Re-parse and re-featurize the base resume (skip the on-disk cache)")
+
+  ap.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1, local only)")
+  ap.add_argument("--port", type=int, default=8765)
+  ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes for tailoring (default: CPU count)")
+  ap.add_argument(
+    "--queue-size",
+    type=int,
+    default=32,
+    help="Requests allowed to wait for a worker; beyond that POST /tailor gets 503 + Retry-After (default: 32)",
+  )
+  ap.add_argument(
+    "--max-jobs-per-worker",
+    type=int,
+    default=0,
+    help="Recycle a worker process after this many jobs to bound NLTK memory growth (0 = never)",
+  )
+  ap.add_argument("--allow-origin", default="", help="Value for Access-Control-Allow-Origin (e.g. a browser extension origin)")
+  return ap
+
+
+# ----------------------------
+# Metrics
+# ----------------------------
+
+@dataclass
+class LatencyHistogram:
+  bounds_ms: tuple[int, ...] = LATENCY_BUCKETS_MS
+  counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+  total: int = 0
+  sum_ms: float = 0.0
+
+  def observe(self, ms: float) -> None:
+    self.counts[bisect.bisect_left(self.bounds_ms, ms)] += 1
+    self.total += 1
+    self.sum_ms += ms
+
+  def quantile(self, q: float) -> float | None:
+    """Upper bound of the bucket holding the q-quantile (None past the last bound)."""
+    if not self.total:
+      return None
+    rank = q * self.total
+    seen = 0
+    for i, c in enumerate(self.counts):
+      seen += c
+      if seen >= rank:
+        return float(self.bounds_ms[i]) if i < len(self.bounds_ms) else None
+    return None
+
+  def as_dict(self) -> dict:
+    buckets = [{"le_ms": b, "count": c} for b, c in zip(self.bounds_ms, self.counts)]
+    buckets.append({"le_ms": "+Inf", "count": self.counts[-1]})
+    return {
+      "count": self.total,
+      "mean_ms": round(self.sum_ms / self.total, 3) if self.total else None,
+      "p50_ms_le": self.quantile(0.50),
+      "p90_ms_le": self.quantile(0.90),
+      "p99_ms_le": self.quantile(0.99),
+      "buckets": buckets,
+    }
+
+
+@dataclass
+class ServerStats:
+  started: float = field(default_factory=time.monotonic)
+  in_flight: int = 0   # admitted (running or waiting for a worker)
+  running: int = 0
+  ok: int = 0
+  failed: int = 0
+  rejected: int = 0
+  latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+
+# ----------------------------
+# HTTP plumbing (just enough HTTP/1.1 for JSON requests, with keep-alive)
+# ----------------------------
+
+class HttpError(Exception):
+  def __init__(self, status: int, message: str, headers: dict[str, str] | None = None):
+    super().__init__(message)
+    self.status = status
+    self.message = message
+    self.headers = headers or {}
+
+
+@dataclass
+class Request:
+  method: str
+  path: str
+  headers: dict[str, str]
+  body: bytes
+  keep_alive: bool
+
+
+async def read_request(reader: asyncio.StreamReader) -> Request | None:
+  line = await reader.readline()
+  if not line:
+    return None
+  try:
+    method, target, version = line.decode("latin-1").split()
+  except ValueError:
+    raise HttpError(400, "malformed request line")
+
+  headers: dict[str, str] = {}
+  for _ in range(MAX_HEADER_LINES):
+    h = await reader.readline()
+    if h in (b"\r\n", b"\n", b""):
+      break
+    name, _, value = h.decode("latin-1").partition(":")
+    headers[name.strip().lower()] = value.strip()
+  else:
+    raise HttpError(400, "too many headers")
+
+  try:
+    length = int(headers.get("content-length") or 0)
+  except ValueError:
+    raise HttpError(400, "Content-Length must be a number")
+  if length < 0:
+    raise HttpError(400, "Content-Length must not be negative")
+  if length > MAX_BODY_BYTES:
+    raise HttpError(413, f"body larger than {MAX_BODY_BYTES} bytes")
+  body = await reader.readexactly(length) if length else b""
+
+  conn = headers.get("connection", "").lower()
+  keep_alive = conn != "close" if version == "HTTP/1.1" else conn == "keep-alive"
+  return Request(method=method.upper(), path=target.split("?", 1)[0], headers=headers, body=body, keep_alive=keep_alive)
+
+
+def encode_response(status: int, payload: dict | None, *, keep_alive: bool, headers: dict[str, str]) -> bytes:
+  body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+  lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+  hdrs = {"Content-Type": "application/json", "Content-Length": str(len(body))}
+  hdrs["Connection"] = "keep-alive" if keep_alive else "close"
+  hdrs.update(headers)
+  lines += [f"{k}: {v}" for k, v in hdrs.items()]
+  return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+# ----------------------------
+# App
+# ----------------------------
+
+class TailorServer:
+  def __init__(self, *, pool: ProcessPoolExecutor, workers: int, queue_size: int, allow_origin: str = ""):
+    self.pool = pool
+    self.workers = workers
+    self.capacity = workers + queue_size
+    self.slots = asyncio.Semaphore(workers)
+    self.allow_origin = allow_origin
+    self.stats = ServerStats()
+
+  def _cors(self) -> dict[str, str]:
+    if not self.allow_origin:
+      return {}
+    return {
+      "Access-Control-Allow-Origin": self.allow_origin,
+      "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+      "Access-Control-Allow-Headers": "Content-Type",
+    }
+
+  async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+      while True:
+        keep_alive = False
+        extra: dict[str, str] = {}
+        try:
+          req = await read_request(reader)
+          if req is None:
+            break
+          keep_alive = req.keep_alive
+          status, payload = await self.dispatch(req)
+        except HttpError as e:
+          status, payload, extra = e.status, {"error": e.message}, e.headers
+        except (asyncio.IncompleteReadError, ConnectionError):
+          break
+        except Exception as e:  # e.g. BrokenProcessPool or a worker bug: answer instead of dropping the client
+          self.stats.failed += 1
+          status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+        writer.write(encode_response(status, payload, keep_alive=keep_alive, headers={**self._cors(), **extra}))
+        await writer.drain()
+        if not keep_alive:
+          break
+    finally:
+      writer.close()
+      try:
+        await writer.wait_closed()
+      except ConnectionError:
+        pass
+
+  async def dispatch(self, req: Request) -> tuple[int, dict | None]:
+    if req.method == "OPTIONS":
+      return 204, None
+    if req.path == "/health":
+      if req.method != "GET":
+        raise HttpError(405, "use GET")
+      return 200, self.health()
+    if req.path == "/metrics/latency":
+      if req.method != "GET":
+        raise HttpError(405, "use GET")
+      return 200, self.stats.latency.as_dict()
+    if req.path == "/tailor":
+      if req.method != "POST":
+        raise HttpError(405, "use POST")
+      return await self.tailor(req)
+    raise HttpError(404, f"no route for {req.path}")
+
+  def health(self) -> dict:
+    st = self.stats
+    return {
+      "status": "ok",
+      "uptime_s": round(time.monotonic() - st.started, 1),
+      "workers": self.workers,
+      "running": st.running,
+      "queued": st.in_flight - st.running,
+      "capacity": self.capacity,
+      "ok": st.ok,
+      "failed": st.failed,
+      "rejected": st.rejected,
+    }
+
+  async def tailor(self, req: Request) -> tuple[int, dict]:
+    try:
+      data = json.loads(req.body or b"{}")
+    except ValueError:
+      raise HttpError(400, "body must be JSON")
+    if not isinstance(data, dict):
+      raise HttpError(400, "body must be a JSON object")
+    job_text = data.get("job_text")
+    if not isinstance(job_text, str) or not job_text.strip():
+      raise HttpError(400, "job_text (string) is required")
+    url = str(data.get("url") or "").strip()
+    profile = str(data.get("profile") or "base")
+
+    # backpressure: refuse instead of queueing without bound
+    st = self.stats
+    if st.in_flight >= self.capacity:
+      st.rejected += 1
+      raise HttpError(503, "server busy, retry later", {"Retry-After": "1"})
+
+    st.in_flight += 1
+    t0 = time.perf_counter()
+    try:
+      async with self.slots:
+        st.running += 1
+        try:
+          loop = asyncio.get_running_loop()
+          outcome: JobOutcome = await loop.run_in_executor(
+            self.pool, tailor_job, JobInput(source="http", url=url, text=job_text, capture_method="http")
+          )
+        finally:
+          st.running -= 1
+    finally:
+      st.in_flight -= 1
+      st.latency.observe((time.perf_counter() - t0) * 1000)
+
+    if outcome.error or outcome.post is None:
+      st.failed += 1
+      raise HttpError(422, outcome.error or "tailoring failed")
+
+    st.ok += 1
+    post = outcome.post
+    frontmatter = render_resume_frontmatter(
+      job_title=post.title,
+      company=post.company,
+      date_pulled=post.date_pulled,
+      source=post.source,
+      url=post.url,
+      profile=profile,
+    )
+    report = outcome.report or {}
+    report["job"] = job_metadata(post, jobpost_path=None, profile=profile)
+    return 200, {"markdown": frontmatter + outcome.markdown, "report": report}
+
+
+async def serve(args, cfg, resume) -> None:
+  pool_kwargs: dict = {}
+  if args.max_jobs_per_worker > 0:
+    pool_kwargs["max_tasks_per_child"] = args.max_jobs_per_worker  # py3.11+
+
+  # Workers start lazily, from inside the event loop: a forked worker would
+  # inherit the listening socket and open client connections. forkserver
+  # (spawn where unavailable) starts them from a clean process instead.
+  methods = multiprocessing.get_all_start_methods()
+  ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+  workers = max(1, args.workers)
+  with ProcessPoolExecutor(
+    max_workers=workers, mp_context=ctx, initializer=init_worker, initargs=(cfg, resume), **pool_kwargs
+  ) as pool:
+    app = TailorServer(pool=pool, workers=workers, queue_size=max(0, args.queue_size), allow_origin=args.allow_origin)
+    server = await asyncio.start_server(app.handle_connection, args.host, args.port)
+    addrs = ", ".join(f"{s.getsockname()[0]}:{s.getsockname()[1]}" for s in server.sockets)
+    print(f"Serving on http://{addrs} ({workers} workers, queue {args.queue_size})", flush=True)
+    async with server:
+      await server.serve_forever()
+
+
+def main(argv: list[str] | None = None) -> int:
+  args = build_argparser().parse_args(argv)
+
+  base_resume = Path(args.resume)
+  if not base_resume.exists():
+    raise FileNotFoundError(f"Resume not found: {base_resume}")
+
+  # warm state, shipped to each worker once via the pool initializer
+  cfg = load_run_config(args.config, use_nltk=args.use_nltk)
+  resume = load_base_resume(base_resume, cfg, cache_dir=resolve_cache_dir(args.no_cache, cfg))
+
+  try:
+    asyncio.run(serve(args, cfg, resume))
+  except KeyboardInterrupt:
+    pass
+  return 0
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import copy
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .resume_cache import PreparedResume
+from .jobpost.types import JobPost
+from .jobpost.flow import company_stopwords
+from .phrase_matcher import config_matcher
+from .tailor_config import TailorConfig
+from .text_utils import LayeredStopwords, warm_nltk
+from .pipeline import load_run_config, load_base_resume, tailor_resume_markdown, resolve_cache_dir
+
+
+def job_config(cfg: TailorConfig, extra_stopwords: Iterable[str]) -> TailorConfig:
+  """
+  Per-job view of cfg: a shallow copy whose stopwords layer extra_stopwords
+  over cfg's set. cfg itself (and its stopword set) is left untouched.
+  """
+  job_cfg = copy.copy(cfg)
+  job_cfg.stopwords = LayeredStopwords(cfg.stopwords, extra_stopwords)
+  return job_cfg
+
+
+@dataclass(frozen=True)
+class TailoredJob:
+  post: JobPost
+  markdown: str
+  report: dict
+
+
+class TailorSession:
+  """
+  Library entry point: config + prepared base resume loaded once, then any
+  number of jobs tailored against them, from any number of threads.
+
+  The session keeps a private copy of the config with the stopwords frozen
+  and the term matcher compiled, and never writes to it (or to the resume)
+  afterwards; per-job state such as company stopwords lives in a layered
+  per-job view (job_config).
+  """
+
+  def __init__(self, cfg: TailorConfig, resume: PreparedResume):
+    cfg = copy.deepcopy(cfg)
+    cfg.stopwords = frozenset(cfg.stopwords)
+    config_matcher(cfg)  # compile now; config_matcher() never rebuilds it later
+    self._cfg = cfg
+    self._resume = resume
+    if cfg.use_nltk:
+      warm_nltk()
+
+  @classmethod
+  def open(
+    cls,
+    resume_path: str | Path,
+    *,
+    config_path: str | None = None,
+    use_nltk: bool = False,
+    no_cache: bool = False,
+    out_dir: str | None = None,
+  ) -> TailorSession:
+    cfg = load_run_config(config_path, use_nltk=use_nltk, out_dir=out_dir)
+    resume = load_base_resume(Path(resume_path), cfg, cache_dir=resolve_cache_dir(no_cache, cfg))
+    return cls(cfg, resume)
+
+  @property
+  def cfg(self) -> TailorConfig:
+    """The session config (read-only; use job_config() for per-job changes)."""
+    return self._cfg
+
+  @property
+  def resume(self) -> PreparedResume:
+    return self._resume
+
+  def tailor_job(self, post: JobPost) -> TailoredJob:
+    """Tailor the resume to one job post (raises RuntimeError on validation failures)."""
+    cfg = job_config(self._cfg, company_stopwords(post.company))
+    md, report = tailor_resume_markdown(self._resume.doc, post.description, cfg, self._resume.features)
+    return TailoredJob(post=post, markdown=md, report=report)
+
+  def iter_tailor(self, posts: Iterable[JobPost], *, threads: int = 1) -> Iterator[TailoredJob]:
+    """Tailor many posts, yielding in input order (threads > 1: a thread pool)."""
+    if threads <= 1:
+      for post in posts:
+        yield self.tailor_job(post)
+      return
+
+    # bounded window, as in batch.iter_outcomes
+    window = threads * 4
+    with ThreadPoolExecutor(max_workers=threads) as ex:
+      pending: deque = deque()
+      try:
+        for post in posts:
+          pending.append(ex.submit(self.tailor_job, post))
+          if len(pending) >= window:
+            yield pending.popleft().result()
+        while pending:
+          yield pending.popleft().result()
+      finally:
+        for fut in pending:
+          fut.cancel()
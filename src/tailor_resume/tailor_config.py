@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
 
 # ----------------------------
 # TOML loading (py3.11+ tomllib, fallback to tomli if installed)
@@ -69,8 +70,15 @@ class TailorConfig:
   contact_location: str = ""
   contact_phone: str = ""
 
+  # cache for parsed + featurized base resumes ("" = ~/.cache/tailor_resume)
+  paths_cache_dir: str = ""
+
   # extraction
   max_auto_terms: int = 25
+  # "frequency" (count in the posting) or "tfidf" (count x IDF over the job store)
+  auto_term_ranking: str = "frequency"
+  # job store whose document frequencies "tfidf" uses ("" = <out_root>/jobs.sqlite3)
+  paths_idf_store: str = ""
   ##below line replaced when went to yaml file for stopwords
   #stopwords: set[str] = field(default_factory=lambda: set(DEFAULT_STOPWORDS))
   stopwords: set[str] = field(default_factory=set)
@@ -88,6 +96,12 @@ class TailorConfig:
     },
   ])
 
+  # compiled phrase matcher over the term lists (see phrase_matcher.config_matcher)
+  term_matcher: Any = field(default=None, repr=False, compare=False)
+
+  # corpus IDF for auto terms (jobpost.store.CorpusIDF), bound per run by pipeline.bind_term_idf
+  term_idf: Any = field(default=None, repr=False, compare=False)
+
   
 
 
@@ -137,6 +151,9 @@ def load_config(path: Path | None) -> TailorConfig:
   cfg.nice_to_have_terms = list(terms.get("nice_to_have", cfg.nice_to_have_terms))
   cfg.domain_terms = list(terms.get("domain", cfg.domain_terms))
   cfg.max_auto_terms = int(terms.get("max_auto_terms", cfg.max_auto_terms))
+  cfg.auto_term_ranking = str(terms.get("ranking", cfg.auto_term_ranking))
+  if cfg.auto_term_ranking not in ("frequency", "tfidf"):
+    raise ValueError(f"terms.ranking must be 'frequency' or 'tfidf', not {cfg.auto_term_ranking!r}")
 
   # optional keyword sources (still supported, even if you now prefer stopwords.yaml)
   if "stopwords" in data:
@@ -173,6 +190,14 @@ def load_config(path: Path | None) -> TailorConfig:
       cfg.paths_out_root = str(paths.get("out_root") or cfg.paths_out_root)
     if "csv_log" in paths:
       cfg.paths_csv_log = str(paths.get("csv_log") or cfg.paths_csv_log)
+    if "cache_dir" in paths:
+      cfg.paths_cache_dir = str(paths.get("cache_dir") or "")
+    if "idf_store" in paths:
+      cfg.paths_idf_store = str(paths.get("idf_store") or "")
+
+  # compile term lists once, at load time
+  from .phrase_matcher import compile_config_matcher
+  cfg.term_matcher = compile_config_matcher(cfg)
 
   return cfg
 
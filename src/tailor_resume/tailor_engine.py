@@ -1,68 +1,199 @@
 from __future__ import annotations
 
+from collections import Counter
+from typing import Sequence
+
 from .tailor_config import TailorConfig
 from .models import ResumeDoc, Role
-from .job_terms import top_terms_from_job
+from .job_profile import build_job_profile
+from .phrase_matcher import PhraseMatcher, config_matcher
+from .guardrails import Guardrail, RoleIndex
 from .text_utils import normalize_text
+from .timings import stage
 from .scoring import (
-  score_bullet,
-  job_mentions_any,
-  pick_best_matching_bullet,
-  extract_core_competencies,
-  score_competency,
+  BulletFeatures,
+  featurize_resume,
+  score_resume,
+  FEATURE_NAMES,
 )
 
 
+# candidates x text chars above which one Aho-Corasick pass beats per-keyword
+# C-level `in` / str.count (the automaton build dominates below it)
+MISSING_KEYWORDS_MATCHER_MIN_WORK = 50_000_000
+
+
 def missing_keywords(
   resume_text: str,
   job_text: str,
   cfg: TailorConfig,
   job_terms_auto: list[str],
+  job_norm: str | None = None,
 ) -> list[dict]:
   resume_norm = normalize_text(resume_text)
 
   seen: set[str] = set()
   candidates: list[tuple[str, str]] = []
 
-  def add_many(items, source: str) -> None:
+  def add_many(items, source: str, *, normalized: bool = False) -> None:
     for it in items:
-      k = normalize_text(it).strip()
+      k = it if normalized else normalize_text(it).strip()
       if not k or k in seen:
         continue
       seen.add(k)
       candidates.append((k, source))
 
-  add_many(cfg.required_terms, "required")
-  add_many(cfg.domain_terms, "domain")
-  add_many(cfg.nice_to_have_terms, "nice_to_have")
+  # config terms come pre-normalized from the compiled config matcher
+  terms = config_matcher(cfg).phrases
+  add_many(terms["required"], "required", normalized=True)
+  add_many(terms["domain"], "domain", normalized=True)
+  add_many(terms["nice_to_have"], "nice_to_have", normalized=True)
   add_many(job_terms_auto, "auto")
 
-  missing: list[tuple[str, str]] = []
-  for k, src in candidates:
-    if k not in resume_norm:
-      missing.append((k, src))
+  if job_norm is None:
+    job_norm = normalize_text(job_text)
+
+  # every job count is taken once; ranking and output share it
+  missing: list[tuple[str, str, int]] = []
+  if len(candidates) * (len(resume_norm) + len(job_norm)) >= MISSING_KEYWORDS_MATCHER_MIN_WORK:
+    # one automaton over all candidates: presence in the resume, occurrence counts in the job
+    matcher = PhraseMatcher({"candidates": [k for k, _ in candidates]})
+    in_resume = matcher.scan(resume_norm)
+    job_counts = matcher.occurrences(job_norm)
+    for k, src in candidates:
+      pid = matcher.pattern_ids[k]
+      if pid not in in_resume:
+        missing.append((k, src, job_counts[pid]))
+  else:
+    for k, src in candidates:
+      if k not in resume_norm:
+        missing.append((k, src, job_norm.count(k)))
+
+  ranked = sorted(missing, key=lambda m: (m[2], len(m[0])), reverse=True)
+  return [{"keyword": k, "source": src, "job_count": n} for k, src, n in ranked]
+
+
+Scored = tuple[float, str, dict]
+
+
+def select_role_bullets(
+  scored: list[Scored],
+  cfg: TailorConfig,
+  guardrails: Sequence[Guardrail],
+) -> tuple[list[Scored], list[Scored], list[dict]]:
+  """
+  Keep/drop one role's scored bullets: score threshold, min keep,
+  guardrail promotion, then per_role_keep. Shared by tailor() and rescore.
+  Returns (kept, dropped, guardrails_applied).
+
+  Bullets are tracked by position in score order; guardrail matching goes
+  through a per-role phrase index, so promotion is set/index work rather
+  than rescans of kept and dropped.
+  """
+  items = sorted(scored, key=lambda t: t[0], reverse=True)
+
+  kept: list[int] = []
+  dropped: list[int] = []
+  for i, (s, _, _) in enumerate(items):
+    if s < cfg.drop_below_score:
+      dropped.append(i)
+    else:
+      kept.append(i)
+
+  if len(kept) < cfg.min_per_role_keep:
+    need = cfg.min_per_role_keep - len(kept)
+    kept.extend(dropped[:need])
+    dropped = dropped[need:]
+
+  guardrail_applied: list[dict] = []
+  if guardrails:
+    index = RoleIndex([b for _, b, _ in items])
+    dropped_set = set(dropped)
+    kept_times = Counter(kept)
+    kept_texts = {items[i][1] for i in kept}
+    by_text: dict[str, list[int]] | None = None
+
+    for gr in guardrails:
+      matches = index.keep_matches(gr)
+      match_set = set(matches)
+      if len(match_set) < len(kept_times):
+        kept_match_count = sum(kept_times[i] for i in match_set if i in kept_times)
+      else:
+        kept_match_count = sum(n for i, n in kept_times.items() if i in match_set)
+      if kept_match_count >= gr.min_keep:
+        continue
+
+      promoted = None
+      # best dropped bullet = first (highest scored) dropped position matching
+      best = next((i for i in index.pick_matches(gr) if i in dropped_set), None)
+      if best is not None:
+        b_best = items[best][1]
+        if by_text is None:
+          by_text = {}
+          for i, (_, b, _) in enumerate(items):
+            by_text.setdefault(b, []).append(i)
+        dropped_set.difference_update(by_text[b_best])
+        kept.append(best)
+        kept_times[best] += 1
+        kept_texts.add(b_best)
+        promoted = b_best
+        if best in match_set:
+          kept_match_count += 1
+
+      if kept_match_count < gr.min_keep:
+        for i in matches:
+          b = items[i][1]
+          if b in kept_texts:
+            continue
+          kept.append(i)
+          kept_times[i] += 1
+          kept_texts.add(b)
+          promoted = promoted or b
+          kept_match_count += 1
+          if kept_match_count >= gr.min_keep:
+            break
+
+      if promoted:
+        guardrail_applied.append({"name": gr.name, "promoted_bullet": promoted})
+
+    dropped = sorted(dropped_set)
 
-  job_norm = normalize_text(job_text)
-  ranked = sorted(missing, key=lambda ks: (job_norm.count(ks[0]), len(ks[0])), reverse=True)
-  return [{"keyword": k, "source": src, "job_count": job_norm.count(k)} for k, src in ranked]
+  kept_items = sorted((items[i] for i in kept), key=lambda t: t[0], reverse=True)
+  return kept_items[:cfg.per_role_keep], [items[i] for i in dropped], guardrail_applied
 
 
-def tailor(doc: ResumeDoc, job_text: str, cfg: TailorConfig) -> tuple[list[Role], dict]:
-  job_terms_auto = top_terms_from_job(job_text, cfg)
+def tailor(
+  doc: ResumeDoc,
+  job_text: str,
+  cfg: TailorConfig,
+  features: dict[str, BulletFeatures] | None = None,
+) -> tuple[list[Role], dict]:
+  if features is None:
+    features = featurize_resume(doc, cfg)
+  with stage("job_terms"):
+    job = build_job_profile(job_text, cfg)
+  job_terms_auto = list(job.terms_auto)
 
   resume_text_original = "\n".join(doc.lines)
-  missing = missing_keywords(
-    resume_text=resume_text_original,
-    job_text=job_text,
-    cfg=cfg,
-    job_terms_auto=job_terms_auto,
-  )
+  with stage("missing_keywords"):
+    missing = missing_keywords(
+      resume_text=resume_text_original,
+      job_text=job_text,
+      cfg=cfg,
+      job_terms_auto=job_terms_auto,
+      job_norm=job.norm,
+    )
 
   report: dict = {
     "use_nltk": cfg.use_nltk,
     "job_terms_auto": job_terms_auto,
     "missing_keywords": missing,
     "guardrails": cfg.guardrails,
+    "guardrails_triggered": [
+      gr.get("name", "unnamed") for i, gr in enumerate(cfg.guardrails) if job.guardrail_triggered(i)
+    ],
+    # per-item feature rows (document order) so `rescore` can re-weight without re-tokenizing
+    "feature_names": list(FEATURE_NAMES),
     "roles": [],
     "config": {
       "per_role_keep": cfg.per_role_keep,
@@ -71,68 +202,14 @@ def tailor(doc: ResumeDoc, job_text: str, cfg: TailorConfig) -> tuple[list[Role]
     },
   }
 
-  new_roles: list[Role] = []
-  for role in doc.roles:
-    scored: list[tuple[float, str, dict]] = []
-    for b in role.bullet_lines:
-      s, details = score_bullet(b, job_text, cfg, job_terms_auto)
-      scored.append((s, b, details))
-
-    scored_sorted = sorted(scored, key=lambda t: t[0], reverse=True)
-
-    kept: list[tuple[float, str, dict]] = []
-    dropped: list[tuple[float, str, dict]] = []
-
-    for s, b, details in scored_sorted:
-      if s < cfg.drop_below_score:
-        dropped.append((s, b, details))
-      else:
-        kept.append((s, b, details))
-
-    if len(kept) < cfg.min_per_role_keep:
-      need = cfg.min_per_role_keep - len(kept)
-      dropped_sorted = sorted(dropped, key=lambda t: t[0], reverse=True)
-      kept.extend(dropped_sorted[:need])
-      dropped = dropped_sorted[need:]
-
-    guardrail_applied: list[dict] = []
-    for gr in cfg.guardrails:
-      triggers = gr.get("triggers", [])
-      must_phrases = gr.get("must_keep_phrases", [])
-      min_keep = int(gr.get("min_keep", 1))
-
-      if not triggers or not must_phrases or min_keep <= 0:
-        continue
-      if not job_mentions_any(job_text, triggers):
-        continue
-
-      kept_match_count = sum(1 for _, b, _ in kept if any(p in b.lower() for p in must_phrases))
-      if kept_match_count >= min_keep:
-        continue
-
-      promoted = None
-      best_from_dropped = pick_best_matching_bullet(dropped, must_phrases)
-      if best_from_dropped is not None:
-        s_best, b_best, d_best = best_from_dropped
-        dropped = [(s, b, d) for (s, b, d) in dropped if b != b_best]
-        kept.append((s_best, b_best, d_best))
-        promoted = b_best
-
-      kept_match_count = sum(1 for _, b, _ in kept if any(p in b.lower() for p in must_phrases))
-      if kept_match_count < min_keep:
-        for s, b, d in scored_sorted:
-          if any(p in b.lower() for p in must_phrases) and all(b != kb for _, kb, _ in kept):
-            kept.append((s, b, d))
-            promoted = promoted or b
-            kept_match_count += 1
-            if kept_match_count >= min_keep:
-              break
+  # every bullet + competency scored in one pass over the feature matrix
+  with stage("bullet_scoring"):
+    scored_by_role, scored_cc = score_resume(doc, job, cfg, features)
 
-      if promoted:
-        guardrail_applied.append({"name": gr.get("name", "unnamed"), "promoted_bullet": promoted})
-
-    kept = sorted(kept, key=lambda t: t[0], reverse=True)
-    kept = kept[:cfg.per_role_keep]
+  new_roles: list[Role] = []
+  for role, scored in zip(doc.roles, scored_by_role):
+    with stage("guardrails"):
+      kept, dropped, guardrail_applied = select_role_bullets(scored, cfg, job.guardrails)
 
     kept_sorted_lines = [b for _, b, _ in kept]
 
@@ -150,14 +227,17 @@ def tailor(doc: ResumeDoc, job_text: str, cfg: TailorConfig) -> tuple[list[Role]
       "guardrails_applied": guardrail_applied,
       "kept": [{"score": round(s, 3), "bullet": b, "details": d} for s, b, d in kept],
       "dropped": [{"score": round(s, 3), "bullet": b, "details": d} for s, b, d in dropped],
+      "features": [[d[n] for n in FEATURE_NAMES] for _, _, d in scored],
     })
 
-  cc_start, cc_end, cc_items = extract_core_competencies(doc.lines)
+  report["core_competencies_features"] = [
+    [d[n] for n in FEATURE_NAMES] for _, _, d in scored_cc
+  ]
   reordered_competencies: list[str] = []
-  if cc_items:
-    scored_cc = [(score_competency(it, job_text, cfg, job_terms_auto), it) for it in cc_items]
-    scored_cc.sort(key=lambda t: t[0], reverse=True)
-    reordered_competencies = [it for _, it in scored_cc]
+  if scored_cc:
+    with stage("competency_reorder"):
+      scored_cc.sort(key=lambda t: t[0], reverse=True)
+      reordered_competencies = [it for _, it, _ in scored_cc]
   report["core_competencies_reordered"] = reordered_competencies
 
   return new_roles, report
@@ -1,24 +1,53 @@
 from __future__ import annotations
 
+import importlib.util
 import re
 from datetime import datetime
+from types import SimpleNamespace
+from collections.abc import Set as AbstractSet
 from typing import Iterable
 
 from .tailor_config import TailorConfig
 
 # ----------------------------
-# Optional NLTK (centralized here)
+# Optional NLTK (centralized here, imported lazily)
 # ----------------------------
-NLTK_AVAILABLE = False
-try:
-  import nltk  # noqa: F401
-  from nltk import pos_tag, word_tokenize
-  from nltk.stem import WordNetLemmatizer
-  NLTK_AVAILABLE = True
-except Exception:
-  NLTK_AVAILABLE = False
-
-_LEM = WordNetLemmatizer() if NLTK_AVAILABLE else None
+# NLTK_AVAILABLE is only a probe: importing nltk costs a few hundred ms, so
+# the import (and the WordNet lemmatizer) is deferred to the first call of
+# load_nltk(), i.e. the first NLTK tokenizer / noun-phrase extraction.
+NLTK_AVAILABLE = importlib.util.find_spec("nltk") is not None
+
+_NLTK: SimpleNamespace | None | bool = None  # None = not loaded yet, False = import failed
+
+
+def load_nltk() -> SimpleNamespace | None:
+  """Import nltk on first use; None if it is not installed or fails to import."""
+  global _NLTK
+  if _NLTK is None:
+    if not NLTK_AVAILABLE:
+      _NLTK = False
+    else:
+      try:
+        import nltk
+        from nltk import pos_tag, pos_tag_sents, word_tokenize
+        from nltk.stem import WordNetLemmatizer
+        _NLTK = SimpleNamespace(
+          nltk=nltk,
+          pos_tag=pos_tag,
+          pos_tag_sents=pos_tag_sents,
+          word_tokenize=word_tokenize,
+          lemmatizer=WordNetLemmatizer(),
+        )
+      except Exception:
+        _NLTK = False
+  return _NLTK or None
+
+
+def nltk_available() -> bool:
+  """True if NLTK can be used (probe until loaded, actual result after)."""
+  if _NLTK is None:
+    return NLTK_AVAILABLE
+  return _NLTK is not False
 
 
 _WORD_RE = re.compile(r"[a-zA-Z][a-zA-Z0-9\-\+\/]*")
@@ -31,18 +60,17 @@ def normalize_text(s: str) -> str:
   return s
 
 
-def tokens_simple(s: str, stopwords: set[str]) -> list[str]:
+# Tokenizers are split in two steps: candidate extraction (the expensive,
+# stopword-independent part: regex / NLTK tag + lemmatize) and stopword
+# filtering. Candidates are (word, lemma) pairs, so they can be cached per
+# bullet and filtered against each job's stopwords later.
+
+def token_candidates_simple(s: str) -> list[tuple[str, str]]:
   s = normalize_text(s)
-  out: list[str] = []
+  out: list[tuple[str, str]] = []
   for m in _WORD_RE.finditer(s):
     w = m.group(0).lower().strip("-+/")
-    if not w or w in stopwords:
-      continue
-    if len(w) > 4 and w.endswith("s"):
-      w2 = w[:-1]
-      if w2 not in stopwords:
-        w = w2
-    out.append(w)
+    out.append((w, w))
   return out
 
 
@@ -58,24 +86,89 @@ def _penn_to_wn(tag: str) -> str:
   return "n"
 
 
-def tokens_nltk(s: str, stopwords: set[str]) -> list[str]:
-  if not NLTK_AVAILABLE:
-    return tokens_simple(s, stopwords)
+def token_candidates_nltk(s: str) -> list[tuple[str, str]]:
+  nl = load_nltk()
+  if nl is None:
+    return token_candidates_simple(s)
 
   t = normalize_text(s)
-  raw = word_tokenize(t)
-  tagged = pos_tag(raw)
+  raw = nl.word_tokenize(t)
+  tagged = nl.pos_tag(raw)
+  return _lemma_candidates(nl, tagged)
 
-  out: list[str] = []
+
+def _lemma_candidates(nl: SimpleNamespace, tagged: Iterable[tuple[str, str]]) -> list[tuple[str, str]]:
+  out: list[tuple[str, str]] = []
   for w, tag in tagged:
     w = w.lower().strip()
     if not _WORD_RE.fullmatch(w):
       continue
-    if w in stopwords:
-      continue
     wn_pos = _penn_to_wn(tag)
-    lemma = _LEM.lemmatize(w, wn_pos) if _LEM else w
-    if len(lemma) <= 2 or lemma in stopwords:
+    lemma = nl.lemmatizer.lemmatize(w, wn_pos)
+    out.append((w, lemma))
+  return out
+
+
+def token_candidates_nltk_batch(texts: list[str]) -> list[list[tuple[str, str]]]:
+  """
+  token_candidates_nltk for many texts with a single pos_tag_sents call.
+
+  Per-text results are identical to calling token_candidates_nltk on each;
+  this just pays the tagger setup once instead of once per bullet.
+  """
+  nl = load_nltk()
+  if nl is None:
+    return [token_candidates_simple(s) for s in texts]
+
+  sents = [nl.word_tokenize(normalize_text(s)) for s in texts]
+  return [_lemma_candidates(nl, tagged) for tagged in nl.pos_tag_sents(sents)]
+
+
+class LayeredStopwords(AbstractSet):
+  """
+  Read-only stopword set: a shared base plus a small per-job overlay
+  (e.g. company words). Jobs layer their words on top instead of copying
+  the whole base set, and the base is never written to.
+  """
+  __slots__ = ("base", "overlay")
+
+  def __init__(self, base: AbstractSet[str], overlay: Iterable[str] = ()):
+    self.base = base
+    self.overlay = frozenset(w for w in overlay if w not in base)
+
+  @classmethod
+  def _from_iterable(cls, it: Iterable[str]) -> frozenset[str]:
+    # results of &, |, - are plain frozensets
+    return frozenset(it)
+
+  def __contains__(self, w: object) -> bool:
+    return w in self.base or w in self.overlay
+
+  def __iter__(self):
+    yield from self.base
+    yield from self.overlay
+
+  def __len__(self) -> int:
+    return len(self.base) + len(self.overlay)
+
+  def __repr__(self) -> str:
+    return f"LayeredStopwords(<{len(self.base)} base>, {sorted(self.overlay)!r})"
+
+
+def filter_token_candidates(
+  candidates: Iterable[tuple[str, str]],
+  stopwords: AbstractSet[str],
+  *,
+  min_len: int = 1,
+) -> list[str]:
+  if type(stopwords) is LayeredStopwords:
+    return _filter_token_candidates_layered(candidates, stopwords.base, stopwords.overlay, min_len)
+
+  out: list[str] = []
+  for w, lemma in candidates:
+    if not w or w in stopwords:
+      continue
+    if len(lemma) < min_len or lemma in stopwords:
       continue
     if len(lemma) > 4 and lemma.endswith("s"):
       lemma2 = lemma[:-1]
@@ -85,10 +178,91 @@ def tokens_nltk(s: str, stopwords: set[str]) -> list[str]:
   return out
 
 
+def _filter_token_candidates_layered(
+  candidates: Iterable[tuple[str, str]],
+  base: AbstractSet[str],
+  extra: AbstractSet[str],
+  min_len: int,
+) -> list[str]:
+  # same as above, testing both layers directly (two C-level lookups beat
+  # one Python-level LayeredStopwords.__contains__)
+  out: list[str] = []
+  for w, lemma in candidates:
+    if not w or w in base or w in extra:
+      continue
+    if len(lemma) < min_len or lemma in base or lemma in extra:
+      continue
+    if len(lemma) > 4 and lemma.endswith("s"):
+      lemma2 = lemma[:-1]
+      if lemma2 and lemma2 not in base and lemma2 not in extra:
+        lemma = lemma2
+    out.append(lemma)
+  return out
+
+
+# NLTK tokens drop lemmas of 2 chars or less; simple tokens keep them.
+NLTK_MIN_TOKEN_LEN = 3
+
+
+def tokens_simple(s: str, stopwords: AbstractSet[str]) -> list[str]:
+  return filter_token_candidates(token_candidates_simple(s), stopwords)
+
+
+def tokens_nltk(s: str, stopwords: AbstractSet[str]) -> list[str]:
+  if load_nltk() is None:
+    return tokens_simple(s, stopwords)
+  return filter_token_candidates(token_candidates_nltk(s), stopwords, min_len=NLTK_MIN_TOKEN_LEN)
+
+
+def corpus_terms(s: str) -> set[str]:
+  """Distinct terms of a posting as counted in the job store's document frequencies (simple tokenizer)."""
+  return {t for t in tokens_simple(s, ()) if len(t) > 2}
+
+
+def warm_nltk() -> None:
+  """
+  Import NLTK and load the tagger/tokenizer/WordNet data up front, not on
+  the first job (NLTK's lazy corpus loaders are not safe to race from threads).
+  """
+  if load_nltk() is None:
+    return
+  try:
+    tokens_nltk("Managed vendor programs across teams.", set())
+  except LookupError:
+    pass  # missing data surfaces on the first job, with the usual error
+
+
 def tok_fn(cfg: TailorConfig):
   return tokens_nltk if cfg.use_nltk else tokens_simple
 
 
+def tokenizer_mode(cfg: TailorConfig) -> str:
+  """Tokenizer actually in effect ("nltk" falls back to "simple" if NLTK is missing)."""
+  return "nltk" if (cfg.use_nltk and nltk_available()) else "simple"
+
+
+def token_candidates(s: str, cfg: TailorConfig) -> list[tuple[str, str]]:
+  if tokenizer_mode(cfg) == "nltk":
+    return token_candidates_nltk(s)
+  return token_candidates_simple(s)
+
+
+def token_candidates_batch(texts: list[str], cfg: TailorConfig) -> list[list[tuple[str, str]]]:
+  if tokenizer_mode(cfg) == "nltk":
+    return token_candidates_nltk_batch(texts)
+  return [token_candidates_simple(s) for s in texts]
+
+
+def tokens_batch(texts: list[str], cfg: TailorConfig, stopwords: set[str]) -> list[list[str]]:
+  """Per-text token (lemma) lists; one tagger pass for all texts in NLTK mode."""
+  return [filter_tokens(c, cfg, stopwords) for c in token_candidates_batch(texts, cfg)]
+
+
+def filter_tokens(candidates: Iterable[tuple[str, str]], cfg: TailorConfig, stopwords: set[str]) -> list[str]:
+  min_len = NLTK_MIN_TOKEN_LEN if tokenizer_mode(cfg) == "nltk" else 1
+  return filter_token_candidates(candidates, stopwords, min_len=min_len)
+
+
 def phrase_hits(text: str, phrases: Iterable[str]) -> int:
   if not phrases:
     return 0
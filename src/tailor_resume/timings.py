@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import ContextManager, Iterator
+
+
+# Pipeline stages in run order (fixes the report / CSV column order).
+STAGES = (
+  "config_load",
+  "capture",
+  "jobpost_parse",
+  "jobpost_dedupe",
+  "jobpost_write",
+  "resume_load",
+  "job_terms",
+  "missing_keywords",
+  "bullet_scoring",
+  "guardrails",
+  "competency_reorder",
+  "markdown_render",
+  "markdown_postprocess",
+  "write_outputs",
+)
+
+
+@dataclass
+class StageTime:
+  wall_s: float = 0.0
+  cpu_s: float = 0.0
+  calls: int = 0
+
+
+class StageTimings:
+  """
+  Monotonic wall time (perf_counter) + process CPU time per stage.
+
+  A stage entered more than once accumulates. Stages must not nest, so
+  the per-stage numbers add up to (at most) the total.
+  """
+
+  def __init__(self) -> None:
+    self.stages: dict[str, StageTime] = {}
+    self._wall0 = time.perf_counter()
+    self._cpu0 = time.process_time()
+
+  @contextmanager
+  def stage(self, name: str) -> Iterator[None]:
+    wall0 = time.perf_counter()
+    cpu0 = time.process_time()
+    try:
+      yield
+    finally:
+      st = self.stages.setdefault(name, StageTime())
+      st.wall_s += time.perf_counter() - wall0
+      st.cpu_s += time.process_time() - cpu0
+      st.calls += 1
+
+  def _ordered(self) -> list[tuple[str, StageTime]]:
+    names = [s for s in STAGES if s in self.stages] + [s for s in self.stages if s not in STAGES]
+    return [(s, self.stages[s]) for s in names]
+
+  def as_report(self) -> dict:
+    """`timings` block for the report JSON (ms, rounded to µs)."""
+    return {
+      "stages": {
+        name: {"wall_ms": round(st.wall_s * 1000, 3), "cpu_ms": round(st.cpu_s * 1000, 3), "calls": st.calls}
+        for name, st in self._ordered()
+      },
+      "total_wall_ms": round((time.perf_counter() - self._wall0) * 1000, 3),
+      "total_cpu_ms": round((time.process_time() - self._cpu0) * 1000, 3),
+    }
+
+  def csv_columns(self) -> dict[str, str]:
+    """Flat t_<stage>_{wall,cpu}_ms columns; every known stage is present so the header is stable."""
+    out: dict[str, str] = {}
+    names = list(STAGES) + [s for s in self.stages if s not in STAGES]
+    for name in names:
+      st = self.stages.get(name)
+      out[f"t_{name}_wall_ms"] = f"{st.wall_s * 1000:.3f}" if st else ""
+      out[f"t_{name}_cpu_ms"] = f"{st.cpu_s * 1000:.3f}" if st else ""
+    rep = self.as_report()
+    out["t_total_wall_ms"] = f"{rep['total_wall_ms']:.3f}"
+    out["t_total_cpu_ms"] = f"{rep['total_cpu_ms']:.3f}"
+    return out
+
+
+# ----------------------------
+# Active collector (opt-in; stage() is a no-op when nothing is collecting)
+# ----------------------------
+_ACTIVE: ContextVar[StageTimings | None] = ContextVar("tailor_resume_timings", default=None)
+
+
+@contextmanager
+def collect_timings() -> Iterator[StageTimings]:
+  timings = StageTimings()
+  token = _ACTIVE.set(timings)
+  try:
+    yield timings
+  finally:
+    _ACTIVE.reset(token)
+
+
+def stage(name: str) -> ContextManager[None]:
+  timings = _ACTIVE.get()
+  return timings.stage(name) if timings is not None else nullcontext()
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import signal
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from .resume_cache import PreparedResume
+from .tailor_config import TailorConfig
+from .text_utils import warm_nltk
+from .batch import (
+  JOB_TEXT_SUFFIXES,
+  BatchResult,
+  read_job_file,
+  init_worker,
+  tailor_job,
+  commit_outcome,
+  report_result,
+)
+from .pipeline import (
+  DEFAULT_CONFIG_PATH,
+  STOPWORDS_PATH,
+  load_run_config,
+  load_base_resume,
+  resolve_cache_dir,
+  resolve_csv_log_path,
+)
+
+
+DONE_DIR = "done"
+FAILED_DIR = "failed"
+
+
+def build_argparser() -> argparse.ArgumentParser:
+  ap = argparse.ArgumentParser(
+    prog="tailor_resume watch",
+    description="Long-running inbox watcher: tailor job text files as they land, with config and resume kept warm.",
+  )
+  ap.add_argument("--inbox", required=True, help="Directory to watch for job text files (*.txt, *.md; optional URL on the first line)")
+  ap.add_argument("--resume", required=True, help="Path to resume_base.md")
+  ap.add_argument("--out-dir", default=None, help="Directory for outputs (jobpost + tailored resume + report)")
+  ap.add_argument("--config", default=None, help="Optional TOML config")
+  ap.add_argument("--use-nltk", action="store_true", help="Enable NLTK if installed")
+  ap.add_argument("--no-cache", action="store_true", help="Re-parse and re-featurize the base resume (skip the on-disk cache)")
+
+  ap.add_argument("--poll-interval", type=float, default=0.25, help="Seconds between inbox scans when idle (default: 0.25)")
+  ap.add_argument(
+    "--settle",
+    type=float,
+    default=0.5,
+    help="Only pick up files unmodified for this many seconds, so half-written files are skipped (default: 0.5)",
+  )
+  ap.add_argument("--once", action="store_true", help="Process what is in the inbox now, then exit")
+
+  ap.add_argument("--log-csv", default=None, help="Append a row to this CSV file per job")
+  ap.add_argument("--profile", default="base", help="Label for the resume/profile used (default: base)")
+  ap.add_argument("--status", default="", help="Optional submission status to log (drafted/submitted/interview/etc.)")
+  return ap
+
+
+# ----------------------------
+# Warm state (reloaded only when an input's mtime changes)
+# ----------------------------
+
+def _mtime_ns(p: Path) -> int:
+  try:
+    return p.stat().st_mtime_ns
+  except FileNotFoundError:
+    return 0
+
+
+@dataclass
+class WarmState:
+  config_path: str | None
+  base_resume: Path
+  use_nltk: bool
+  no_cache: bool
+  out_dir: str | None = None
+
+  cfg: TailorConfig | None = None
+  resume: PreparedResume | None = None
+  stamps: dict[str, int] = field(default_factory=dict)
+
+  def _watched(self) -> dict[str, Path]:
+    cfg_path = Path(self.config_path) if self.config_path else DEFAULT_CONFIG_PATH
+    return {"config": cfg_path, "stopwords": STOPWORDS_PATH, "resume": self.base_resume}
+
+  def refresh(self) -> list[str]:
+    """
+    Reload whatever changed since the last call; returns what was reloaded.
+    A config/stopwords change also re-featurizes the resume (features depend
+    on the tokenizer config). On a failed reload the previous state is kept.
+    """
+    now = {name: _mtime_ns(p) for name, p in self._watched().items()}
+    changed = [name for name, t in now.items() if self.stamps.get(name) != t]
+    if not changed:
+      return []
+
+    # stamp first: a broken file is retried on its next save, not on every poll
+    self.stamps = now
+    cfg = self.cfg
+    if cfg is None or "config" in changed or "stopwords" in changed:
+      cfg = load_run_config(self.config_path, use_nltk=self.use_nltk, out_dir=self.out_dir)
+    resume = load_base_resume(self.base_resume, cfg, cache_dir=resolve_cache_dir(self.no_cache, cfg))
+
+    self.cfg = cfg
+    self.resume = resume
+    init_worker(cfg, resume)
+    return changed
+
+
+# ----------------------------
+# Inbox
+# ----------------------------
+
+def ready_files(inbox: Path, settle: float) -> list[Path]:
+  """Job files old enough to be complete, oldest first."""
+  now = time.time()
+  out: list[tuple[float, str, Path]] = []
+  with os.scandir(inbox) as it:
+    for e in it:
+      if e.name.startswith(".") or e.name.endswith("~") or not e.is_file():
+        continue
+      if Path(e.name).suffix.lower() not in JOB_TEXT_SUFFIXES:
+        continue
+      st = e.stat()
+      if now - st.st_mtime < settle:
+        continue
+      out.append((st.st_mtime, e.name, Path(e.path)))
+  out.sort()
+  return [p for _, _, p in out]
+
+
+def move_to(p: Path, dest_dir: Path) -> Path:
+  dest_dir.mkdir(parents=True, exist_ok=True)
+  dest = dest_dir / p.name
+  if dest.exists():
+    dest = dest_dir / f"{p.stem}_{datetime.now():%Y%m%d-%H%M%S-%f}{p.suffix}"
+  shutil.move(str(p), dest)
+  return dest
+
+
+def process_file(p: Path, state: WarmState, args, base_out_root: Path) -> BatchResult:
+  try:
+    outcome = tailor_job(read_job_file(p))
+    return commit_outcome(outcome, args=args, base_resume=state.base_resume, base_out_root=base_out_root, cfg=state.cfg)
+  except Exception as e:  # one bad posting must not take the daemon down
+    return BatchResult(source=str(p), ok=False, error=f"{type(e).__name__}: {e}")
+
+
+def main(argv: list[str] | None = None) -> int:
+  args = build_argparser().parse_args(argv)
+  args.dry_run = False  # commit_outcome contract; the watcher always writes
+
+  inbox = Path(args.inbox)
+  if not inbox.is_dir():
+    raise FileNotFoundError(f"Inbox not found: {inbox}")
+  base_resume = Path(args.resume)
+  if not base_resume.exists():
+    raise FileNotFoundError(f"Resume not found: {base_resume}")
+
+  state = WarmState(
+    config_path=args.config, base_resume=base_resume, use_nltk=args.use_nltk, no_cache=args.no_cache, out_dir=args.out_dir
+  )
+  state.refresh()
+  if state.cfg.use_nltk:
+    warm_nltk()
+
+  done_dir = inbox / DONE_DIR
+  failed_dir = inbox / FAILED_DIR
+
+  stop = False
+
+  def _stop(signum, frame) -> None:
+    nonlocal stop
+    stop = True
+
+  signal.signal(signal.SIGTERM, _stop)
+
+  n_ok = 0
+  n_failed = 0
+  print(f"Watching {inbox} (done -> {done_dir}, failed -> {failed_dir})")
+  try:
+    while not stop:
+      try:
+        reloaded = state.refresh()
+      except Exception as e:
+        # e.g. a config saved mid-edit; keep serving with the last good state
+        print(f"reload failed, keeping previous state: {type(e).__name__}: {e}")
+        reloaded = []
+      if reloaded:
+        print(f"reloaded: {', '.join(reloaded)}")
+
+      base_out_root = Path(args.out_dir) if args.out_dir else Path(state.cfg.paths_out_root)
+      csv_path = resolve_csv_log_path(args.log_csv, state.cfg)
+
+      files = ready_files(inbox, 0.0 if args.once else args.settle)
+      for p in files:
+        if stop:
+          break
+        t0 = time.perf_counter()
+        res = process_file(p, state, args, base_out_root)
+        report_result(res, csv_path, dry_run=False)
+        if res.ok:
+          n_ok += 1
+          move_to(p, done_dir)
+        else:
+          n_failed += 1
+          dest = move_to(p, failed_dir)
+          dest.with_name(dest.name + ".error.txt").write_text(res.error + "\n", encoding="utf-8")
+        print(f"       {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+      if args.once:
+        break
+      if not files:
+        time.sleep(args.poll_interval)
+  except KeyboardInterrupt:
+    pass
+
+  print(f"Watch: {n_ok + n_failed} jobs ({n_ok} ok, {n_failed} failed)")
+  return 0 if (n_failed == 0 or not args.once) else 1